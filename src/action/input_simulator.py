@@ -1,19 +1,66 @@
-import pyautogui
+import threading
 import time
+from contextlib import contextmanager, nullcontext
 import cv2
 import numpy as np
 import os
 from ..utils.geometry import normalize_roi, get_safe_random_point
 
+
+class InputArbiter:
+    """Serializa mouse/teclado entre instâncias do bot que dividem a mesma tela.
+
+    Só existe um cursor e um foco de teclado: cada ação (clique, tecla) roda com o
+    lock, e ``owner`` diz qual simulador mexeu por último (troca de dono = o foco
+    pode estar na janela de outra instância).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.owner = None
+        self.switches = 0
+
+    @contextmanager
+    def hold(self, simulator):
+        """Segura o input; devolve True se o último a usar foi outro simulador."""
+        with self._lock:
+            switched = self.owner is not simulator
+            if switched:
+                self.owner = simulator
+                self.switches += 1
+            yield switched
+
+
 class InputSimulator:
-    def __init__(self, config=None):
-        # Desabilita o fail-safe para evitar paradas bruscas se o mouse for para o canto
-        # CUIDADO: Isso impede que você pare o bot movendo o mouse para o canto!
-        pyautogui.FAILSAFE = False
+    def __init__(self, config=None, offset=(0, 0), arbiter=None, focus_point=None, backend=None, templates=None):
+        """
+        ``offset``: origem (x, y) da região do jogo na tela; as coordenadas dos
+        métodos são relativas ao frame capturado. ``arbiter``/``focus_point``:
+        input dividido entre instâncias (antes de uma tecla, clica em
+        ``focus_point`` se outra instância usou o input por último).
+        ``backend``: módulo/objeto com ``click``/``moveTo``/``press``/``screenshot``
+        (padrão: pyautogui). ``templates``: banco de templates já carregado
+        (``GameStateDetector.load_templates``), compartilhado entre instâncias.
+        """
+        if backend is None:
+            import pyautogui as backend
+            # Desabilita o fail-safe para evitar paradas bruscas se o mouse for para o canto
+            # CUIDADO: Isso impede que você pare o bot movendo o mouse para o canto!
+            backend.FAILSAFE = False
+        self.gui = backend
         self.cfg = config or {}
         self.rois = self.cfg.get('rois', {})
         self.move_duration = float(self.cfg.get('input', {}).get('mouse_move_duration', 0.0))
-        
+        self.offset = (int(offset[0]), int(offset[1])) if offset else (0, 0)
+        self.arbiter = arbiter
+        self.focus_point = tuple(focus_point) if focus_point else None
+
+        if templates is not None:
+            self.fight_template = templates.get('fight')
+            self.pokemon_template = templates.get('pokemon')
+            self.run_template = templates.get('run')
+            return
+
         # Preload templates to avoid IO on every click
         assets_dir = self.cfg.get('assets', {}).get('templates_dir', '')
         
@@ -45,14 +92,28 @@ class InputSimulator:
                 self.run_template = cv2.imread(path)
 
     def click(self, x, y):
+        with self._exclusive():
+            self._click_screen(x + self.offset[0], y + self.offset[1])
+
+    def press(self, key):
+        with self._exclusive() as switched:
+            # Teclas vão para a janela com foco: se outra instância mexeu por último, foca a nossa
+            if switched and self.focus_point is not None:
+                self._click_screen(self.focus_point[0] + self.offset[0], self.focus_point[1] + self.offset[1])
+            self.gui.press(key)
+
+    def _click_screen(self, x, y):
+        """Clique em coordenadas absolutas da tela."""
         if self.move_duration and self.move_duration > 0:
-            pyautogui.moveTo(x, y, duration=self.move_duration)
-            pyautogui.click()
+            self.gui.moveTo(x, y, duration=self.move_duration)
+            self.gui.click()
         else:
-            pyautogui.click(x, y)
+            self.gui.click(x, y)
 
-    def press(self, key):
-        pyautogui.press(key)
+    def _exclusive(self):
+        if self.arbiter is None:
+            return nullcontext(False)   # instância única: sem troca de foco
+        return self.arbiter.hold(self)
     
     def click_in_slot(self, slot_index):
         """Clica aproximadamente no centro de um dos 4 slots de ataque (0-3)."""
@@ -98,7 +159,7 @@ class InputSimulator:
         if screen_img is not None:
             screenshot = screen_img
         else:
-            screenshot = pyautogui.screenshot()
+            screenshot = self.gui.screenshot()
             screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
 
         res = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
@@ -115,5 +176,11 @@ class InputSimulator:
         roi = [x, y, w, h]
         cx, cy = get_safe_random_point(roi, margin_pct)
 
-        self.click(cx, cy)
-        return True
\ No newline at end of file
+        if screen_img is None:
+            # Screenshot da tela inteira: coordenadas já são absolutas
+            with self._exclusive():
+                self._click_screen(cx, cy)
+        else:
+            self.click(cx, cy)
+        return True
+
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+from ..perception.game_state_detector import GameState
+from ..perception.shiny_watcher import ShinyDetected
+from .bot_controller import BotController
+
+
+class AsyncBotController(BotController):
+    """Versão asyncio do ``BotController``: captura, percepção e ação em tarefas cooperativas.
+
+    - ``_capture_stream``: captura frames continuamente (thread própria, com seu mss);
+    - ``_perception``: classifica o frame mais recente num executor (sempre o último;
+      frames intermediários são descartados);
+    - ``_decide_and_act``: pega o último estado percebido de um frame capturado *depois*
+      da ação anterior terminar e roda o handler (os mesmos do controlador síncrono)
+      na thread de ação.
+
+    Enquanto o handler espera uma animação, a captura e a percepção continuam, então
+    o próximo frame já está analisado quando a ação termina. Selecionado em
+    ``bot.runner: async``.
+    """
+
+    def __init__(self, config, components):
+        super().__init__(config, components)
+        cfg = self.cfg.get('bot', {}).get('async', {}) or {}
+        self.capture_interval = float(cfg.get('capture_interval', 0.05))
+        self._frame = None          # (instante da captura, frame)
+        self._perceived = None      # (instante da captura, frame, estado)
+        self._stream_cap = None
+        self.frames_captured = 0
+        self.frames_perceived = 0
+
+    def run(self):
+        logger.info("Bot Iniciado (assíncrono)! Pressione Ctrl+C para parar.")
+        watcher = self._start_shiny_watcher()
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            logger.info("Interrupção manual (Ctrl+C). Parando...")
+        finally:
+            self.running = False
+            self._shutdown(watcher)
+
+    async def _main(self):
+        # mss não é compartilhável entre threads: captura e ação criam a sua no próprio worker
+        capture_pool = ThreadPoolExecutor(1, 'capture', initializer=self._bind_stream_capture)
+        perception_pool = ThreadPoolExecutor(1, 'perception')
+        action_pool = ThreadPoolExecutor(1, 'action', initializer=self._bind_action_capture)
+        self._new_frame = asyncio.Event()
+        self._new_state = asyncio.Event()
+        tasks = [
+            asyncio.create_task(self._capture_stream(capture_pool), name='capture'),
+            asyncio.create_task(self._perception(perception_pool), name='perception'),
+            asyncio.create_task(self._decide_and_act(action_pool), name='action'),
+        ]
+        try:
+            # A primeira tarefa a terminar (ou falhar) encerra as outras
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    logger.opt(exception=task.exception()).error(f"Tarefa '{task.get_name()}' falhou.")
+        finally:
+            self.running = False
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for pool in (capture_pool, perception_pool, action_pool):
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _bind_stream_capture(self):
+        self._stream_cap = self.capture_factory()
+
+    def _bind_action_capture(self):
+        self.cap = self.capture_factory()
+
+    def _capture_stream_frame(self):
+        with self._stage('capture'):
+            return self._stream_cap.capture()
+
+    async def _wait(self, event, timeout=0.5) -> bool:
+        """Espera ``event`` com timeout curto, para notar ``running=False`` sem ficar preso."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        event.clear()
+        return True
+
+    async def _capture_stream(self, pool):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            started = time.monotonic()
+            frame = await loop.run_in_executor(pool, self._capture_stream_frame)
+            self._frame = (started, frame)
+            self.frames_captured += 1
+            self._new_frame.set()
+            await asyncio.sleep(max(0.0, self.capture_interval - (time.monotonic() - started)))
+
+    async def _perception(self, pool):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            if not await self._wait(self._new_frame):
+                continue
+            captured_at, frame = self._frame
+            state = await loop.run_in_executor(pool, self._detect_state, frame)
+            self._perceived = (captured_at, frame, state or GameState.UNKNOWN)
+            self.frames_perceived += 1
+            self._new_state.set()
+
+    async def _decide_and_act(self, pool):
+        loop = asyncio.get_running_loop()
+        last_action_end = 0.0
+        while self.running:
+            if self.shiny_event.is_set():
+                await loop.run_in_executor(pool, self.handle_shiny)
+                continue
+
+            # Só decide sobre um frame capturado depois que a última ação terminou
+            perceived = self._perceived
+            if perceived is None or perceived[0] < last_action_end:
+                await self._wait(self._new_state)
+                continue
+            captured_at, frame, state = perceived
+
+            if self.debug:
+                logger.debug(
+                    f"Estado detectado: {state.name} (tela: {self.screen_state.name}) | "
+                    f"frame de {time.monotonic() - captured_at:.2f}s atrás"
+                )
+            started = time.monotonic()
+            self._begin_perception_tick(captured_at)
+            try:
+                await loop.run_in_executor(pool, self._dispatch, state, frame)
+            except ShinyDetected:
+                await loop.run_in_executor(pool, self.handle_shiny)
+            except Exception as e:
+                logger.exception(f"Erro no loop principal: {e}")
+                await asyncio.sleep(self._next_backoff())  # Espera antes de tentar novamente
+            else:
+                self._error_backoff = 0.0
+            last_action_end = time.monotonic()
+            # loop_interval (ou o TickGovernor) continua sendo o período mínimo entre decisões
+            await asyncio.sleep(max(0.0, self._tick_interval(state, frame) - (last_action_end - started)))
@@ -0,0 +1,172 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+from ..perception.move_consensus import slot_signature
+from ..utils.geometry import crop_roi_safe
+
+
+@dataclass
+class BattleSession:
+    """Contexto de uma batalha: identidades lidas uma vez e reaproveitadas entre turnos."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    turns: int = 0
+    enemy_name: Optional[str] = None
+    enemy_level: Optional[int] = None
+    enemy_signature: Optional[np.ndarray] = None
+    player_name: Optional[str] = None
+    player_signature: Optional[np.ndarray] = None
+    moves: Optional[List[str]] = None          # moveset travado do Pokémon ativo
+    enemy_hp: Optional[float] = None
+    player_hp: Optional[float] = None
+
+    def invalidate_enemy(self):
+        self.enemy_name = self.enemy_level = self.enemy_signature = None
+
+    def invalidate_player(self):
+        self.player_name = self.player_signature = self.moves = None
+
+
+class BattleSessionTracker:
+    """Cria/invalida a ``BattleSession`` e serve as leituras de identidade com cache.
+
+    - Nova sessão na transição exploração -> batalha; fim após ``end_after``
+      ticks seguidos fora de batalha.
+    - Inimigo (nome + nível) e meu Pokémon (nome + moveset travado) são lidos uma
+      vez; o cache cai na troca (``on_switch``), no desmaio (HP 0) ou se a ROI do
+      nome mudar de aparência (assinatura barata, cobre trocas não vistas).
+    - Por turno só o HP (barra do inimigo / texto do meu) é lido.
+
+    Expõe ``identify_enemy``/``read_player_name``/``read_enemy_level`` com a mesma
+    assinatura do detector, então entra no lugar dele no especulador e no scheduler.
+    """
+
+    def __init__(self, detector, config=None):
+        self.detector = detector
+        cfg = (config or {}).get('battle', {}).get('session', {}) or {}
+        self.rois = (config or {}).get('rois', {}) or {}
+        self.end_after = int(cfg.get('end_after', 2))
+        self.identity_threshold = float(cfg.get('identity_threshold', 12.0))
+        self.session: Optional[BattleSession] = None
+        self._out_of_battle = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config, detector):
+        cfg = (config or {}).get('battle', {}).get('session', {}) or {}
+        if not cfg.get('enabled', True):
+            return None
+        return cls(detector, config)
+
+    # ---------- ciclo de vida ----------
+    def observe(self, in_battle: bool) -> Optional[BattleSession]:
+        """Chamado a cada tick com o estado classificado."""
+        if in_battle:
+            self._out_of_battle = 0
+            if self.session is None:
+                self.session = BattleSession()
+                logger.info("Nova sessão de batalha.")
+        elif self.session is not None:
+            self._out_of_battle += 1
+            if self._out_of_battle >= self.end_after:
+                logger.info(
+                    f"Sessão de batalha encerrada ({self.session.turns} turnos, "
+                    f"{time.monotonic() - self.session.started_at:.1f}s)."
+                )
+                self.session = None
+        return self.session
+
+    def on_switch(self):
+        if self.session is not None:
+            self.session.invalidate_player()
+
+    # ---------- leituras com cache (mesma interface do detector) ----------
+    def identify_enemy(self, image):
+        session = self.session
+        if session is None:
+            return self.detector.identify_enemy(image)
+        with self._lock:
+            if session.enemy_name and self._same(session.enemy_signature, image, 'enemy_name'):
+                self.hits += 1
+                return session.enemy_name
+            if session.enemy_name:
+                logger.info(f"Inimigo mudou na tela (era '{session.enemy_name}'); relendo.")
+            session.invalidate_enemy()
+        self.misses += 1
+        name = (self.detector.identify_enemy(image) or "").strip()
+        if name:
+            with self._lock:
+                session.enemy_name = name
+                session.enemy_signature = self._signature(image, 'enemy_name')
+        return name
+
+    def read_enemy_level(self, image):
+        session = self.session
+        if session is not None and session.enemy_level is not None:
+            return session.enemy_level
+        level = self.detector.read_enemy_level(image)
+        if session is not None and level is not None:
+            session.enemy_level = level
+        return level
+
+    def read_player_name(self, image):
+        session = self.session
+        if session is None:
+            return self.detector.read_player_name(image)
+        with self._lock:
+            if session.player_name and self._same(session.player_signature, image, 'player_name'):
+                self.hits += 1
+                return session.player_name
+            session.invalidate_player()
+        self.misses += 1
+        name = (self.detector.read_player_name(image) or "").strip()
+        if name:
+            with self._lock:
+                session.player_name = name
+                session.player_signature = self._signature(image, 'player_name')
+        return name
+
+    def update_hp(self, image):
+        """Lê o HP do turno e o registra na sessão (``read_hp`` + ``commit_hp``)."""
+        return self.commit_hp(*self.read_hp(image))
+
+    def read_hp(self, image):
+        """``(HP do inimigo, meu HP)`` do frame, sem tocar na sessão (pode rodar especulado)."""
+        if self.session is None:
+            return None, None
+        return self.detector.read_enemy_hp(image), self.detector.read_player_hp(image)
+
+    def commit_hp(self, enemy_hp, player_hp):
+        """Fecha o turno com o HP lido; HP 0 invalida a identidade de quem desmaiou."""
+        session = self.session
+        if session is None:
+            return None, None
+        session.turns += 1
+        if enemy_hp is None and player_hp is None:
+            return session.enemy_hp, session.player_hp   # HP não lido neste turno (job cortado)
+        session.enemy_hp = enemy_hp
+        session.player_hp = player_hp
+        if session.enemy_hp == 0:
+            logger.info(f"'{session.enemy_name}' desmaiou.")
+            session.invalidate_enemy()
+        if session.player_hp == 0:
+            logger.info(f"'{session.player_name}' desmaiou.")
+            session.invalidate_player()
+        return session.enemy_hp, session.player_hp
+
+    def _signature(self, image, roi_key):
+        roi = self.rois.get(roi_key)
+        return slot_signature(crop_roi_safe(image, roi)) if roi else None
+
+    def _same(self, reference, image, roi_key) -> bool:
+        if reference is None:
+            return True   # sem ROI configurada: confia nos eventos de invalidação
+        current = self._signature(image, roi_key)
+        return current is not None and float(np.abs(current - reference).mean()) <= self.identity_threshold
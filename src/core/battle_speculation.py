@@ -0,0 +1,153 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from ..perception.move_consensus import slot_signature
+from ..utils.geometry import crop_roi_safe
+
+# ROIs de nome que precisam estar iguais entre o frame especulado e o do menu de golpes
+NAME_ROIS = ('enemy_name', 'player_name')
+
+
+@dataclass
+class TurnDecision:
+    """Leituras e decisões de um turno de batalha (especuladas ou não)."""
+
+    enemy_name: str = ""
+    player_name: str = ""
+    enemy_level: Optional[int] = None
+    enemy_hp: Optional[float] = None            # HP lido no turno (registrado só no commit)
+    player_hp: Optional[float] = None
+    flee: bool = False
+    switch_plan: object = None
+    switch_idx: Optional[int] = None
+    known_moves: List[str] = field(default_factory=list)   # golpes conhecidos usados em best_slot
+    best_slot: Optional[int] = None
+    speculative: bool = False
+
+
+@dataclass
+class Speculation:
+    """Especulação em andamento: futuros das leituras e da decisão, e as ROIs de nome do frame de origem."""
+
+    future: Future = None
+    reads: List[Future] = field(default_factory=list)
+    signatures: Dict[str, np.ndarray] = field(default_factory=dict)
+    abandoned: threading.Event = field(default_factory=threading.Event)
+
+
+class TurnSpeculator:
+    """Adianta a percepção e a decisão do turno enquanto o menu de golpes anima.
+
+    ``start(frame)`` dispara, no frame de antes do clique em FIGHT, a identificação
+    do inimigo, o nome do meu Pokémon e o nível do inimigo em paralelo (e o HP do
+    turno, se o leitor for a sessão de batalha); em seguida roda
+    ``decide(enemy, player, level, hp)`` (fuga/troca/melhor golpe com os golpes já
+    conhecidos). ``collect`` devolve o ``TurnDecision`` quando o frame do menu chega,
+    ou None para descartar: menu não confirmado, ROI de nome diferente no frame
+    do menu (troca/inimigo novo), inimigo não lido, erro ou timeout.
+
+    ``decide`` não pode alterar estado (planejador, sessão, equipe): o chamador
+    registra HP e troca só depois de aceitar o turno. Especulação descartada é
+    abandonada (futuros pendentes cancelados, decisão não roda mais) e, se já
+    estiver rodando, o resultado é ignorado.
+    """
+
+    def __init__(self, detector, decide: Callable[..., TurnDecision], timeout: float = 5.0, max_workers: int = 4,
+                 rois=None, identity_threshold: float = 12.0):
+        self.detector = detector
+        self.decide = decide
+        self.timeout = float(timeout)
+        self.rois = rois or {}
+        self.identity_threshold = float(identity_threshold)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculate")
+        self.committed = 0
+        self.discarded = 0
+
+    @classmethod
+    def from_config(cls, config, detector, decide):
+        cfg = (config or {}).get('battle', {}).get('speculation', {}) or {}
+        if not cfg.get('enabled', True):
+            return None
+        return cls(
+            detector, decide, timeout=cfg.get('timeout', 5.0),
+            rois=(config or {}).get('rois', {}), identity_threshold=cfg.get('identity_threshold', 12.0),
+        )
+
+    def start(self, frame) -> Speculation:
+        spec = Speculation(signatures=self._signatures(frame))
+        enemy = self._pool.submit(self.detector.identify_enemy, frame)
+        player = self._pool.submit(self.detector.read_player_name, frame)
+        level = self._pool.submit(self.detector.read_enemy_level, frame)
+        # Leitor com sessão de batalha: HP do turno em paralelo, antes da decisão (só lido, sem registrar)
+        hp = self._pool.submit(self.detector.read_hp, frame) if hasattr(self.detector, 'read_hp') else None
+        spec.reads = [f for f in (enemy, player, level, hp) if f is not None]
+        spec.future = self._pool.submit(self._run, spec, enemy, player, level, hp)
+        return spec
+
+    def collect(self, spec: Optional[Speculation], frame=None, opened: bool = True) -> Optional[TurnDecision]:
+        """Turno especulado, validado contra o frame do menu de golpes (``opened`` = menu confirmado)."""
+        if spec is None:
+            return None
+        turn = None
+        if not opened:
+            logger.debug("Menu de golpes não confirmado; especulação descartada.")
+        elif frame is not None and not self._same_names(spec, frame):
+            logger.info("ROI de nome mudou entre o frame especulado e o do menu; relendo o turno.")
+        else:
+            try:
+                turn = spec.future.result(timeout=self.timeout)
+            except FutureTimeout:
+                logger.warning(f"Especulação do turno passou de {self.timeout}s; refazendo no frame do menu.")
+            except Exception as e:
+                logger.error(f"Erro na especulação do turno: {e}")
+        if turn is None:
+            self.abandon(spec)
+            self.discarded += 1
+            return None
+        self.committed += 1
+        return turn
+
+    def abandon(self, spec: Speculation):
+        """Cancela o que ainda não começou; a decisão em curso tem o resultado ignorado."""
+        spec.abandoned.set()
+        for future in (spec.future, *spec.reads):
+            future.cancel()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, spec: Speculation, enemy: Future, player: Future, level: Future,
+             hp: Optional[Future] = None) -> Optional[TurnDecision]:
+        hp_values = hp.result() if hp is not None else (None, None)
+        enemy_name = (enemy.result() or "").strip()
+        if not enemy_name or spec.abandoned.is_set():
+            return None   # sem inimigo não há o que decidir: descarta e relê no frame do menu
+        turn = self.decide(enemy_name, (player.result() or "").strip(), level.result(), hp_values)
+        if spec.abandoned.is_set():
+            return None
+        turn.speculative = True
+        return turn
+
+    def _signatures(self, frame) -> Dict[str, np.ndarray]:
+        if frame is None:
+            return {}
+        out = {}
+        for key in NAME_ROIS:
+            roi = self.rois.get(key)
+            signature = slot_signature(crop_roi_safe(frame, roi)) if roi else None
+            if signature is not None:
+                out[key] = signature
+        return out
+
+    def _same_names(self, spec: Speculation, frame) -> bool:
+        current = self._signatures(frame)
+        return all(
+            key in current and float(np.abs(current[key] - reference).mean()) <= self.identity_threshold
+            for key, reference in spec.signatures.items()
+        )
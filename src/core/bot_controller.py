@@ -1,11 +1,20 @@
+import threading
 import time
+from contextlib import nullcontext
 import cv2
-import winsound
 from pathlib import Path
-import ctypes
 from loguru import logger
 from ..perception.game_state_detector import GameState
+from ..perception.perception_scheduler import PerceptionScheduler, Priority
+from ..perception.screen_state import ScreenState, ScreenStateMachine
+from ..perception.shiny_watcher import ShinyDetected, ShinyWatcher
+from ..perception.team_hud_tracker import TeamHudTracker
 from ..utils.geometry import normalize_roi, crop_roi_safe, get_safe_random_point
+from .battle_session import BattleSessionTracker
+from .battle_speculation import TurnDecision, TurnSpeculator
+from .tick_governor import TickGovernor
+from .visual_wait import VisualWaiter, any_of, motion_settled
+from .watchdog import StageDeadlineExceeded, Watchdog
 
 
 class BotController:
@@ -17,6 +26,12 @@ class BotController:
         self.strategy = components['strategy']
         self.ocr = components['ocr']
         self.team_mgr = components['team_mgr']
+        # Consenso de leituras dos slots de golpes (pula OCR de movesets estáveis)
+        self.move_consensus = components.get('move_consensus')
+        self.team_hud = TeamHudTracker.from_config(self.cfg, self.ocr, self.team_mgr)
+        # Cria capturas extras para threads auxiliares (mss não é compartilhável entre threads);
+        # sem factory, ``clone()`` da captura mantém região/monitor (replay e fatias devolvem a si mesmas)
+        self.capture_factory = components.get('capture_factory') or self.cap.clone
         
         self.running = True
         # Controle de Cooldown para evitar cliques repetidos
@@ -24,44 +39,255 @@ class BotController:
         self.goto_cooldown = 15.0 # Espera 15 segundos antes de clicar de novo
         self.debug = bool(self.cfg.get('bot', {}).get('debug_mode', False))
 
+        # Agendador de percepção: jobs por prioridade/deadline com orçamento por tick
+        self.scheduler = PerceptionScheduler(self.cfg)
+        self.perception_deadlines = self.cfg.get('perception', {}).get('deadlines', {})
+        # Intervalo do loop adaptativo por estado/atividade, com orçamento de CPU (opcional)
+        self.governor = TickGovernor.from_config(self.cfg, self.scheduler, self.ocr)
+
+        # Máquina de estados de tela (BATTLE_MENU, MOVES_MENU, DIALOG, ...)
+        fsm_cfg = self.cfg.get('detection', {}).get('state_machine', {}) or {}
+        self.screen_fsm = ScreenStateMachine(self.detector, self.cfg) if fsm_cfg.get('enabled', False) else None
+        self.screen_state = ScreenState.UNKNOWN
+
+        # Sinalizado pelo watcher de shiny (thread própria); preempta sleeps e handlers
+        self.shiny_event = threading.Event()
+        # Sessão de batalha: identidades lidas uma vez por batalha (cache entre turnos)
+        self.battle_session = BattleSessionTracker.from_config(self.cfg, self.detector)
+        # Percepção/decisão do turno adiantada durante a animação do menu de golpes
+        self.speculator = TurnSpeculator.from_config(self.cfg, self._battle_reader, self._decide_turn)
+        # Esperas por condição visual (os antigos sleeps fixos viram o timeout)
+        # (captura via lambda: o controlador assíncrono troca ``self.cap`` por uma da thread de ação)
+        self.waiter = VisualWaiter.from_config(self.cfg, lambda: self.cap.capture(), self._sleep)
+
+        # Deadlines por estágio; timeouts do Tesseract entram como travamento do estágio 'ocr'
+        # e cada leitura roda num worker que é abandonado (leitura vazia) se passar do deadline
+        self.watchdog = Watchdog.from_config(self.cfg)
+        if self.watchdog is not None and hasattr(self.ocr, 'on_timeout'):
+            self.ocr.on_timeout = lambda duration, origin: self.watchdog.record('ocr', duration, where=origin)
+            self.ocr.guard = lambda fn, *args: self.watchdog.guard('ocr', fn, *args, fallback="")
+        # Backoff após erro no loop (cresce até o máximo e zera no próximo tick bem-sucedido)
+        backoff_cfg = self.cfg.get('bot', {}).get('error_backoff', {}) or {}
+        self.error_backoff_initial = float(backoff_cfg.get('initial', 0.5))
+        self.error_backoff_max = float(backoff_cfg.get('max', 5.0))
+        self._error_backoff = 0.0
+        # Contadores por instância (o supervisor de várias instâncias lê daqui)
+        self.name = components.get('name', 'bot')
+        self.ticks = 0
+        self.errors = 0
+        self.last_state = GameState.UNKNOWN
+
     def run(self):
         logger.info("Bot Iniciado! Pressione Ctrl+C para parar.")
+        watcher = self._start_shiny_watcher()
+        try:
+            self._run_loop()
+        finally:
+            self._shutdown(watcher)
+
+    def _shutdown(self, watcher):
+        if watcher is not None:
+            watcher.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            logger.info(self.watchdog.summary())
+        if self.speculator is not None:
+            self.speculator.shutdown()
+        # Compacta o journal de golpes conhecidos no snapshot
+        if hasattr(self.team_mgr, 'close'):
+            self.team_mgr.close()
+        # Grava as variações de sprite ainda pendentes (o índice salva em lote)
+        sprite_index = getattr(self.detector, 'sprite_index', None)
+        if sprite_index is not None:
+            sprite_index.close()
+        if self.waiter.records:
+            logger.info(self.waiter.summary())
+
+    def _run_loop(self):
         while self.running:
             try:
-                img = self.cap.capture()
-                state = self.detector.detect_state(img)
+                if self.shiny_event.is_set():
+                    self.handle_shiny()
+                    continue
+
+                tick_start = time.monotonic()
+                with self._stage('capture'):
+                    img = self.cap.capture()
+                # Estado, HUD e leituras do turno dividem o orçamento deste tick
+                self.scheduler.begin_tick()
+                self.scheduler.submit(
+                    'state', lambda: self._detect_state(img),
+                    Priority.CRITICAL, self.perception_deadlines.get('state'),
+                )
+                state = self.scheduler.run_tick().get('state') or GameState.UNKNOWN
 
                 if self.debug:
-                    logger.debug(f"Estado detectado: {state.name}")
+                    logger.debug(f"Estado detectado: {state.name} (tela: {self.screen_state.name})")
+                self._log_scheduler_overrun()
 
-                if state == GameState.SHINY_FOUND:
-                    self.handle_shiny()
-                elif state == GameState.IN_BATTLE:
-                    self.handle_battle(img)
-                else:
-                    self.handle_exploring(img)
-                
-                # Intervalo do loop principal (configurável, padrão 1.0s)
-                sleep_time = float(self.cfg.get('bot', {}).get('loop_interval', 1.0))
-                time.sleep(sleep_time)
+                self._dispatch(state, img)
+
+                # Intervalo do loop é o período mínimo do tick: o tempo já gasto
+                # esperando nos handlers é descontado
+                self._sleep(self._tick_interval(state, img) - (time.monotonic() - tick_start))
+                self._error_backoff = 0.0
 
+            except ShinyDetected:
+                self.handle_shiny()
             except KeyboardInterrupt:
                 logger.info("Interrupção manual (Ctrl+C). Parando...")
                 self.running = False
             except Exception as e:
                 logger.exception(f"Erro no loop principal: {e}")
-                time.sleep(5)  # Espera segura antes de tentar novamente
+                time.sleep(self._next_backoff())  # Espera antes de tentar novamente
+
+    def _next_backoff(self):
+        """Espera após um erro: dobra a cada erro seguido, até ``bot.error_backoff.max``."""
+        self.errors += 1
+        self._error_backoff = min(self.error_backoff_max, max(self.error_backoff_initial, 2 * self._error_backoff))
+        return self._error_backoff
+
+    def _stage(self, name):
+        """Contexto do watchdog para o estágio ``name`` (no-op sem watchdog)."""
+        return self.watchdog.stage(name) if self.watchdog is not None else nullcontext()
+
+    def _tick_interval(self, state, img):
+        """Período do tick: ``bot.loop_interval`` fixo, ou o do ``TickGovernor`` se habilitado."""
+        if self.governor is None:
+            return float(self.cfg.get('bot', {}).get('loop_interval', 1.0))
+        return self.governor.next_interval(state, img, self.screen_state if self.screen_fsm is not None else None)
+
+    @property
+    def _battle_reader(self):
+        """Leituras de identidade da batalha: pela sessão (com cache) ou direto no detector."""
+        return self.battle_session if self.battle_session is not None else self.detector
+
+    def _dispatch(self, state, img):
+        """Encaminha o frame ao handler do estado (compartilhado com o controlador assíncrono)."""
+        self.ticks += 1
+        self.last_state = state
+        if self.battle_session is not None:
+            self.battle_session.observe(state == GameState.IN_BATTLE)
+        try:
+            if state == GameState.SHINY_FOUND:
+                self.handle_shiny()
+            elif state == GameState.IN_BATTLE:
+                with self._stage('battle'):
+                    self.handle_battle(img)
+            else:
+                with self._stage('exploring'):
+                    self.handle_exploring(img)
+        except StageDeadlineExceeded as e:
+            # Handler cortado num ponto de espera: o próximo tick recomeça de um frame novo
+            logger.warning(f"{e}; handler abandonado.")
+
+    def _start_shiny_watcher(self):
+        """Inicia o watcher de shiny em thread própria, se habilitado em ``shiny_watcher``.
+
+        Também sobe o watchdog de deadlines (as três formas de rodar o bot passam por aqui).
+        """
+        if self.watchdog is not None:
+            self.watchdog.start()
+        watcher = ShinyWatcher.from_config(
+            self.cfg, self.detector.templates.get('shiny'), self.capture_factory, self.shiny_event
+        )
+        if watcher is not None:
+            watcher.start()
+        return watcher
+
+    def _sleep(self, seconds):
+        """Dorme, mas acorda imediatamente (levantando ShinyDetected) se o watcher achar um shiny.
+
+        Também é o ponto de corte dos handlers: estágio além do deadline levanta
+        ``StageDeadlineExceeded`` (ver ``Watchdog.raise_if_overdue``).
+        """
+        if self.shiny_event.wait(max(0.0, float(seconds))):
+            raise ShinyDetected()
+        if self.watchdog is not None:
+            self.watchdog.raise_if_overdue()
+
+    def _detect_state(self, img):
+        """Classifica o frame; com a máquina de estados só roda os detectores do estado atual.
+
+        A máquina de estados não usa o classificador aprendido de ``detect_state``
+        (``detection.state_classifier``): ele só vale com ela desligada.
+        """
+        with self._stage('state'):
+            if self.screen_fsm is None:
+                return self.detector.detect_state(img)
+            self.screen_state = self.screen_fsm.update(img)
+            return self.screen_state.game_state
+
+    def _begin_perception_tick(self, captured_at):
+        """Abre o tick do agendador para um frame capturado em ``captured_at`` (``time.monotonic``)."""
+        age = max(0.0, time.monotonic() - captured_at)
+        self.scheduler.begin_tick(self.scheduler.clock() - age)
+
+    def _log_scheduler_overrun(self):
+        if self.debug and self.scheduler.last_tick_duration > self.scheduler.tick_budget:
+            logger.debug(
+                f"Tick de percepção estourou orçamento: {self.scheduler.last_tick_duration:.3f}s "
+                f"(budget={self.scheduler.tick_budget}s) | {self.scheduler.stats()}"
+            )
+
+    def _read_move_slot(self, i, move_img, my_pokemon_name, roi_coords):
+        """OCR do nome de um slot de golpe (``rois.moves.slot_<i>``); "" se não configurado."""
+        if move_img is None:
+            return ""
+
+        # Em debug, salva o recorte de cada slot para calibrar ROIs
+        if self.debug:
+            try:
+                debug_dir = Path("debug") / "moves"
+                debug_dir.mkdir(parents=True, exist_ok=True)
+                debug_path = debug_dir / f"{my_pokemon_name.lower()}_slot{i}.png"
+                cv2.imwrite(str(debug_path), move_img)
+            except Exception as e:
+                logger.error(f"Erro ao salvar imagem de debug do slot {i}: {e}")
+
+        # Pré-processa texto branco em fundo dinâmico (botão de golpe)
+        # Usa método migrado para OCREngine
+        processed = self.ocr.process_dynamic_background_text(move_img)
+
+        # Apenas letras e espaços nos nomes de golpes
+        move_text_raw = self.ocr.extract_text_optimized(
+            processed,
+            whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz ",
+            invert_for_white_text=False
+        )
+        move_text = move_text_raw.replace('\n', ' ').strip()
+        move_name = self.ocr.clean_move_name(move_text)
+
+        if self.debug:
+            logger.debug(f"Slot {i}: OCR_bruto='{move_text}' | nome_limpo='{move_name}' ROI={roi_coords}")
+        return move_name
 
     def handle_shiny(self):
         logger.critical("SHINY ENCONTRADO! ALARME!")
 
         # 1) Toca o alarme padrão do PC (beep) algumas vezes
+        # (import tardio: winsound só existe no Windows; com fontes de replay o bot roda em outros SOs)
+        try:
+            import winsound
+        except ImportError:
+            winsound = None
         for _ in range(10):
-            winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+            if winsound is not None:
+                winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
             time.sleep(0.5)
 
-        # 2) Notificação visual simples via MessageBox do Windows
+        # 2) Notificação visual simples via MessageBox do Windows, em thread própria:
+        # MessageBoxW bloqueia até o usuário fechar e não pode travar o loop/encerramento
+        # (não-daemon: o processo espera a caixa ser fechada antes de sair)
+        threading.Thread(target=self._show_shiny_message, name="ShinyMessageBox").start()
+
+        # Após alertar, para o bot completamente
+        self.running = False
+
+    @staticmethod
+    def _show_shiny_message():
         try:
+            import ctypes
             ctypes.windll.user32.MessageBoxW(
                 0,
                 "Um SHINY foi detectado pelo PokeBot Pro!",
@@ -71,28 +297,32 @@ class BotController:
         except Exception as e:
             logger.error(f"Falha ao exibir MessageBox de shiny: {e}")
 
-        # Após alertar, para o bot completamente
-        self.running = False
-
     def handle_exploring(self, img):
+        # Equipe/HP/nível pelo HUD lateral: job LOW (cai fora se o tick estiver apertado)
+        if self.team_hud is not None:
+            self.scheduler.submit(
+                'team_hud', lambda: self.team_hud.update(img),
+                Priority.LOW, self.perception_deadlines.get('team_hud'),
+            )
+            self.scheduler.run_tick()
+
+        # 0) Com a máquina de estados, diálogo já foi detectado neste frame (estado
+        # herdado nos ticks de tolerância não conta: o diálogo pode já ter fechado)
+        if self.screen_fsm is not None and self.screen_state == ScreenState.DIALOG and self.screen_fsm.confirmed:
+            logger.info("Diálogo aberto. Avançando conversa com Espaço...")
+            self.input.press('space')
+            return
+
         # 1) Verifica se há diálogo (talk.png) antes de qualquer coisa
-        talk_tpl = self.detector.templates.get('talk')
-        if talk_tpl is not None:
-            # If a specific search area is configured, crop the image to that ROI to avoid false positives
+        # (a máquina de estados já rodou o detector de talk neste frame)
+        if self.screen_fsm is None:
+            # Se houver área configurada, busca só nela para evitar falso-positivo
             talk_area = self.cfg.get('detection', {}).get('talk_search_area')
-            if talk_area:
-                search_img = crop_roi_safe(img, talk_area)
-                if self.debug:
-                    logger.debug(f"Talk search area usada: {talk_area}")
-            else:
-                search_img = img
-
-            res_talk = cv2.matchTemplate(search_img, talk_tpl, cv2.TM_CCOEFF_NORMED)
-            _, max_val_talk, _, _ = cv2.minMaxLoc(res_talk)
+            max_val_talk, _ = self.detector.match_template('talk', img, talk_area)
             # Use configurable threshold (default 0.95) to avoid confusão com chat
             talk_thresh = self.cfg.get('detection', {}).get('talk_threshold', 0.95)
             if self.debug:
-                logger.debug(f"Score talk.png: {max_val_talk:.3f} (threshold={talk_thresh})")
+                logger.debug(f"Score talk.png: {max_val_talk:.3f} (threshold={talk_thresh}) | área={talk_area}")
             if max_val_talk > talk_thresh:
                 logger.info(f"Ícone de diálogo encontrado (score={max_val_talk:.3f}). Avançando conversa com Espaço...")
                 self.input.press('space')
@@ -104,8 +334,7 @@ class BotController:
             logger.warning("Template 'goto.png' não encontrado ou não carregado.")
             return
 
-        res = cv2.matchTemplate(img, goto_tpl, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        max_val, max_loc = self.detector.match_template('goto', img)
 
         goto_thresh = self.cfg.get('detection', {}).get('goto_threshold', 0.8)
 
@@ -113,8 +342,8 @@ class BotController:
             logger.debug(f"Score goto.png: {max_val:.3f} (threshold={goto_thresh})")
 
         # Antes de clicar em Goto, revalida se não estamos em batalha neste frame
-        current_state = self.detector.detect_state(img)
-        if current_state == GameState.IN_BATTLE:
+        # (desnecessário com a máquina de estados: botões de batalha já foram checados)
+        if self.screen_fsm is None and self.detector.detect_state(img) == GameState.IN_BATTLE:
             if self.debug:
                 logger.debug("Botões de batalha detectados ao tentar clicar em Goto. Cancelando clique.")
             return
@@ -140,7 +369,12 @@ class BotController:
                 logger.debug(f"Clicando em Goto nas coordenadas seguras: ({cx}, {cy}) dentro de [{safe_x1},{safe_y1},{safe_x2},{safe_y2}]")
 
             self.input.click(cx, cy)
-            time.sleep(2) # Espera caminhar
+            # Espera caminhar: até o personagem parar ou uma batalha começar (máx. 2s)
+            self.waiter.wait_until(
+                'goto_walk',
+                any_of(motion_settled(), self.detector.detect_battle_buttons),
+                timeout=2.0, min_wait=0.3,
+            )
             return
 
         # 3) Fallback: nenhum talk nem Goto, mantém leve interação
@@ -149,68 +383,77 @@ class BotController:
         self.input.press('space')
 
     def handle_battle(self, img):
-        # Proteção: se por algum motivo a HUD de batalha sumiu, não atacar
-        if self.detector.detect_state(img) != GameState.IN_BATTLE:
+        # Proteção: se por algum motivo a HUD de batalha sumiu, não atacar. Com a máquina
+        # de estados, só vale o estado confirmado por um detector neste frame: nos ticks
+        # de tolerância (animação de ataque, fim da batalha) ela ainda devolve o menu antigo
+        if self.screen_fsm is not None:
+            in_battle = self.screen_state.in_battle and self.screen_fsm.confirmed
+        else:
+            in_battle = self.detector.detect_state(img) == GameState.IN_BATTLE
+        if not in_battle:
             if self.debug:
                 logger.debug("handle_battle chamado mas estado não é IN_BATTLE. Abortando ações de ataque.")
             return
 
+        # Especulação: identifica inimigo/meu Pokémon no frame de antes do clique e já
+        # decide fuga/troca/golpe enquanto o menu de golpes anima
+        speculation = self.speculator.start(img) if self.speculator is not None else None
+
         # Sempre garantir que o menu de batalha está focado em FIGHT primeiro
         try:
-            # Tenta clicar no FIGHT. Se funcionar, espera um pouco para menu aparecer.
-            # Idealmente poderia ter um loop verificando se o menu de golpes abriu.
+            # Clica no FIGHT e espera o menu de golpes renderizar (no máximo fight_delay)
             self.input.click_fight_button(img)
-            
+
             fight_delay = self.cfg.get('battle', {}).get('fight_to_moves_delay', 1.2)
-            
-            # Pequeno loop de espera ativa (opcional) ou sleep simples
-            # Por segurança, mantemos o sleep mas logamos
-            if self.debug:
-                logger.debug(f"Aguardando {fight_delay}s para menu de golpes abrir...")
-            time.sleep(fight_delay)
-            
+            opened, frame = self.waiter.wait_until('moves_menu', self.detector.detect_moves_menu, fight_delay)
+            if self.debug and not opened:
+                logger.debug(f"Menu de golpes não confirmado em {fight_delay}s; seguindo com o último frame.")
+
         except Exception as e:
             logger.error(f"Erro ao clicar no FIGHT inicial: {e}")
-
-        # Após o clique em FIGHT e o pequeno delay, captura um novo frame
-        # para garantir que o menu de golpes já esteja completamente renderizado.
-        img = self.cap.capture()
-
-        # 1. Ler Inimigo
-        battle_info = self.detector.get_battle_info(img)
-        enemy_name = battle_info.get('enemy_name', '').strip()
-        my_pokemon_name = battle_info.get('player_name', '').strip() or "MeuPokemonAtual"
+            opened, frame = False, None
+
+        # Frame em que o menu de golpes já está renderizado (o último da espera)
+        img = frame if frame is not None else self.cap.capture()
+        # Deadlines das leituras do turno contam deste frame; o orçamento segue o do tick
+        self.scheduler.begin_frame()
+
+        # 1-3. Leituras e decisões do turno: especuladas (aceitas só com o menu aberto e as
+        # ROIs de nome iguais às do frame pré-clique) ou refeitas neste frame
+        turn = self.speculator.collect(speculation, img, opened) if self.speculator is not None else None
+        if turn is None:
+            turn = self._read_turn(img)
+        elif self.debug:
+            logger.debug("Turno especulado no frame pré-clique confirmado.")
+        self._commit_turn(turn)
+        enemy_name, enemy_level, my_pokemon_name = turn.enemy_name, turn.enemy_level, turn.player_name
 
         if self.debug:
-            logger.debug(f"Inimigo detectado: '{enemy_name}' | Meu Pokémon: '{my_pokemon_name}'")
+            logger.debug(f"Inimigo detectado: '{enemy_name}' (Lv {enemy_level}) | Meu Pokémon: '{my_pokemon_name}'")
 
-        # 2. Decidir se deve fugir ANTES de abrir menu de golpes
-        try:
-            if self.strategy.should_flee(my_pokemon_name, enemy_name):
-                logger.info(f"Decisão de FUGIR da batalha contra {enemy_name}.")
-                # Usa o botão RUN via template (run.png)
-                try:
-                    self.input.click_run_button(img)
-                    time.sleep(self.cfg.get('battle', {}).get('action_cooldown', 2.5))
-                    return
-                except Exception as e_click:
-                    logger.error(f"Erro ao clicar em RUN via template: {e_click}")
-        except Exception as e:
-            logger.error(f"Erro ao decidir fuga: {e}")
+        # 2. Fugir ANTES de ler os golpes
+        if turn.flee:
+            logger.info(f"Decisão de FUGIR da batalha contra {enemy_name}.")
+            # Usa o botão RUN via template (run.png)
+            try:
+                self.input.click_run_button(img)
+                self._wait_battle_settled('run', self.cfg.get('battle', {}).get('action_cooldown', 2.5))
+                return
+            except Exception as e_click:
+                logger.error(f"Erro ao clicar em RUN via template: {e_click}")
 
-        # 3. (opcional) Tentar trocar de Pokémon se houver alguém claramente vantajoso
-        try:
-            switch_idx = self.strategy.choose_switch_target(enemy_name)
-        except Exception as e:
-            logger.error(f"Erro ao decidir troca de Pokémon: {e}")
-            switch_idx = None
+        # 3. (opcional) Trocar de Pokémon se houver alguém claramente vantajoso
+        switch_plan, switch_idx = turn.switch_plan, turn.switch_idx
 
         if switch_idx is not None:
-            logger.info(f"Decisão de TROCAR para o slot {switch_idx} da equipe contra {enemy_name}.")
+            target_desc = switch_plan.target if switch_plan is not None else f"slot {switch_idx}"
+            logger.info(f"Decisão de TROCAR para {target_desc} da equipe contra {enemy_name}.")
             try:
                 # Abre menu de POKEMON pelo botão com ROI/template existente
                 self.input.click_pokemon_button(img)
-                time.sleep(0.6)
+                _, frame = self.waiter.wait_until('switch_menu', self.detector.detect_switch_menu, 0.6)
+                if frame is not None:
+                    img = frame
 
                 # Usa menu de troca configurado em rois.switch_menu e OCR especializado
                 switch_cfg = self.cfg.get('rois', {}).get('switch_menu', {})
@@ -249,8 +492,18 @@ class BotController:
                     # Atualiza equipe atual com o que foi lido
                     self.team_mgr.update_team_from_hud(detected_names)
 
-                    # Clica na linha correspondente ao índice sugerido (com aleatoriedade segura)
-                    idx = max(0, min(int(switch_idx), max(len(detected_names) - 1, 0)))
+                    # Clica na linha do melhor membro do ranking presente no menu (casado
+                    # pelo nome lido, não pela posição); sem plano, usa o índice sugerido
+                    if switch_plan is not None:
+                        idx = self.strategy.switch_planner.match_slot(switch_plan, detected_names)
+                        if idx is None:
+                            logger.warning(
+                                f"Nenhum membro do ranking {switch_plan.ranked} encontrado no menu: {detected_names}"
+                            )
+                            self.input.press('esc')
+                            return
+                    else:
+                        idx = max(0, min(int(switch_idx), max(len(detected_names) - 1, 0)))
                     
                     slot_y1 = y1 + idx * slot_h
                     slot_y2 = slot_y1 + slot_h
@@ -261,36 +514,58 @@ class BotController:
                     if self.debug:
                         logger.debug(f"Clicando no slot de equipe {idx} em ({cx}, {cy}) para trocar Pokémon. Nomes detectados: {detected_names}")
                     self.input.click(cx, cy)
+                    # Só a troca feita entra na histerese do planejador (o plano especulado não)
+                    self.strategy.record_turn(switch_plan)
 
-                    # Pequena espera para animação de troca
-                    time.sleep(self.cfg.get('battle', {}).get('action_cooldown', 2.5))
+                    if self.battle_session is not None:
+                        self.battle_session.on_switch()
+
+                    # Espera a animação de troca (até os botões de batalha voltarem)
+                    self._wait_battle_settled('switch', self.cfg.get('battle', {}).get('action_cooldown', 2.5))
 
                     # Depois da troca, não ataca neste tick; deixa próxima iteração decidir
                     return
                 else:
                     logger.warning("ROI de menu de troca (switch_menu.container) não configurada; não foi possível trocar.")
-                    debug_dir.mkdir(parents=True, exist_ok=True)
-                    debug_path = debug_dir / f"{my_pokemon_name.lower()}_slot{i}.png"
-                    cv2.imwrite(str(debug_path), move_img)
-                except Exception as e:
-                    logger.error(f"Erro ao salvar imagem de debug do slot {i}: {e}")
-
-            # Pré-processa texto branco em fundo dinâmico (botão de golpe)
-            # Usa método migrado para OCREngine
-            processed = self.ocr.process_dynamic_background_text(move_img)
-
-            # Apenas letras e espaços nos nomes de golpes
-            move_text_raw = self.ocr.extract_text_optimized(
-                processed,
-                whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz ",
-                invert_for_white_text=False
-            )
-            move_text = move_text_raw.replace('\n', ' ').strip()
-            move_name = self.ocr.clean_move_name(move_text)
-            my_moves.append(move_name)
+            except Exception as e:
+                logger.error(f"Erro ao trocar de Pokémon: {e}")
 
-            if self.debug:
-                logger.debug(f"Slot {i}: OCR_bruto='{move_text}' | nome_limpo='{move_name}' ROI={roi_coords}")
+        # 4. Sem o menu de golpes na tela não há o que ler nem onde clicar (a espera
+        # visual desligada não confirma nada: confere no frame capturado)
+        if not opened:
+            try:
+                opened = bool(self.detector.detect_moves_menu(img))
+            except Exception as e:
+                logger.error(f"Erro ao verificar o menu de golpes: {e}")
+        if not opened:
+            logger.warning("Menu de golpes não abriu; pulando o clique de golpe neste tick.")
+            return
+
+        # 5. Ler golpes (menu de golpes já aberto pelo clique em FIGHT)
+        moves_rois = self.cfg.get('rois', {}).get('moves', {})
+        slot_rois = [moves_rois.get(f'slot_{i}') for i in range(1, 5)]
+        slot_imgs = [crop_roi_safe(img, roi) if roi else None for roi in slot_rois]
+
+        # Moveset já travado nesta sessão de batalha: nem olha os slots
+        session = self.battle_session.session if self.battle_session is not None else None
+        in_session = session is not None and session.player_name == my_pokemon_name
+        my_moves = list(session.moves) if in_session and session.moves is not None else None
+
+        # Moveset travado pelo consenso e slots inalterados: pula o OCR dos 4 slots
+        if my_moves is None and self.move_consensus is not None:
+            my_moves = self.move_consensus.stable_moves(my_pokemon_name, slot_imgs)
+            if my_moves is not None and self.debug:
+                logger.debug(f"Golpes de '{my_pokemon_name}' estáveis; OCR dos slots pulado: {my_moves}")
+
+        if my_moves is None:
+            reads = [self._read_move_slot(i, move_img, my_pokemon_name, roi)
+                     for i, (move_img, roi) in enumerate(zip(slot_imgs, slot_rois), start=1)]
+            if self.move_consensus is not None:
+                my_moves = self.move_consensus.observe(my_pokemon_name, reads, slot_imgs)
+            else:
+                my_moves = reads
+        if in_session and session.moves is None and self.move_consensus is not None:
+            session.moves = self.move_consensus.locked_moves(my_pokemon_name)
 
         # 6. Salvar o que aprendeu (nome real do Pokémon atual)
         try:
@@ -300,12 +575,17 @@ class BotController:
         except Exception as e:
             logger.error(f"Erro ao salvar movimentos: {e}")
 
-        # 7. Decidir Ataque usando estratégia
-        try:
-            best_slot = self.strategy.get_best_move(my_pokemon_name, enemy_name)
-        except Exception as e:
-            logger.error(f"Erro na estratégia de batalha: {e}")
-            best_slot = 0
+        # 7. Decidir Ataque usando estratégia (a escolha especulada vale se os golpes não mudaram)
+        if turn.best_slot is not None and self.team_mgr.get_moves(my_pokemon_name) == turn.known_moves:
+            best_slot = turn.best_slot
+        else:
+            try:
+                best_slot = self.strategy.get_best_move(
+                    my_pokemon_name, enemy_name, enemy_level=enemy_level, my_level=self._member_level(my_pokemon_name),
+                )
+            except Exception as e:
+                logger.error(f"Erro na estratégia de batalha: {e}")
+                best_slot = 0
 
         if self.debug:
             logger.debug(f"Estratégia escolheu slot {best_slot} para {my_pokemon_name} vs {enemy_name}")
@@ -314,8 +594,108 @@ class BotController:
         logger.info(f"Atacando slot {best_slot} contra {enemy_name} | Moves: {my_moves}")
         try:
             self.input.click_in_slot(best_slot)
+            self.strategy.record_turn()
         except Exception as e:
             logger.error(f"Erro ao clicar no slot de ataque: {e}")
 
         # Espera animação de ataque/botões reaparecerem (mais paciente)
-        time.sleep(self.cfg.get('battle', {}).get('action_cooldown', 4.0))
\ No newline at end of file
+        self._wait_battle_settled('attack', self.cfg.get('battle', {}).get('action_cooldown', 4.0))
+
+    def _read_turn(self, img):
+        """Lê inimigo/meu Pokémon/nível no frame (via scheduler) e decide o turno."""
+        # Jobs HIGH: rodam mesmo com o tick estourado, mas contam deadline perdido
+        reader = self._battle_reader
+        self.scheduler.submit(
+            'enemy_name', lambda: reader.identify_enemy(img),
+            Priority.HIGH, self.perception_deadlines.get('enemy_name'),
+        )
+        self.scheduler.submit(
+            'player_name', lambda: reader.read_player_name(img),
+            Priority.HIGH, self.perception_deadlines.get('player_name'),
+        )
+        self.scheduler.submit(
+            'enemy_level', lambda: reader.read_enemy_level(img),
+            Priority.NORMAL, self.perception_deadlines.get('enemy_level'),
+        )
+        if self.battle_session is not None:
+            self.scheduler.submit(
+                'battle_hp', lambda: self.battle_session.read_hp(img),
+                Priority.NORMAL, self.perception_deadlines.get('battle_hp'),
+            )
+        battle_info = self.scheduler.run_tick()
+        self._log_scheduler_overrun()
+        return self._decide_turn(
+            (battle_info.get('enemy_name') or '').strip(),
+            (battle_info.get('player_name') or '').strip(),
+            battle_info.get('enemy_level'),
+            battle_info.get('battle_hp'),
+        )
+
+    def _commit_turn(self, turn):
+        """Registra as leituras do turno aceito (uma vez por turno, na thread do bot)."""
+        if self.battle_session is None:
+            return
+        self.battle_session.commit_hp(turn.enemy_hp, turn.player_hp)
+        if turn.player_hp is not None and hasattr(self.team_mgr, 'set_member_hp'):
+            self.team_mgr.set_member_hp(turn.player_name, turn.player_hp)
+
+    def _member_level(self, pokemon_name):
+        """Nível do nosso Pokémon pelo HUD de equipe (None = nível padrão do cálculo de dano)."""
+        return self.team_mgr.get_level(pokemon_name) if hasattr(self.team_mgr, 'get_level') else None
+
+    def _decide_turn(self, enemy_name, player_name, enemy_level, hp=None):
+        """Fuga, troca e melhor golpe (com os golpes já conhecidos) para as leituras do turno.
+
+        Roda também na thread de especulação: não toca em input, tela nem estado
+        (sessão, equipe, planejador); ``_commit_turn`` registra o turno aceito.
+        ``hp`` = ``(HP do inimigo, meu HP)`` lido no turno.
+        """
+        my_pokemon_name = player_name or "MeuPokemonAtual"
+        enemy_hp, player_hp = hp or (None, None)
+        turn = TurnDecision(
+            enemy_name=enemy_name, player_name=my_pokemon_name, enemy_level=enemy_level,
+            enemy_hp=enemy_hp, player_hp=player_hp if player_name else None,
+        )
+        # HP lido neste turno entra no planejador de trocas (cópia; a equipe só muda no commit)
+        team_hp = None
+        if turn.player_hp is not None and hasattr(self.team_mgr, 'hp_with'):
+            team_hp = self.team_mgr.hp_with(player_name, turn.player_hp)
+        try:
+            turn.flee = bool(self.strategy.should_flee(my_pokemon_name, enemy_name))
+        except Exception as e:
+            logger.error(f"Erro ao decidir fuga: {e}")
+        if turn.flee:
+            return turn
+
+        try:
+            if getattr(self.strategy, 'switch_planner', None) is not None:
+                turn.switch_plan = self.strategy.plan_switch(enemy_name, my_pokemon_name, enemy_level, hp=team_hp)
+                turn.switch_idx = 0 if turn.switch_plan is not None and turn.switch_plan.target else None
+            else:
+                turn.switch_idx = self.strategy.choose_switch_target(enemy_name)
+        except Exception as e:
+            logger.error(f"Erro ao decidir troca de Pokémon: {e}")
+            turn.switch_idx = None
+        if turn.switch_idx is not None:
+            return turn
+
+        # Pré-calcula o golpe com o moveset conhecido (aquece caches de golpes/tipos)
+        turn.known_moves = list(self.team_mgr.get_moves(my_pokemon_name))
+        if turn.known_moves:
+            try:
+                turn.best_slot = self.strategy.get_best_move(
+                    my_pokemon_name, enemy_name, enemy_level=enemy_level, my_level=self._member_level(my_pokemon_name),
+                )
+            except Exception as e:
+                logger.error(f"Erro na estratégia de batalha: {e}")
+        return turn
+
+    def _wait_battle_settled(self, label, timeout):
+        """Espera a barra de batalha reaparecer ou a batalha acabar (HUD de exploração), até ``timeout``."""
+        def battle_bar_back(frame):
+            # Menu de golpes ainda aberto = a ação nem começou
+            return self.detector.detect_battle_buttons(frame) and not self.detector.detect_moves_menu(frame)
+
+        self.waiter.wait_until(
+            label, any_of(battle_bar_back, self.detector.detect_goto), timeout, min_wait=0.3,
+        )
\ No newline at end of file
@@ -10,11 +10,16 @@ if str(ROOT_DIR) not in sys.path:
 from src.perception.screen_capture import ScreenCapture
 from src.perception.ocr_engine import OCREngine
 from src.perception.game_state_detector import GameStateDetector
+from src.perception.move_consensus import MoveConsensus
 from src.action.input_simulator import InputSimulator
 from src.knowledge.pokemon_database import PokemonDatabase
 from src.knowledge.team_manager import TeamManager
 from src.decision.battle_strategy import BattleStrategy
+from src.decision.matchup_table import MatchupTable
 from src.core.bot_controller import BotController
+from src.core.async_controller import AsyncBotController
+from src.core.pipelined_controller import PipelinedBotController
+from src.core.supervisor import Supervisor
 
 def load_config():
     config_path = ROOT_DIR / 'config' / 'settings.yaml'
@@ -49,15 +54,28 @@ def main():
     try:
         setup_logging()
         config = load_config()
+
+        # bot.runner: "sync" (loop clássico), "async" (tarefas asyncio) ou "pipeline" (um worker por estágio)
+        runner = config.get('bot', {}).get('runner', 'sync')
+        bot_cls = {'async': AsyncBotController, 'pipeline': PipelinedBotController}.get(runner, BotController)
+
+        # Várias instâncias (supervisor.instances): cada uma com sua região/replay e input
+        supervisor = Supervisor.from_config(config, bot_cls)
+        if supervisor is not None:
+            supervisor.run()
+            return
         
         # Initialize components
         screen = ScreenCapture()
-        ocr = OCREngine(config['ocr']['tesseract_path'])
+        ocr = OCREngine(config['ocr']['tesseract_path'], timeout=config['ocr'].get('timeout', 2.0))
         detector = GameStateDetector(screen, ocr, config)
         input_sim = InputSimulator(config)
         db = PokemonDatabase()
-        team_mgr = TeamManager()
-        strategy = BattleStrategy(db, team_mgr, config)
+        # Só indexa sprites de nomes que existem na base de conhecimento
+        detector.name_validator = lambda name: bool(db.get_pokemon_types(name))
+        team_mgr = TeamManager(identity=db.identity, config=config)
+        matchups = MatchupTable.from_config(config, db, team_mgr)
+        strategy = BattleStrategy(db, team_mgr, config, matchups=matchups)
         
         components = {
             'screen': screen,
@@ -65,10 +83,11 @@ def main():
             'input': input_sim,
             'ocr': ocr,
             'strategy': strategy,
-            'team_mgr': team_mgr
+            'team_mgr': team_mgr,
+            'move_consensus': MoveConsensus.from_config(config, validator=db.identity.canonical_move),
         }
         
-        bot = BotController(config, components)
+        bot = bot_cls(config, components)
         bot.run()
     except Exception as e:
         logger.exception(f"Fatal error in main loop: {e}")
@@ -0,0 +1,157 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+class LatestQueue:
+    """Fila limitada com política "o mais novo vence": cheia, descarta o item mais antigo.
+
+    Um estágio lento nunca trava o anterior; ele só perde frames intermediários
+    (contados em ``dropped``).
+    """
+
+    def __init__(self, maxsize: int = 1):
+        self.maxsize = max(1, int(maxsize))
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None):
+        """Remove o item mais antigo; ``queue.Empty`` se nada chegar em ``timeout``."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+class Stage:
+    """Um estágio do pipeline: thread própria que consome ``inbox`` e publica em ``outbox``.
+
+    Sem ``inbox`` o estágio é a fonte (``fn()`` é chamado em loop, no máximo a cada
+    ``interval`` segundos; a espera não conta na latência). ``fn`` retornando
+    None não publica nada (ex.: frame descartado). ``setup`` roda dentro da thread
+    do estágio antes do loop (ex.: criar o mss da thread).
+    """
+
+    def __init__(self, name: str, fn: Callable, inbox: Optional[LatestQueue] = None,
+                 outbox: Optional[LatestQueue] = None, setup: Optional[Callable] = None,
+                 interval: float = 0.0):
+        self.name = name
+        self.interval = float(interval)
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.setup = setup
+        self.processed = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.thread: Optional[threading.Thread] = None
+
+    def run(self, stop_event: threading.Event):
+        if self.setup is not None:
+            self.setup()
+        last_start = 0.0
+        while not stop_event.is_set():
+            if self.inbox is not None:
+                try:
+                    item = self.inbox.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            elif self.interval > 0:
+                stop_event.wait(max(0.0, self.interval - (time.perf_counter() - last_start)))
+                if stop_event.is_set():
+                    break
+            started = last_start = time.perf_counter()
+            try:
+                result = self.fn(item) if self.inbox is not None else self.fn()
+            except Exception as e:
+                self.errors += 1
+                logger.exception(f"Erro no estágio '{self.name}': {e}")
+                continue
+            latency = time.perf_counter() - started
+            self.processed += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if result is not None and self.outbox is not None:
+                self.outbox.put(result)
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            'processed': self.processed,
+            'errors': self.errors,
+            'latency_ms': 1000.0 * self.total_latency / self.processed if self.processed else 0.0,
+            'max_latency_ms': 1000.0 * self.max_latency,
+            'queue_depth': self.inbox.depth() if self.inbox is not None else 0,
+            'max_queue_depth': self.inbox.max_depth if self.inbox is not None else 0,
+            'dropped': self.inbox.dropped if self.inbox is not None else 0,
+        }
+
+
+class Pipeline:
+    """Estágios encadeados por ``LatestQueue``s, cada um na sua thread.
+
+    A vazão fica limitada pelo estágio mais lento (e não pela soma dos estágios,
+    como no loop síncrono); os outros descartam frames velhos em vez de acumular fila.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self._stop = threading.Event()
+
+    @classmethod
+    def chain(cls, source: Callable, *steps, queue_size: int = 1, source_setup: Optional[Callable] = None,
+              source_interval: float = 0.0):
+        """Monta ``source -> steps[0] -> ...``; cada step é ``(nome, fn)`` ou ``(nome, fn, setup)``."""
+        stages = [Stage('capture', source, setup=source_setup, interval=source_interval)]
+        for step in steps:
+            name, fn, setup = (tuple(step) + (None,))[:3]
+            inbox = LatestQueue(queue_size)
+            stages[-1].outbox = inbox
+            stages.append(Stage(name, fn, inbox=inbox, setup=setup))
+        return cls(stages)
+
+    def start(self):
+        self._stop.clear()
+        for stage in self.stages:
+            stage.thread = threading.Thread(
+                target=stage.run, args=(self._stop,), name=f"pipeline-{stage.name}", daemon=True
+            )
+            stage.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        for stage in self.stages:
+            if stage.thread is not None:
+                stage.thread.join(timeout)
+
+    def alive(self) -> bool:
+        return all(stage.thread is not None and stage.thread.is_alive() for stage in self.stages)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        return {stage.name: stage.metrics() for stage in self.stages}
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{name}: {m['processed']} itens, {m['latency_ms']:.0f}ms (máx {m['max_latency_ms']:.0f}), "
+            f"fila {m['queue_depth']}/{m['max_queue_depth']}, descartados {m['dropped']}"
+            for name, m in self.metrics().items()
+        )
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+
+from ..perception.game_state_detector import GameState
+from ..perception.shiny_watcher import ShinyDetected
+from .bot_controller import BotController
+from .pipeline import Pipeline
+
+
+class PipelinedBotController(BotController):
+    """Modo pipeline: captura -> percepção -> decisão -> ação, um worker por estágio.
+
+    - captura: frames num ritmo de ``bot.pipeline.capture_interval`` (mss próprio);
+    - percepção: ``_detect_state`` (máquina de estados/classificador) no frame mais novo;
+    - decisão: descarta frames capturados durante/antes da última ação e escolhe o handler;
+    - ação: roda o handler (os mesmos do controlador síncrono) com a captura da thread.
+
+    Filas de tamanho ``queue_size`` com "o mais novo vence". Selecionado em ``bot.runner: pipeline``.
+    """
+
+    def __init__(self, config, components):
+        super().__init__(config, components)
+        cfg = self.cfg.get('bot', {}).get('pipeline', {}) or {}
+        self.capture_interval = float(cfg.get('capture_interval', 0.05))
+        self.queue_size = int(cfg.get('queue_size', 1))
+        self.metrics_interval = float(cfg.get('metrics_interval', 30.0))
+        self._stream_cap = None
+        self._acting = threading.Event()
+        self._last_action_end = 0.0
+        self.pipeline: Optional[Pipeline] = None
+
+    def build_pipeline(self) -> Pipeline:
+        return Pipeline.chain(
+            self._capture_stage,
+            ('perceive', self._perceive_stage),
+            ('decide', self._decide_stage),
+            ('act', self._act_stage, self._bind_action_capture),
+            queue_size=self.queue_size,
+            source_setup=self._bind_stream_capture,
+            source_interval=self.capture_interval,
+        )
+
+    def run(self):
+        logger.info("Bot Iniciado (pipeline)! Pressione Ctrl+C para parar.")
+        watcher = self._start_shiny_watcher()
+        self.pipeline = self.build_pipeline()
+        self.pipeline.start()
+        next_report = time.monotonic() + self.metrics_interval
+        try:
+            while self.running and self.pipeline.alive():
+                time.sleep(0.2)
+                if self.debug and time.monotonic() >= next_report:
+                    logger.debug(f"Pipeline: {self.pipeline.summary()}")
+                    next_report = time.monotonic() + self.metrics_interval
+        except KeyboardInterrupt:
+            logger.info("Interrupção manual (Ctrl+C). Parando...")
+        finally:
+            self.running = False
+            self.pipeline.stop()
+            logger.info(f"Pipeline: {self.pipeline.summary()}")
+            self._shutdown(watcher)
+
+    def _bind_stream_capture(self):
+        self._stream_cap = self.capture_factory()
+
+    def _bind_action_capture(self):
+        self.cap = self.capture_factory()
+
+    def _capture_stage(self):
+        with self._stage('capture'):
+            return time.monotonic(), self._stream_cap.capture()
+
+    def _perceive_stage(self, item):
+        captured_at, frame = item
+        return captured_at, frame, self._detect_state(frame) or GameState.UNKNOWN
+
+    def _decide_stage(self, item):
+        captured_at, frame, state = item
+        # Frame de antes/durante a última ação mostra a tela velha: não decide em cima dele
+        if self._acting.is_set() or captured_at < self._last_action_end:
+            return None
+        if self.debug:
+            logger.debug(f"Estado detectado: {state.name} (tela: {self.screen_state.name})")
+        return captured_at, frame, state
+
+    def _act_stage(self, item):
+        if not self.running:
+            return None
+        if self.shiny_event.is_set():
+            self.handle_shiny()
+            return None
+        captured_at, frame, state = item
+        if captured_at < self._last_action_end:
+            return None
+        self._acting.set()
+        started = time.monotonic()
+        self._begin_perception_tick(captured_at)
+        try:
+            self._dispatch(state, frame)
+            # loop_interval (ou o TickGovernor) continua sendo o período mínimo entre ações
+            self._sleep(self._tick_interval(state, frame) - (time.monotonic() - started))
+        except ShinyDetected:
+            self.handle_shiny()
+        finally:
+            self._last_action_end = time.monotonic()
+            self._acting.clear()
+        return None
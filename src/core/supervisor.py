@@ -0,0 +1,330 @@
+import copy
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from ..action.input_simulator import InputArbiter, InputSimulator
+from ..decision.battle_strategy import BattleStrategy
+from ..decision.matchup_table import MatchupTable, build_tensors
+from ..knowledge.pokemon_database import PokemonDatabase
+from ..knowledge.team_manager import TeamManager
+from ..perception.game_state_detector import GameStateDetector
+from ..perception.move_consensus import MoveConsensus
+from ..perception.ocr_engine import OCREngine, OCRWorkerPool
+from ..perception.replay_capture import ReplayCapture
+from ..perception.screen_capture import ScreenCapture
+from ..perception.shared_capture import SharedScreenCapture
+from .bot_controller import BotController
+from .tick_governor import cpu_clock
+
+
+@dataclass
+class InstanceSpec:
+    """Uma instância do bot: região da tela (ou replay) e alvo do input."""
+
+    name: str
+    region: Optional[list] = None        # [x,y,w,h] no monitor; None = monitor inteiro
+    monitor: int = 1
+    input_offset: Optional[list] = None  # padrão: origem da região capturada
+    focus_point: Optional[list] = None   # ponto (relativo à região) que dá foco à janela
+    replay_dir: Optional[str] = None     # frames gravados no lugar da tela
+    replay_interval: float = 0.0
+    overrides: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, index: int, entry: dict):
+        entry = dict(entry or {})
+        return cls(
+            name=str(entry.get('name') or f"bot{index + 1}"),
+            region=entry.get('region'),
+            monitor=int(entry.get('monitor', 1)),
+            input_offset=entry.get('input_offset'),
+            focus_point=entry.get('focus_point'),
+            replay_dir=entry.get('replay_dir'),
+            replay_interval=float(entry.get('replay_interval', 0.0)),
+            overrides=entry.get('config') or {},
+        )
+
+
+class SharedResources:
+    """O que as instâncias dividem: conhecimento somente leitura, templates, OCR e input.
+
+    - ``PokemonDatabase`` e os tensores de matchup são carregados uma vez;
+    - o banco de templates é lido do disco uma vez (detector e input de todas as instâncias);
+    - ``OCRWorkerPool`` limita os Tesseracts simultâneos do processo;
+    - ``InputArbiter`` serializa o cursor/teclado (um só por máquina);
+    - com ``supervisor.shared_capture``, um grab por monitor e período
+      (``SharedScreenCapture``) alimenta as fatias de todas as instâncias dele.
+    """
+
+    def __init__(self, config, db=None, templates=None, ocr_pool=None, arbiter=None):
+        cfg = (config or {}).get('supervisor', {}) or {}
+        self.cfg = config or {}
+        self.db = db if db is not None else PokemonDatabase()
+        self.templates = templates if templates is not None else GameStateDetector.load_templates(config)
+        self.ocr_pool = ocr_pool or OCRWorkerPool(cfg.get('ocr_workers') or None)
+        self.arbiter = arbiter or InputArbiter()
+        self._tensors = None
+        self._lock = threading.Lock()
+        self.screens = {}   # monitor -> SharedScreenCapture
+
+    def screen(self, monitor: int) -> Optional[SharedScreenCapture]:
+        """Captura compartilhada do monitor (criada no primeiro uso); None se desabilitada."""
+        with self._lock:
+            if monitor not in self.screens:
+                self.screens[monitor] = SharedScreenCapture.from_config(self.cfg, monitor)
+            return self.screens[monitor]
+
+    def matchup_table(self, team_manager) -> MatchupTable:
+        """Tabela de matchups da instância sobre os tensores compartilhados (linhas próprias)."""
+        with self._lock:
+            if self._tensors is None:
+                self._tensors = build_tensors(self.db.type_matrix)
+        table = MatchupTable(self.db, *self._tensors)
+        for name, moves in team_manager.known_moves.items():
+            table.set_moves(name, moves)
+        return table
+
+
+class BotInstance:
+    """Estado de execução de uma instância: controlador, thread e tempos."""
+
+    def __init__(self, spec: InstanceSpec):
+        self.spec = spec
+        self.name = spec.name
+        self.controller: Optional[BotController] = None
+        self.thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def alive(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+
+class Supervisor:
+    """Roda N instâncias do bot no mesmo processo, cada uma na sua thread.
+
+    Cada instância tem captura (região do monitor, fatia da captura compartilhada
+    ou ``ReplayCapture``), input
+    (offset da região + foco da janela), detector, ``TeamManager`` e estratégia
+    próprios; ``SharedResources`` guarda o que é compartilhado. O controlador é
+    montado dentro da thread da instância (``mss`` não é compartilhável entre threads).
+
+    Config por instância em ``supervisor.instances``; ``config`` da entrada
+    sobrescreve o settings só dela. Sem sobrescrita, o banco de golpes conhecidos
+    vira ``data/known_moves_<nome>.json`` (duas instâncias no mesmo journal se
+    corrompem). O orçamento de CPU do governor mede o processo inteiro, ou seja,
+    vale para o conjunto das instâncias.
+    """
+
+    def __init__(self, config, specs: List[InstanceSpec], shared: Optional[SharedResources] = None,
+                 controller_cls=BotController, input_backend=None):
+        self.cfg = config or {}
+        cfg = self.cfg.get('supervisor', {}) or {}
+        self.metrics_interval = float(cfg.get('metrics_interval', 30.0))
+        self.shared = shared or SharedResources(self.cfg)
+        self.controller_cls = controller_cls
+        self.input_backend = input_backend
+        self.instances = [BotInstance(spec) for spec in specs]
+        self._stop = threading.Event()
+        self._started_at: Optional[float] = None
+        self._cpu_started: Optional[float] = None
+        # CPU do processo + Tesseracts (filhos), também onde o SO não reporta os filhos
+        self._cpu_clock = cpu_clock(self.shared.ocr_pool)
+
+    @classmethod
+    def from_config(cls, config, controller_cls=BotController):
+        entries = (config or {}).get('supervisor', {}).get('instances') or []
+        if not entries:
+            return None
+        return cls(config, [InstanceSpec.from_dict(i, e) for i, e in enumerate(entries)], controller_cls=controller_cls)
+
+    # ---------- montagem ----------
+    def instance_config(self, spec: InstanceSpec) -> dict:
+        cfg = _merged(self.cfg, spec.overrides)
+        if not (spec.overrides.get('known_moves') or {}).get('path'):
+            known = cfg.setdefault('known_moves', {}) or {}
+            path = Path(known.get('path', 'data/known_moves.json'))
+            known['path'] = str(path.with_name(f"{path.stem}_{spec.name}{path.suffix}"))
+            cfg['known_moves'] = known
+        return cfg
+
+    def build(self, spec: InstanceSpec) -> BotController:
+        cfg = self.instance_config(spec)
+        shared = self.shared
+        shared_screen = shared.screen(spec.monitor) if spec.region and not spec.replay_dir else None
+        if spec.replay_dir:
+            screen = ReplayCapture.from_directory(spec.replay_dir, interval=spec.replay_interval)
+        elif shared_screen is not None:
+            # Fatia (view) do grab compartilhado; serve também às threads auxiliares
+            screen = shared_screen.tile(spec.region)
+        else:
+            screen = ScreenCapture(cfg, spec.monitor, spec.region)
+        offset = spec.input_offset if spec.input_offset is not None else screen.origin
+
+        ocr_cfg = cfg.get('ocr', {}) or {}
+        ocr = OCREngine(ocr_cfg.get('tesseract_path', 'tesseract'), timeout=ocr_cfg.get('timeout', 2.0),
+                        pool=shared.ocr_pool)
+        detector = GameStateDetector(screen, ocr, cfg, templates=shared.templates)
+        detector.name_validator = lambda name: bool(shared.db.get_pokemon_types(name))
+        input_sim = InputSimulator(cfg, offset=offset, arbiter=shared.arbiter, focus_point=spec.focus_point,
+                                   backend=self.input_backend, templates=shared.templates)
+        team_mgr = TeamManager(identity=shared.db.identity, config=cfg)
+        matchups = None
+        if (cfg.get('strategy', {}).get('matchup_table', {}) or {}).get('enabled', True):
+            matchups = shared.matchup_table(team_mgr)
+        components = {
+            'name': spec.name,
+            'screen': screen,
+            'capture_factory': screen.clone,
+            'detector': detector,
+            'input': input_sim,
+            'ocr': ocr,
+            'strategy': BattleStrategy(shared.db, team_mgr, cfg, matchups=matchups),
+            'team_mgr': team_mgr,
+            'move_consensus': MoveConsensus.from_config(cfg, validator=shared.db.identity.canonical_move),
+        }
+        logger.info(f"Instância '{spec.name}': região={spec.region or 'monitor inteiro'} "
+                    f"replay={spec.replay_dir or '-'} offset do input={tuple(offset)}")
+        return self.controller_cls(cfg, components)
+
+    # ---------- execução ----------
+    def start(self):
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._cpu_started = self._cpu_clock()
+        for instance in self.instances:
+            instance.thread = threading.Thread(
+                target=self._run_instance, args=(instance,), name=f"bot-{instance.name}", daemon=True
+            )
+            instance.thread.start()
+        logger.info(f"Supervisor: {len(self.instances)} instâncias iniciadas.")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for instance in self.instances:
+            if instance.controller is not None:
+                instance.controller.running = False
+        for instance in self.instances:
+            if instance.thread is not None:
+                instance.thread.join(timeout)
+        for screen in self.shared.screens.values():
+            if screen is not None:
+                screen.stop()
+
+    def alive(self) -> bool:
+        return any(instance.alive() for instance in self.instances)
+
+    def run(self):
+        """Sobe as instâncias e reporta métricas até todas pararem ou Ctrl+C."""
+        logger.configure(patcher=_tag_instance)
+        self.start()
+        next_report = time.monotonic() + self.metrics_interval
+        try:
+            while self.alive():
+                time.sleep(0.5)
+                if time.monotonic() >= next_report:
+                    logger.info(self.summary())
+                    next_report = time.monotonic() + self.metrics_interval
+        except KeyboardInterrupt:
+            logger.info("Interrupção manual (Ctrl+C). Parando instâncias...")
+        finally:
+            self.stop()
+            logger.info(self.summary())
+
+    def _run_instance(self, instance: BotInstance):
+        with logger.contextualize(instance=instance.name):
+            try:
+                instance.controller = self.build(instance.spec)
+                if self._stop.is_set():
+                    return
+                instance.started_at = time.monotonic()
+                instance.controller.run()
+            except Exception as e:
+                instance.error = str(e)
+                logger.exception(f"Instância '{instance.name}' encerrou com erro: {e}")
+            finally:
+                instance.finished_at = time.monotonic()
+
+    # ---------- métricas ----------
+    def metrics(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        out = {}
+        for instance in self.instances:
+            bot = instance.controller
+            elapsed = ((instance.finished_at or now) - instance.started_at) if instance.started_at else 0.0
+            ticks = bot.ticks if bot is not None else 0
+            out[instance.name] = {
+                'alive': instance.alive(),
+                'ticks': ticks,
+                'ticks_per_s': ticks / elapsed if elapsed > 0 else 0.0,
+                'state': bot.last_state.name if bot is not None else 'STARTING',
+                'errors': bot.errors if bot is not None else 0,
+                'ocr_calls': bot.ocr.calls if bot is not None else 0,
+                'ocr_timeouts': bot.ocr.timeouts if bot is not None else 0,
+                'stalls': sum(bot.watchdog.stalls.values()) if bot is not None and bot.watchdog is not None else 0,
+                'shed_level': bot.governor.shed_level if bot is not None and bot.governor is not None else 0,
+                'error': instance.error,
+            }
+        return out
+
+    def scaling(self) -> Dict[str, float]:
+        """Totais do processo: vazão somada, CPU por instância e fila do pool de OCR."""
+        metrics = self.metrics()
+        wall = time.monotonic() - self._started_at if self._started_at else 0.0
+        cpu = (self._cpu_clock() - self._cpu_started) / wall if wall > 0 else 0.0
+        alive = sum(1 for m in metrics.values() if m['alive'])
+        screens = [c for c in self.shared.screens.values() if c is not None]
+        return {
+            'instances': len(self.instances),
+            'alive': alive,
+            'ticks_per_s': sum(m['ticks_per_s'] for m in metrics.values()),
+            'cpu': cpu,
+            'cpu_per_instance': cpu / alive if alive else 0.0,
+            'input_switches': self.shared.arbiter.switches,
+            **{f"ocr_{k}": v for k, v in self.shared.ocr_pool.stats().items()},
+            'capture_grabs_per_s': sum(c.grabs for c in screens) / wall if wall > 0 else 0.0,
+            'capture_tiles': sum(c.tiles for c in screens),
+        }
+
+    def summary(self) -> str:
+        s = self.scaling()
+        lines = [
+            f"Supervisor: {s['alive']}/{s['instances']} ativas, {s['ticks_per_s']:.1f} ticks/s no total, "
+            f"CPU {s['cpu']:.0%} ({s['cpu_per_instance']:.0%}/instância), "
+            f"OCR {s['ocr_calls']} leituras em {s['ocr_workers']} workers "
+            f"(pico {s['ocr_peak']}, espera média {s['ocr_avg_wait_ms']:.0f}ms)"
+            + (f", captura compartilhada {s['capture_grabs_per_s']:.1f} grabs/s para {s['capture_tiles']} fatias"
+               if s['capture_tiles'] else "")
+        ]
+        for name, m in self.metrics().items():
+            lines.append(
+                f"  [{name}] {'ativa' if m['alive'] else 'parada'} {m['state']} | {m['ticks']} ticks "
+                f"({m['ticks_per_s']:.1f}/s) | erros={m['errors']} OCR={m['ocr_calls']} "
+                f"(timeouts={m['ocr_timeouts']}) estouros={m['stalls']}"
+                + (f" | {m['error']}" if m['error'] else "")
+            )
+        return "\n".join(lines)
+
+
+def _merged(base: dict, overrides: dict) -> dict:
+    """Cópia profunda de ``base`` com ``overrides`` aplicado recursivamente."""
+    out = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = _merged(out[key], value)
+        else:
+            out[key] = copy.deepcopy(value)
+    return out
+
+
+def _tag_instance(record):
+    """Prefixa as mensagens de log com o nome da instância (``logger.contextualize``)."""
+    instance = record["extra"].get("instance")
+    if instance:
+        record["message"] = f"[{instance}] {record['message']}"
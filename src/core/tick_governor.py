@@ -0,0 +1,165 @@
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from ..perception.game_state_detector import GameState
+from ..perception.perception_scheduler import Priority
+from ..perception.screen_state import ScreenState
+
+# Miniatura (largura, altura) usada para medir mudança entre ticks
+ACTIVITY_SIZE = (64, 36)
+# Nível de corte -> prioridade mínima descartada no scheduler
+SHED_LEVELS = (None, Priority.LOW, Priority.NORMAL)
+# os.times() só soma os filhos (o Tesseract do pytesseract) em POSIX; no Windows children_* é sempre 0
+CHILD_CPU_REPORTED = os.name == 'posix'
+
+
+def process_cpu_time() -> float:
+    """CPU do processo (todas as threads) mais a dos processos filhos já encerrados, em segundos."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def cpu_clock(ocr=None) -> Callable[[], float]:
+    """Relógio de CPU do bot, incluindo o Tesseract (cada leitura é um processo filho).
+
+    Onde o SO não reporta a CPU dos filhos, soma o tempo de parede das chamadas
+    ao Tesseract (``busy_seconds`` do ``OCRWorkerPool`` compartilhado ou do
+    ``OCREngine``) no lugar dela.
+    """
+    source = getattr(ocr, 'pool', None) or ocr
+    if CHILD_CPU_REPORTED or not hasattr(source, 'busy_seconds'):
+        return process_cpu_time
+    return lambda: process_cpu_time() + source.busy_seconds
+
+
+class TickGovernor:
+    """Ajusta o intervalo do loop por estado e atividade, dentro de um orçamento de CPU.
+
+    - Intervalo base por contexto (``battle``/``dialog``/``exploring``); logo que a
+      barra de batalha aparece, ``burst_interval`` por ``burst_seconds``.
+    - Tela parada há mais de ``idle_after`` segundos: sobe para ``idle_interval``.
+    - Orçamento de CPU (``cpu_budget``, fração de um núcleo, medido com
+      ``cpu_clock`` — processo + Tesseract — numa janela deslizante): acima dele, desliga detectores
+      opcionais no scheduler (primeiro LOW, depois NORMAL) e estica o intervalo;
+      abaixo de ``recover_ratio * cpu_budget``, religa um nível por vez.
+    """
+
+    def __init__(self, config=None, scheduler=None, clock: Callable[[], float] = time.monotonic,
+                 cpu_clock: Callable[[], float] = process_cpu_time):
+        cfg = (config or {}).get('bot', {}).get('governor', {}) or {}
+        loop_interval = float((config or {}).get('bot', {}).get('loop_interval', 1.0))
+        self.intervals: Dict[str, float] = {
+            'battle': 0.3, 'dialog': 0.5, 'exploring': loop_interval, **(cfg.get('intervals') or {})
+        }
+        self.burst_interval = float(cfg.get('burst_interval', 0.1))
+        self.burst_seconds = float(cfg.get('burst_seconds', 2.0))
+        self.idle_after = float(cfg.get('idle_after', 5.0))
+        self.idle_interval = float(cfg.get('idle_interval', 3.0))
+        self.change_threshold = float(cfg.get('change_threshold', 3.0))
+        self.cpu_budget = float(cfg.get('cpu_budget', 0.25))
+        self.cpu_window = float(cfg.get('cpu_window', 10.0))
+        self.recover_ratio = float(cfg.get('recover_ratio', 0.7))
+        self.adjust_every = float(cfg.get('adjust_every', 2.0))
+        self.max_stretch = float(cfg.get('max_stretch', 4.0))
+        self.scheduler = scheduler
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+
+        self.context = 'exploring'
+        self.shed_level = 0
+        self.last_interval = self.intervals['exploring']
+        self._burst_until = 0.0
+        self._last_change = clock()
+        self._last_adjust = clock()
+        self._prev_thumb = None
+        self._cpu_samples = deque()
+
+    @classmethod
+    def from_config(cls, config, scheduler=None, ocr=None):
+        cfg = (config or {}).get('bot', {}).get('governor', {}) or {}
+        if not cfg.get('enabled', False):
+            return None
+        return cls(config, scheduler, cpu_clock=cpu_clock(ocr))
+
+    @staticmethod
+    def context_of(state, screen_state=None) -> str:
+        if screen_state == ScreenState.DIALOG:
+            return 'dialog'
+        if state == GameState.IN_BATTLE or (screen_state is not None and screen_state.in_battle):
+            return 'battle'
+        return 'exploring'
+
+    def next_interval(self, state, frame=None, screen_state=None) -> float:
+        """Intervalo até o próximo tick, dado o estado e o frame deste tick."""
+        now = self.clock()
+        context = self.context_of(state, screen_state)
+        if context == 'battle' and self.context != 'battle':
+            self._burst_until = now + self.burst_seconds
+        self.context = context
+        if frame is not None and self._changed(frame):
+            self._last_change = now
+
+        interval = self.intervals.get(context, self.intervals['exploring'])
+        if now < self._burst_until:
+            interval = min(interval, self.burst_interval)
+        elif now - self._last_change > self.idle_after:
+            interval = max(interval, self.idle_interval)
+
+        usage = self.cpu_usage()
+        self._adjust_shedding(usage, now)
+        if usage is not None and usage > self.cpu_budget > 0:
+            interval *= min(self.max_stretch, usage / self.cpu_budget)
+        self.last_interval = interval
+        return interval
+
+    def cpu_usage(self) -> Optional[float]:
+        """CPU do processo e do Tesseract / tempo de parede na janela; None até ter 1s de amostra."""
+        now, cpu = self.clock(), self.cpu_clock()
+        self._cpu_samples.append((now, cpu))
+        while len(self._cpu_samples) > 2 and now - self._cpu_samples[1][0] >= self.cpu_window:
+            self._cpu_samples.popleft()
+        first_wall, first_cpu = self._cpu_samples[0]
+        if now - first_wall < 1.0:
+            return None
+        return (cpu - first_cpu) / (now - first_wall)
+
+    def stats(self) -> Dict[str, object]:
+        usage = self.cpu_usage()
+        return {
+            'context': self.context,
+            'interval': self.last_interval,
+            'cpu_usage': usage,
+            'cpu_budget': self.cpu_budget,
+            'shed_level': self.shed_level,
+        }
+
+    def _changed(self, frame) -> bool:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        thumb = cv2.resize(gray, ACTIVITY_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+        prev, self._prev_thumb = self._prev_thumb, thumb
+        return prev is None or float(np.abs(thumb - prev).mean()) > self.change_threshold
+
+    def _adjust_shedding(self, usage, now):
+        if usage is None or self.cpu_budget <= 0 or now - self._last_adjust < self.adjust_every:
+            return
+        level = self.shed_level
+        if usage > self.cpu_budget:
+            level = min(level + 1, len(SHED_LEVELS) - 1)
+        elif usage < self.recover_ratio * self.cpu_budget:
+            level = max(level - 1, 0)
+        self._last_adjust = now
+        if level == self.shed_level:
+            return
+        logger.info(
+            f"CPU {usage:.0%} (orçamento {self.cpu_budget:.0%}): corte de detectores "
+            f"{self.shed_level} -> {level} ({SHED_LEVELS[level].name if SHED_LEVELS[level] else 'nenhum'})"
+        )
+        self.shed_level = level
+        if self.scheduler is not None:
+            self.scheduler.shed_priority = SHED_LEVELS[level]
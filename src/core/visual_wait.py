@@ -0,0 +1,133 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+# Miniatura (largura, altura) usada para medir movimento entre frames
+MOTION_SIZE = (64, 36)
+
+
+@dataclass
+class WaitRecord:
+    """Estatística acumulada de um tipo de espera (``label``)."""
+
+    count: int = 0
+    timeouts: int = 0
+    waited: float = 0.0        # tempo realmente esperado (s)
+    budget: float = 0.0        # soma dos timeouts (o que os sleeps fixos gastariam)
+    longest: float = 0.0
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.budget - self.waited)
+
+
+def motion_settled(threshold: float = 2.0, frames: int = 2) -> Callable:
+    """Condição "tela parou de mexer": ``frames`` diferenças seguidas abaixo de ``threshold``.
+
+    Compara miniaturas em cinza de frames consecutivos (diferença média 0-255).
+    Cada chamada cria uma condição nova (guarda o frame anterior).
+    """
+    state = {'prev': None, 'still': 0}
+
+    def condition(frame) -> bool:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        thumb = cv2.resize(gray, MOTION_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+        prev, state['prev'] = state['prev'], thumb
+        if prev is None:
+            return False
+        state['still'] = state['still'] + 1 if float(np.abs(thumb - prev).mean()) < threshold else 0
+        return state['still'] >= frames
+
+    return condition
+
+
+def any_of(*conditions: Callable) -> Callable:
+    """Condição verdadeira quando qualquer uma das condições for (todas são avaliadas no mesmo frame)."""
+    def condition(frame) -> bool:
+        return any([c(frame) for c in conditions])
+    return condition
+
+
+class VisualWaiter:
+    """Espera por uma condição visual em vez de dormir um tempo fixo.
+
+    ``wait_until`` captura um frame a cada ``poll`` segundos e retorna assim que
+    ``condition(frame)`` for verdadeira, ou no ``timeout`` (o antigo sleep fixo,
+    que vira o pior caso). Registra quanto cada espera realmente levou, por
+    ``label``. ``sleep`` deve ser o sleep preemptível do bot (acorda com shiny).
+    """
+
+    def __init__(self, capture: Callable, sleep: Callable[[float], None] = time.sleep,
+                 poll: float = 0.1, enabled: bool = True, clock: Callable[[], float] = time.monotonic):
+        self.capture = capture
+        self.sleep = sleep
+        self.poll = float(poll)
+        self.enabled = enabled
+        self.clock = clock
+        self.records: Dict[str, WaitRecord] = {}
+
+    @classmethod
+    def from_config(cls, config, capture, sleep=time.sleep):
+        cfg = (config or {}).get('bot', {}).get('visual_wait', {}) or {}
+        return cls(capture, sleep, poll=cfg.get('poll', 0.1), enabled=cfg.get('enabled', True))
+
+    def wait_until(self, label: str, condition: Optional[Callable], timeout: float,
+                   poll: Optional[float] = None, min_wait: float = 0.0) -> Tuple[bool, object]:
+        """Espera ``condition(frame)``; retorna ``(atendida, último frame capturado)``.
+
+        ``min_wait`` ignora a condição no começo (ex.: o personagem ainda não começou
+        a andar). Exceções na condição contam como "ainda não".
+        """
+        timeout = max(0.0, float(timeout))
+        poll = self.poll if poll is None else float(poll)
+        start = self.clock()
+        if condition is None or not self.enabled:
+            self.sleep(timeout)
+            self._record(label, self.clock() - start, timeout, met=False)
+            return False, None
+
+        while True:
+            frame = self.capture()
+            elapsed = self.clock() - start
+            met = False
+            if elapsed >= min_wait:
+                try:
+                    met = bool(condition(frame))
+                except Exception as e:
+                    logger.debug(f"Condição de espera '{label}' falhou: {e}")
+            if met or elapsed >= timeout:
+                self._record(label, elapsed, timeout, met)
+                return met, frame
+            self.sleep(min(poll, timeout - elapsed))
+
+    def _record(self, label, waited, timeout, met):
+        rec = self.records.setdefault(label, WaitRecord())
+        rec.count += 1
+        rec.timeouts += 0 if met else 1
+        rec.waited += waited
+        rec.budget += timeout
+        rec.longest = max(rec.longest, waited)
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            label: {
+                'count': r.count,
+                'timeouts': r.timeouts,
+                'mean': r.waited / r.count if r.count else 0.0,
+                'longest': r.longest,
+                'saved': r.saved,
+            }
+            for label, r in self.records.items()
+        }
+
+    def summary(self) -> str:
+        saved = sum(r.saved for r in self.records.values())
+        parts = [
+            f"{label}: {s['count']}x média {s['mean']:.2f}s (timeouts={s['timeouts']})"
+            for label, s in self.stats().items()
+        ]
+        return f"Esperas visuais economizaram {saved:.1f}s | " + "; ".join(parts)
@@ -0,0 +1,295 @@
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class StallEvent:
+    """Estágio que passou do deadline (``ongoing``: detectado enquanto ainda rodava)."""
+
+    stage: str
+    duration: float
+    deadline: float
+    thread: str
+    where: str = ""
+    ongoing: bool = False
+
+
+class StageDeadlineExceeded(BaseException):
+    """Levantada num ponto de espera do handler cujo estágio passou do deadline.
+
+    Herda de ``BaseException`` (como ``ShinyDetected``) para atravessar os
+    ``except Exception`` dos handlers até o ``_dispatch``.
+    """
+
+    def __init__(self, stage: str, elapsed: float, deadline: float):
+        super().__init__(f"Estágio '{stage}' passou do deadline ({elapsed:.2f}s > {deadline:.2f}s)")
+        self.stage = stage
+        self.elapsed = elapsed
+
+
+class DeadlineExecutor:
+    """Pool elástico de threads daemon em que a chamada que passa do deadline é abandonada.
+
+    Threads Python não podem ser mortas: o worker travado é aposentado (sai quando
+    a chamada voltar, e o resultado é descartado) e a vaga dele é reposta no próximo
+    ``submit``, então as chamadas seguintes não ficam presas atrás dele. Um worker
+    novo sobe sempre que não há nenhum livre (até ``max_workers``), então chamadas
+    concorrentes (loop, especulação) não esperam na fila.
+    """
+
+    def __init__(self, name: str, max_workers: int = 8):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.abandoned = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._retired = set()
+        self._running: Dict[Future, threading.Thread] = {}
+        self._idle = 0
+        self._spawned = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        with self._lock:
+            if self._idle <= self._queue.qsize() and len(self._workers) < self.max_workers:
+                self._spawned += 1
+                worker = threading.Thread(target=self._work, name=f"{self.name}-{self._spawned}", daemon=True)
+                self._workers.add(worker)
+                worker.start()
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, timeout: float, fn, *args, **kwargs):
+        """Resultado de ``fn`` ou ``FutureTimeout`` após ``timeout`` s (com o worker já abandonado)."""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            self.abandon(future)
+            raise
+
+    def abandon(self, future: Future):
+        if future.cancel():
+            return   # ainda na fila: nem chega a rodar
+        with self._lock:
+            worker = self._running.get(future)
+            if worker is not None and worker in self._workers:
+                self._workers.discard(worker)
+                self._retired.add(worker)
+                self.abandoned += 1
+
+    def _work(self):
+        me = threading.current_thread()
+        while True:
+            with self._lock:
+                self._idle += 1
+            future, fn, args, kwargs = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._running[future] = me
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            with self._lock:
+                self._running.pop(future, None)
+                if me in self._retired:
+                    self._retired.discard(me)
+                    return
+
+
+class Watchdog:
+    """Deadlines por estágio do tick (captura, estado, handlers, OCR...).
+
+    ``with watchdog.stage('battle'):`` marca o estágio como ativo na thread atual.
+    Uma thread monitora os estágios ativos a cada ``check_interval`` e registra
+    (uma vez) os que passaram do deadline ainda rodando, com a linha onde a thread
+    está parada; ao terminar, o estágio estourado também é registrado com a duração
+    final. Eventos externos (ex.: timeout do Tesseract, processo morto) entram por
+    ``record``.
+
+    Com ``enforce`` os deadlines valem de verdade:
+
+    - ``guard(stage, fn, ...)`` roda chamadas bloqueantes (OCR) num
+      ``DeadlineExecutor``: passou do deadline, o worker é abandonado e substituído
+      e o chamador recebe ``fallback`` (ex.: leitura vazia) e segue;
+    - ``raise_if_overdue()`` (chamado nos pontos de espera dos handlers) levanta
+      ``StageDeadlineExceeded`` quando algum estágio da thread passou do deadline,
+      e o controlador abandona o handler e vai para o próximo tick. Handlers não
+      são movidos para outra thread: dois handlers vivos disputariam mouse e teclado.
+    """
+
+    def __init__(self, deadlines: Optional[Dict[str, float]] = None, default_deadline: float = 5.0,
+                 check_interval: float = 0.5, clock: Callable[[], float] = time.monotonic,
+                 enforce: bool = True, max_workers: int = 8):
+        self.deadlines = dict(deadlines or {})
+        self.default_deadline = float(default_deadline)
+        self.check_interval = float(check_interval)
+        self.clock = clock
+        self.enforce = bool(enforce)
+        self.max_workers = int(max_workers)
+        self._executors: Dict[str, DeadlineExecutor] = {}
+        self.events: deque = deque(maxlen=200)
+        self.stalls: Counter = Counter()
+        self._active: Dict[int, List[list]] = {}   # thread id -> pilha de [estágio, início, reportado]
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config):
+        cfg = (config or {}).get('watchdog', {}) or {}
+        if not cfg.get('enabled', True):
+            return None
+        deadlines = dict(cfg.get('deadlines') or {})
+        ocr_timeout = (config or {}).get('ocr', {}).get('timeout')
+        if ocr_timeout is not None:
+            # Folga sobre o timeout do próprio Tesseract (que mata o processo antes)
+            deadlines.setdefault('ocr', float(ocr_timeout) + float(cfg.get('ocr_grace', 1.0)))
+        return cls(
+            deadlines, cfg.get('default_deadline', 5.0), cfg.get('check_interval', 0.5),
+            enforce=cfg.get('enforce', True), max_workers=cfg.get('max_workers', 8),
+        )
+
+    def deadline(self, stage: str) -> float:
+        return float(self.deadlines.get(stage, self.default_deadline))
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = [name, self.clock(), False]
+        tid = threading.get_ident()
+        with self._lock:
+            self._active.setdefault(tid, []).append(entry)
+        try:
+            yield
+        finally:
+            with self._lock:
+                stack = self._active.get(tid, [])
+                if entry in stack:
+                    stack.remove(entry)
+                if not stack:
+                    self._active.pop(tid, None)
+            duration = self.clock() - entry[1]
+            if duration > self.deadline(name):
+                self.record(name, duration, where="concluído")
+
+    def guard(self, stage: str, fn, *args, fallback=None, **kwargs):
+        """``fn(*args)`` com o deadline de ``stage``; estourou, abandona o worker e devolve ``fallback``."""
+        if not self.enforce:
+            return fn(*args, **kwargs)
+        with self._lock:
+            executor = self._executors.get(stage)
+            if executor is None:
+                executor = self._executors[stage] = DeadlineExecutor(f"guard-{stage}", self.max_workers)
+        started = self.clock()
+        try:
+            return executor.call(self.deadline(stage), fn, *args, **kwargs)
+        except FutureTimeout:
+            self.record(stage, self.clock() - started, where="abandonado (worker substituído)")
+            return fallback
+
+    def raise_if_overdue(self):
+        """Levanta ``StageDeadlineExceeded`` se um estágio ativo desta thread passou do deadline."""
+        if not self.enforce:
+            return
+        now = self.clock()
+        with self._lock:
+            stack = list(self._active.get(threading.get_ident(), ()))
+        for name, started, _ in stack:
+            elapsed = now - started
+            if elapsed > self.deadline(name):
+                raise StageDeadlineExceeded(name, elapsed, self.deadline(name))
+
+    def abandoned(self) -> int:
+        """Workers abandonados por deadline em todos os estágios protegidos por ``guard``."""
+        with self._lock:
+            return sum(executor.abandoned for executor in self._executors.values())
+
+    def record(self, stage: str, duration: float, deadline: Optional[float] = None, where: str = "",
+               ongoing: bool = False, thread: Optional[str] = None):
+        event = StallEvent(
+            stage, float(duration), self.deadline(stage) if deadline is None else float(deadline),
+            thread or threading.current_thread().name, where, ongoing,
+        )
+        with self._lock:
+            self.events.append(event)
+            if not ongoing:
+                self.stalls[stage] += 1
+        log = logger.warning if ongoing else logger.info
+        log(
+            f"Watchdog: estágio '{stage}' {'travado há' if ongoing else 'levou'} {event.duration:.2f}s "
+            f"(deadline {event.deadline:.2f}s) [{event.thread}] {where}"
+        )
+        return event
+
+    def check(self) -> List[StallEvent]:
+        """Varre os estágios ativos; registra os que passaram do deadline (uma vez cada)."""
+        now = self.clock()
+        overdue = []
+        with self._lock:
+            for tid, stack in self._active.items():
+                for entry in stack:
+                    name, started, reported = entry
+                    if not reported and now - started > self.deadline(name):
+                        entry[2] = True
+                        overdue.append((tid, name, now - started))
+        frames = sys._current_frames()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        return [
+            self.record(name, elapsed, where=self._where(frames.get(tid)), ongoing=True, thread=names.get(tid, str(tid)))
+            for tid, name, elapsed in overdue
+        ]
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="Watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def summary(self) -> str:
+        if not self.stalls:
+            return "Watchdog: nenhum estágio estourou o deadline."
+        return "Watchdog: estágios estourados " + ", ".join(f"{k}={v}" for k, v in self.stalls.most_common())
+
+    def _run(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Erro no watchdog: {e}")
+
+    @staticmethod
+    def _where(frame) -> str:
+        """Onde a thread está parada: a linha mais interna do bot (``src/``) e a chamada mais interna."""
+        if frame is None:
+            return ""
+        stack = traceback.extract_stack(frame)
+        inner = stack[-1]
+        ours = next((f for f in reversed(stack) if f"{os.sep}src{os.sep}" in f.filename or "/src/" in f.filename), inner)
+        where = f"em {os.path.basename(ours.filename)}:{ours.lineno} {ours.name}"
+        if ours is not inner:
+            where += f" -> {os.path.basename(inner.filename)}:{inner.lineno} {inner.name}"
+        return where
@@ -0,0 +1,314 @@
+"""Simulador Monte Carlo offline para avaliar políticas de batalha.
+
+Joga a ``BattleStrategy`` (ou uma política de referência) contra inimigos
+sorteados do ``dex.json`` (com o moveset provável no nível) usando os dados de tipo/golpe da base de
+conhecimento. Cada processo worker roda um lote de batalhas em lockstep: o
+estado (HP, Pokémon ativo) fica em arrays e cada turno é uma conta vetorizada
+sobre o lote inteiro. A política só é consultada uma vez por par
+(membro, inimigo, nível), já que ``get_best_move`` não depende do HP.
+
+Uso:
+  python -m src.decision.battle_simulator --battles 5000 --workers 4 [--policy strategy]
+"""
+
+import argparse
+import multiprocessing as mp
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .battle_strategy import BattleStrategy
+from .damage_calculator import CRIT_MULTIPLIER, RANDOM_MEAN, DamageCalculator, pad_types
+from .matchup_table import move_row
+
+POLICIES = ("strategy", "first_slot", "random")
+
+
+@dataclass
+class SimConfig:
+    battles: int = 1000
+    workers: int = 1
+    seed: int = 0
+    policy: str = "strategy"
+    team: Dict[str, List[str]] = field(default_factory=dict)
+    level: int = 30
+    enemy_levels: tuple = (20, 35)
+    max_turns: int = 50
+    batch_size: int = 256
+    data_path: str = "data"
+    config: Optional[dict] = None        # settings.yaml (ou overrides) repassado à BattleStrategy
+
+
+@dataclass
+class SimReport:
+    battles: int
+    wins: int
+    turns: np.ndarray          # turnos de cada batalha
+    won: np.ndarray            # bool por batalha
+    fainted: np.ndarray        # quantos membros nossos desmaiaram em cada batalha
+    elapsed: float
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.battles if self.battles else 0.0
+
+    @property
+    def mean_turns_to_win(self) -> float:
+        return float(self.turns[self.won].mean()) if self.wins else float("nan")
+
+    @property
+    def faint_rate(self) -> float:
+        """Fração das batalhas em que ao menos um Pokémon nosso desmaiou."""
+        return float((self.fainted > 0).mean()) if self.battles else 0.0
+
+    @property
+    def battles_per_second(self) -> float:
+        return self.battles / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def summary(self) -> str:
+        return (
+            f"{self.battles} batalhas | vitórias {self.win_rate:.1%} | "
+            f"turnos p/ vencer {self.mean_turns_to_win:.2f} | desmaios {self.faint_rate:.1%} | "
+            f"{self.battles_per_second:.0f} batalhas/s"
+        )
+
+
+class _SimTeam:
+    """TeamManager só-leitura em memória (o simulador nunca grava known_moves.json)."""
+
+    def __init__(self, known_moves):
+        self.known_moves = {k.strip().lower(): list(v) for k, v in known_moves.items()}
+        self.current_team = list(self.known_moves)
+
+    def get_moves(self, pokemon_name):
+        return self.known_moves.get((pokemon_name or "").strip().lower(), [])
+
+
+class _Worker:
+    """Estado por processo: db, política e caches de decisões/golpes inimigos."""
+
+    def __init__(self, cfg: SimConfig):
+        from src.knowledge.pokemon_database import PokemonDatabase
+
+        self.cfg = cfg
+        self.db = PokemonDatabase(cfg.data_path)
+        self.team = _SimTeam(cfg.team)
+        self.strategy = BattleStrategy(self.db, self.team, cfg.config)
+        self.calc = self.strategy.damage or DamageCalculator(self.db.type_matrix)
+        self.members = [m for m in self.team.current_team if self.db.get_pokemon_types(m)]
+        self.rows = [self.member_row(m) for m in self.members]
+        self.species = [name for name in self.db.dex_legacy if self.db.get_pokemon_types(name)]
+        self._decisions = {}
+        self._enemy_moves = {}
+
+    def member_row(self, member: str):
+        """Golpes conhecidos do membro; sem nenhum golpe reconhecido, só resta o Struggle."""
+        row = move_row(self.db, member, self.team.get_moves(member))
+        if not len(row.slots):
+            row = move_row(self.db, member, ["Struggle"])
+        return row
+
+    def choose(self, member_idx: int, enemy: str, enemy_level: int, rng: random.Random) -> int:
+        """Coluna (na ``MoveRow``) do golpe escolhido pela política."""
+        row = self.rows[member_idx]
+        if self.cfg.policy == "random":
+            return rng.randrange(len(row.slots))
+        if self.cfg.policy == "first_slot":
+            return 0
+        key = (member_idx, enemy, enemy_level)
+        if key not in self._decisions:
+            slot = self.strategy.get_best_move(self.members[member_idx], enemy, enemy_level, self.cfg.level)
+            cols = np.flatnonzero(row.slots == slot)
+            self._decisions[key] = int(cols[0]) if cols.size else 0
+        return self._decisions[key]
+
+    def enemy_row(self, enemy: str, level: int):
+        """Moveset provável no nível (``LearnsetIndex``: 4 últimos golpes aprendidos)."""
+        key = (enemy, level)
+        if key not in self._enemy_moves:
+            row = move_row(self.db, enemy, self.db.probable_moves(enemy, level))
+            if not len(row.slots) or not row.power.any():
+                row = move_row(self.db, enemy, ["Tackle"])
+            self._enemy_moves[key] = row
+        return self._enemy_moves[key]
+
+    def run_batch(self, n: int, seed: int):
+        rng = random.Random(seed)
+        nprng = np.random.default_rng(seed)
+        cfg, calc = self.cfg, self.calc
+        n_team = len(self.members)
+        if n_team == 0:
+            raise ValueError("Equipe vazia: nenhum membro com tipos conhecidos")
+
+        enemies = [rng.choice(self.species) for _ in range(n)]
+        enemy_levels = [rng.randint(*cfg.enemy_levels) for _ in range(n)]
+        team_types = np.stack([pad_types(r.attacker_types) for r in self.rows])
+        roll_scale = 1.0 / (RANDOM_MEAN * calc.crit_factor)
+
+        # Dano "por acerto" (sem aleatório/crítico/precisão) e precisão de cada decisão
+        our_hit = np.zeros((n, n_team), dtype=np.float32)
+        our_acc = np.zeros((n, n_team), dtype=np.float32)
+        enemy_hit = np.zeros((n, 4, n_team), dtype=np.float32)
+        enemy_acc = np.zeros((n, 4), dtype=np.float32)
+        enemy_nmoves = np.ones(n, dtype=np.intp)
+        for b, (enemy, lvl) in enumerate(zip(enemies, enemy_levels)):
+            enemy_types = self.db.type_indices(self.db.get_pokemon_types(enemy))
+            cols = [self.choose(m, enemy, lvl, rng) for m in range(n_team)]
+            chosen = [(row.power[c], row.types[c], row.category[c]) for row, c in zip(self.rows, cols)]
+            power, types, category = (np.array(x)[:, None] for x in zip(*chosen))
+            dmg = calc.expected_damage(
+                power, types, np.full((n_team, 1), 100.0), category, team_types, enemy_types,
+                [cfg.level] * n_team, lvl,
+            )
+            our_hit[b] = dmg[:, 0] * roll_scale
+            our_acc[b] = [row.accuracy[c] / 100.0 for row, c in zip(self.rows, cols)]
+
+            erow = self.enemy_row(enemy, lvl)
+            k = len(erow.slots)
+            enemy_nmoves[b] = k
+            enemy_acc[b, :k] = erow.accuracy / 100.0
+            dmg = calc.moveset_damage(erow, team_types, lvl, [cfg.level] * n_team)
+            enemy_hit[b, :k, :] = (dmg * roll_scale).T
+
+        hp_stat = self._hp(cfg.level)
+        my_hp = np.full((n, n_team), hp_stat, dtype=np.float32)
+        enemy_hp = np.array([self._hp(lvl) for lvl in enemy_levels], dtype=np.float32)
+        active = np.zeros(n, dtype=np.intp)
+        turns = np.zeros(n, dtype=np.int32)
+        done = np.zeros(n, dtype=bool)
+        won = np.zeros(n, dtype=bool)
+        idx = np.arange(n)
+
+        for _ in range(cfg.max_turns):
+            live = ~done
+            if not live.any():
+                break
+            turns[live] += 1
+
+            ours = self._roll(nprng, our_hit[idx, active], our_acc[idx, active], calc)
+            move = (nprng.random(n) * enemy_nmoves).astype(np.intp)
+            theirs = self._roll(nprng, enemy_hit[idx, move, active], enemy_acc[idx, move], calc)
+            we_first = nprng.random(n) < 0.5
+
+            # Quem age primeiro; o segundo só age se sobreviveu
+            enemy_hp -= np.where(live & we_first, ours, 0.0)
+            hit_us = live & (~we_first | (enemy_hp > 0))
+            my_hp[idx, active] -= np.where(hit_us, theirs, 0.0)
+            enemy_hp -= np.where(live & ~we_first & (my_hp[idx, active] > 0), ours, 0.0)
+
+            beaten = live & (enemy_hp <= 0)
+            won |= beaten
+            done |= beaten
+            # Membro desmaiado: entra o próximo vivo; sem ninguém, derrota
+            fainted = live & ~beaten & (my_hp[idx, active] <= 0)
+            active[fainted] += 1
+            lost = fainted & (active >= n_team)
+            active[lost] = n_team - 1
+            done |= lost
+
+        fainted_count = (my_hp <= 0).sum(axis=1)
+        return turns, won, fainted_count
+
+    def _hp(self, level):
+        return 2.0 * self.calc.nominal_base_stat * level / 100.0 + level + 10.0
+
+    @staticmethod
+    def _roll(nprng, per_hit, accuracy, calc):
+        n = per_hit.shape[0]
+        hit = nprng.random(n) < accuracy
+        crit = np.where(nprng.random(n) < calc.crit_chance, CRIT_MULTIPLIER, 1.0)
+        return per_hit * nprng.uniform(0.85, 1.0, n) * crit * hit
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(cfg: SimConfig):
+    global _worker
+    logger.disable("src")
+    _worker = _Worker(cfg)
+
+
+def _run_chunk(args):
+    n, seed = args
+    return _worker.run_batch(n, seed)
+
+
+def simulate(cfg: SimConfig) -> SimReport:
+    """Roda ``cfg.battles`` batalhas (em ``cfg.workers`` processos) e agrega as métricas."""
+    if cfg.policy not in POLICIES:
+        raise ValueError(f"Política desconhecida '{cfg.policy}' (opções: {POLICIES})")
+
+    chunks = []
+    remaining, seed = cfg.battles, cfg.seed
+    while remaining > 0:
+        size = min(cfg.batch_size, remaining)
+        chunks.append((size, seed))
+        remaining -= size
+        seed += 1
+
+    start = time.perf_counter()
+    if cfg.workers <= 1:
+        _init_worker(cfg)
+        results = [_run_chunk(c) for c in chunks]
+        logger.enable("src")
+    else:
+        with mp.Pool(cfg.workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+            results = pool.map(_run_chunk, chunks)
+    elapsed = time.perf_counter() - start
+
+    turns = np.concatenate([r[0] for r in results]) if results else np.zeros(0, dtype=np.int32)
+    won = np.concatenate([r[1] for r in results]) if results else np.zeros(0, dtype=bool)
+    fainted = np.concatenate([r[2] for r in results]) if results else np.zeros(0, dtype=np.int64)
+    return SimReport(len(turns), int(won.sum()), turns, won, fainted, elapsed)
+
+
+def _parse_team(spec: str) -> Dict[str, List[str]]:
+    """``"pikachu:Thunderbolt,Quick Attack;charmander:Ember,Scratch"``."""
+    team = {}
+    for entry in filter(None, (s.strip() for s in spec.split(";"))):
+        name, _, moves = entry.partition(":")
+        team[name.strip()] = [m.strip() for m in moves.split(",") if m.strip()]
+    return team
+
+
+def main(argv=None):
+    import json
+    from pathlib import Path
+
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Simulador Monte Carlo de batalhas.")
+    parser.add_argument("--battles", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=POLICIES, default="strategy")
+    parser.add_argument("--team", default=None, help="'nome:golpe,golpe;...' (padrão: data/known_moves.json)")
+    parser.add_argument("--level", type=int, default=30)
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--config", default="config/settings.yaml")
+    args = parser.parse_args(argv)
+
+    if args.team:
+        team = _parse_team(args.team)
+    else:
+        with (Path(args.data) / "known_moves.json").open("r", encoding="utf-8") as f:
+            team = json.load(f)
+    config = None
+    if Path(args.config).exists():
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+
+    report = simulate(SimConfig(
+        battles=args.battles, workers=args.workers, seed=args.seed, policy=args.policy,
+        team=team, level=args.level, data_path=args.data, config=config,
+    ))
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,52 @@
 from loguru import logger
 
+from .damage_calculator import STATUS_CATEGORY_IDS, DamageCalculator
+from .matchup_table import STATUS_PENALTY, move_row
+from .switch_planner import SwitchPlanner
+
 
 class BattleStrategy:
-    def __init__(self, db, team_manager, config=None):
+    def __init__(self, db, team_manager, config=None, matchups=None):
         self.db = db
         self.tm = team_manager
         self.config = config or {}
+        # Tabela pré-computada (MatchupTable); sem ela os golpes são pontuados um a um
+        self.matchups = matchups
+        # Dano esperado (fórmula padrão) quando o db expõe a matriz de tipos
+        self.damage = DamageCalculator.from_config(self.config, db)
+        self.switch_planner = (
+            SwitchPlanner(db, team_manager, self.damage, self.config, matchups)
+            if self.damage is not None and self.config.get('strategy', {}).get('switch', {}).get('enabled', True)
+            else None
+        )
 
         # Carrega estratégia do config.yaml ou usa defaults
         strategy_cfg = self.config.get('strategy', {})
         self.whitelist = set(strategy_cfg.get('whitelist', ["chansey", "blissey"]))
         self.blacklist = set(strategy_cfg.get('blacklist', ["magikarp", "caterpie"]))
 
-        # Força minúsculo para comparação
-        self.whitelist = {x.lower() for x in self.whitelist}
-        self.blacklist = {x.lower() for x in self.blacklist}
+        # Compara por id canônico da espécie (quando o db expõe ``species_id``),
+        # para que "Magikarp", "magikarp " e leituras ruidosas do OCR coincidam
+        self.whitelist = {self._species_key(x) for x in self.whitelist}
+        self.blacklist = {self._species_key(x) for x in self.blacklist}
+
+    def _species_key(self, name):
+        key = (name or "").strip().lower()
+        if key and hasattr(self.db, "species_id"):
+            species_id = self.db.species_id(key)
+            if species_id is not None:
+                return species_id
+        return key
 
     # ---------------------------------------------------------
     # Escolha de movimento
     # ---------------------------------------------------------
-    def get_best_move(self, my_pokemon_name, enemy_name):
-        """Escolhe o melhor movimento baseado em power, tipo e categoria.
+    def get_best_move(self, my_pokemon_name, enemy_name, enemy_level=None, my_level=None):
+        """Escolhe o melhor movimento.
 
-        - Usa dados do pokeapi (tipo_id, power, categoria).
-        - Aplica multiplicador de eficácia de tipo.
-        - Evita golpes puramente de status quando possível.
+        - Com ``DamageCalculator``: maior dano esperado (STAB, eficácia, precisão e
+          níveis; ``enemy_level`` vem da ROI ``enemy_level``, ``my_level`` do HUD de equipe).
+        - Senão: power x eficácia de tipo, evitando golpes puramente de status.
         """
 
         enemy_types = self.db.get_pokemon_types(enemy_name)
@@ -35,19 +57,41 @@ class BattleStrategy:
             logger.warning("Movimentos desconhecidos. Usando Slot 1.")
             return 0
 
+        if self.damage is not None:
+            row = self._move_row(my_pokemon_name, my_moves)
+            choice = self.damage.best_slot(
+                row, row.attacker_types, self.db.type_indices(enemy_types), my_level, enemy_level
+            ) if row is not None else None
+            if choice is not None:
+                best_slot, expected = choice
+                logger.info(f"Melhor golpe escolhido: slot={best_slot}, dano esperado={expected:.1f}")
+                return best_slot
+
+        if self.matchups is not None:
+            choice = self.matchups.best_move(my_pokemon_name, my_moves, enemy_types)
+            if choice is not None:
+                best_slot, best_score = choice
+                logger.info(f"Melhor golpe escolhido (tabela): slot={best_slot}, score={best_score}")
+                return best_slot
+
         best_slot = 0
         best_score = float("-inf")
 
+        # Busca dados de todos os golpes primeiro e calcula a eficácia de uma vez
+        slots = []
         for i, move_name in enumerate(my_moves):
             if not move_name:
                 continue
-
             move_key = move_name.strip().lower()
             move_data = self.db.get_move_data(move_key)
             if not move_data:
                 logger.debug(f"Dados não encontrados para golpe '{move_name}'")
                 continue
+            slots.append((i, move_name, move_data))
 
+        type_mults = self._type_multipliers([m.get("type_id") for _, _, m in slots], enemy_types)
+
+        for (i, move_name, move_data), type_mult in zip(slots, type_mults):
             power = float(move_data.get("power", 0) or 0)
             type_id = move_data.get("type_id")
             category_id = str(move_data.get("category_id")) if move_data.get("category_id") is not None else None
@@ -55,12 +99,11 @@ class BattleStrategy:
             score = power
 
             # Eficácia de tipo (se soubermos o type_id do golpe e do inimigo)
-            type_mult = self.db.get_type_multiplier(type_id, enemy_types)
             score *= type_mult
 
             # Penaliza movimentos de status (power 0 em categorias típicas de status/support)
-            if power == 0 and category_id in {"1", "2", "3", "5", "10", "11", "12", "13"}:
-                score -= 50
+            if power == 0 and category_id in STATUS_CATEGORY_IDS:
+                score -= STATUS_PENALTY
 
             logger.debug(
                 f"Avaliação golpe slot {i} '{move_name}': power={power}, type_id={type_id}, "
@@ -84,11 +127,10 @@ class BattleStrategy:
         - Fugir APENAS se o inimigo estiver na blacklist.
         - Caso contrário, nunca fugir (independente de matchup).
         """
-        enemy_key = (enemy_name or "").strip().lower()
-        if not enemy_key:
+        if not (enemy_name or "").strip():
             return False
 
-        if enemy_key in self.blacklist:
+        if self._species_key(enemy_name) in self.blacklist:
             logger.info(f"{enemy_name} está na BLACKLIST – fugindo da batalha.")
             return True
 
@@ -97,36 +139,82 @@ class BattleStrategy:
     # ---------------------------------------------------------
     # Decisão de troca (esqueleto, depende de integração com HUD)
     # ---------------------------------------------------------
-    def choose_switch_target(self, enemy_name):
+    def plan_switch(self, enemy_name, current_name=None, enemy_level=None, hp=None):
+        """``SwitchPlan`` (ranking da equipe + alvo com histerese), ou None sem planejador."""
+        if self.switch_planner is None:
+            return None
+        # HP/nível da equipe vêm do HUD de exploração (TeamHudTracker), quando disponível
+        if hp is None:
+            hp = getattr(self.tm, "team_hp", None)
+        levels = getattr(self.tm, "team_levels", None)
+        return self.switch_planner.plan(enemy_name, current_name, hp=hp, enemy_level=enemy_level, levels=levels)
+
+    def record_turn(self, switch_plan=None):
+        """Turno jogado (golpe ou troca): avança a histerese do planejador; ``switch_plan`` = troca feita."""
+        if self.switch_planner is not None:
+            self.switch_planner.commit(switch_plan)
+
+    def choose_switch_target(self, enemy_name, current_name=None, enemy_level=None):
         """Escolhe um alvo de troca na equipe atual.
 
-        Por enquanto, usa apenas nomes da equipe do TeamManager e procura
-        o primeiro que tenha pelo menos um golpe com multiplicador > 1.0.
+        Com o ``SwitchPlanner``, usa o alvo do plano (score ofensa - dano recebido,
+        com histerese). Sem ele, procura o primeiro membro que tenha pelo menos um
+        golpe com multiplicador > 1.0.
         Retorna o índice na lista current_team, ou None se não vale trocar.
         """
         team = getattr(self.tm, "current_team", [])
         if not team:
             return None
 
+        if self.switch_planner is not None:
+            plan = self.plan_switch(enemy_name, current_name, enemy_level)
+            if plan is None or plan.target is None:
+                return None
+            target = self.switch_planner.key(plan.target)
+            return next((i for i, name in enumerate(team) if self.switch_planner.key(name) == target), None)
+
         enemy_types = self.db.get_pokemon_types(enemy_name)
         if not enemy_types:
             return None
 
+        enemy_combo = self.matchups.defender_combo(enemy_types) if self.matchups is not None else None
+
         for idx, poke_name in enumerate(team):
             moves = self.tm.get_moves(poke_name)
             if not moves:
                 continue
-            for move_name in moves:
-                move_key = move_name.strip().lower()
-                move_data = self.db.get_move_data(move_key)
-                if not move_data:
-                    continue
-                type_id = move_data.get("type_id")
-                mult = self.db.get_type_multiplier(type_id, enemy_types)
-                if mult > 1.0:
+            row = self.matchups.row_for(poke_name, moves) if self.matchups is not None else None
+            if row is not None:
+                if self.matchups.has_super_effective(row, enemy_combo):
                     logger.info(
                         f"Troca sugerida: {poke_name} (slot {idx}) tem golpe super efetivo contra {enemy_name}."
                     )
                     return idx
-
-        return None
\ No newline at end of file
+                continue
+            move_types = []
+            for move_name in moves:
+                move_data = self.db.get_move_data(move_name.strip().lower())
+                if move_data:
+                    move_types.append(move_data.get("type_id"))
+            if any(mult > 1.0 for mult in self._type_multipliers(move_types, enemy_types)):
+                logger.info(
+                    f"Troca sugerida: {poke_name} (slot {idx}) tem golpe super efetivo contra {enemy_name}."
+                )
+                return idx
+
+        return None
+
+    def _move_row(self, pokemon_name, moves):
+        if not moves:
+            return None
+        if self.matchups is not None:
+            return self.matchups.row_for(pokemon_name, moves) or move_row(self.db, pokemon_name, moves)
+        return move_row(self.db, pokemon_name, moves)
+
+    def _type_multipliers(self, move_types, enemy_types):
+        """Eficácia de vários golpes contra o inimigo numa chamada (vetorizada quando o DB suporta)."""
+        if not move_types:
+            return []
+        if hasattr(self.db, "type_multipliers"):
+            return [float(m) for m in self.db.type_multipliers(move_types, enemy_types)]
+        return [self.db.get_type_multiplier(t, enemy_types) for t in move_types]
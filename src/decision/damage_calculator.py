@@ -0,0 +1,201 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ..knowledge.pokemon_database import UNKNOWN_TYPE
+
+# Classes de dano (só STATUS muda o cálculo: sem base stats não há razão A/D por classe)
+PHYSICAL, SPECIAL, STATUS = 0, 1, 2
+
+STAB = 1.5
+# Média do fator aleatório 0.85..1.0 da fórmula
+RANDOM_MEAN = 0.925
+CRIT_MULTIPLIER = 1.5
+
+# meta_category da PokeAPI para golpes de status/suporte
+STATUS_CATEGORY_IDS = {"1", "2", "3", "5", "10", "11", "12", "13"}
+
+
+def damage_class(category_id, power) -> int:
+    """Classe de dano a partir da categoria (legada ou meta_category da PokeAPI) e do poder.
+
+    A PokeAPI em cache não traz o split físico/especial: golpes de dano sem
+    categoria legada contam como físicos (com stats nominais o resultado é o mesmo).
+    """
+    if not power:
+        return STATUS
+    category = str(category_id).strip().lower() if category_id is not None else ""
+    if category == "special":
+        return SPECIAL
+    if category == "status" or category in STATUS_CATEGORY_IDS:
+        return STATUS
+    return PHYSICAL
+
+
+def pad_types(types: Sequence[int]) -> np.ndarray:
+    """Até 2 tipos internados; monotipo/desconhecido completa com ``UNKNOWN_TYPE`` (neutro)."""
+    out = np.full(2, UNKNOWN_TYPE, dtype=np.intp)
+    types = list(types)[:2]
+    out[:len(types)] = types
+    return out
+
+
+class DamageCalculator:
+    """Dano esperado pela fórmula padrão, vetorizado em (membros x golpes).
+
+    ``((2L/5 + 2) * Poder * A/D / 50 + 2) * STAB * eficácia * aleatório * crítico * precisão``
+
+    Sem base stats na base de conhecimento, A e D são estimados pelo nível com
+    um base stat nominal (``stat = 2 * base * L / 100 + 5``), igual para as duas
+    classes: o split físico/especial não altera o dano (a categoria só zera os
+    golpes de status). Os níveis são os lidos na tela (HUD/ROI ``enemy_level``).
+    """
+
+    def __init__(self, type_matrix: np.ndarray, default_level: int = 50,
+                 nominal_base_stat: float = 80.0, crit_chance: float = 1 / 24):
+        self.type_matrix = np.asarray(type_matrix, dtype=np.float32)
+        self.default_level = int(default_level)
+        self.nominal_base_stat = float(nominal_base_stat)
+        self.crit_chance = float(crit_chance)
+        self.crit_factor = 1.0 + (CRIT_MULTIPLIER - 1.0) * self.crit_chance
+
+    @classmethod
+    def from_config(cls, config, db):
+        cfg = (config or {}).get('strategy', {}).get('damage', {})
+        if not cfg.get('enabled', True) or getattr(db, "type_matrix", None) is None:
+            return None
+        return cls(
+            db.type_matrix,
+            default_level=cfg.get('default_level', 50),
+            nominal_base_stat=cfg.get('nominal_base_stat', 80),
+            crit_chance=cfg.get('crit_chance', 1 / 24),
+        )
+
+    def _stat(self, level):
+        return 2.0 * self.nominal_base_stat * level / 100.0 + 5.0
+
+    def _levels(self, levels, n):
+        out = np.full(n, self.default_level, dtype=np.float32)
+        if levels is not None:
+            for i, lvl in enumerate(list(levels)[:n]):
+                if lvl:
+                    out[i] = float(lvl)
+        return out
+
+    def effectiveness(self, move_types: np.ndarray, defender_types) -> np.ndarray:
+        """Multiplicador de tipo; ``defender_types`` é um defensor (até 2 tipos) ou ``(n, 2)`` por linha."""
+        defender = np.asarray(defender_types, dtype=np.intp)
+        if defender.ndim == 2:
+            d0, d1 = defender[:, 0:1], defender[:, 1:2]
+        else:
+            d0, d1 = pad_types(defender)
+        return self.type_matrix[move_types, d0] * self.type_matrix[move_types, d1]
+
+    def expected_damage(self, power, move_types, accuracy, category, attacker_types,
+                        defender_types, attacker_levels=None, defender_level=None) -> np.ndarray:
+        """Dano esperado ``(n, k)`` de ``k`` golpes de cada um dos ``n`` atacantes.
+
+        - ``power``/``move_types``/``accuracy``/``category``: ``(n, k)``
+        - ``attacker_types``: ``(n, 2)`` tipos internados (``UNKNOWN_TYPE`` como padding)
+        - ``defender_types``: até 2 tipos internados do inimigo, ou ``(n, 2)`` com um defensor por linha
+        - ``attacker_levels``: ``(n,)``, ``None``/0 = nível padrão
+        - ``defender_level``: nível do inimigo, ou ``(n,)`` quando há um defensor por linha
+        """
+        power = np.asarray(power, dtype=np.float32)
+        move_types = np.asarray(move_types, dtype=np.intp)
+        category = np.asarray(category)
+        attacker_types = np.asarray(attacker_types, dtype=np.intp)
+        n = power.shape[0]
+
+        levels = self._levels(attacker_levels, n)[:, None]
+        if defender_level is None or np.ndim(defender_level) == 0:
+            enemy_level = float(defender_level or self.default_level)
+        else:
+            enemy_level = self._levels(defender_level, n)[:, None]
+        ratio = self._stat(levels) / self._stat(enemy_level)
+
+        stab = (move_types == attacker_types[:, 0:1]) | (move_types == attacker_types[:, 1:2])
+        stab &= move_types != UNKNOWN_TYPE
+
+        base = (2.0 * levels / 5.0 + 2.0) * power * ratio / 50.0 + 2.0
+        damage = (
+            base
+            * np.where(stab, STAB, 1.0)
+            * self.effectiveness(move_types, defender_types)
+            * (np.asarray(accuracy, dtype=np.float32) / 100.0)
+            * (RANDOM_MEAN * self.crit_factor)
+        )
+        damage[(category == STATUS) | (power <= 0)] = 0.0
+        return damage.astype(np.float32, copy=False)
+
+    def incoming_damage(self, attacker_types, defender_types, power: float = 70.0,
+                        attacker_level=None, defender_levels=None) -> np.ndarray:
+        """Dano esperado que um inimigo causa em cada um de ``n`` defensores (vetor ``(n,)``).
+
+        Sem conhecer os golpes do inimigo, assume um golpe STAB de poder ``power``
+        por tipo dele e fica com o pior caso entre esses.
+        """
+        defender_types = np.asarray(defender_types, dtype=np.intp).reshape(-1, 2)
+        n = defender_types.shape[0]
+        enemy_types = [t for t in pad_types(attacker_types) if t != UNKNOWN_TYPE] or [UNKNOWN_TYPE]
+        move_types = np.asarray(enemy_types, dtype=np.intp)[:, None]
+
+        level = float(attacker_level or self.default_level)
+        ratio = self._stat(level) / self._stat(self._levels(defender_levels, n))
+        base = (2.0 * level / 5.0 + 2.0) * float(power) * ratio / 50.0 + 2.0
+        eff = self.type_matrix[move_types, defender_types[:, 0]] * self.type_matrix[move_types, defender_types[:, 1]]
+        stab = np.where(move_types != UNKNOWN_TYPE, STAB, 1.0)
+        damage = base[None, :] * stab * eff * (RANDOM_MEAN * self.crit_factor)
+        return damage.max(axis=0).astype(np.float32, copy=False)
+
+    def moveset_damage(self, row, defender_types, attacker_level=None, defender_levels=None) -> np.ndarray:
+        """Dano esperado ``(n, k)`` dos ``k`` golpes de um atacante (``MoveRow``) em ``n`` defensores."""
+        defender = np.asarray(defender_types, dtype=np.intp).reshape(-1, 2)
+        n, k = defender.shape[0], len(row.slots)
+        return self.expected_damage(
+            np.broadcast_to(row.power, (n, k)),
+            np.broadcast_to(row.types, (n, k)),
+            np.broadcast_to(row.accuracy, (n, k)),
+            np.broadcast_to(row.category, (n, k)),
+            np.broadcast_to(pad_types(row.attacker_types), (n, 2)),
+            defender,
+            [attacker_level] * n,
+            defender_levels,
+        )
+
+    def team_damage(self, rows, attacker_types, defender_types, levels=None, defender_level=None) -> np.ndarray:
+        """Dano esperado de várias ``MoveRow`` (uma por membro) numa única chamada.
+
+        Retorna ``(len(rows), max_golpes)``; posições sem golpe ficam em ``-inf``.
+        """
+        n = len(rows)
+        width = max([len(r.slots) for r in rows] + [1])
+        power = np.zeros((n, width), dtype=np.float32)
+        move_types = np.full((n, width), UNKNOWN_TYPE, dtype=np.intp)
+        accuracy = np.zeros((n, width), dtype=np.float32)
+        category = np.full((n, width), STATUS, dtype=np.int8)
+        valid = np.zeros((n, width), dtype=bool)
+        for i, row in enumerate(rows):
+            k = len(row.slots)
+            power[i, :k] = row.power
+            move_types[i, :k] = row.types
+            accuracy[i, :k] = row.accuracy
+            category[i, :k] = row.category
+            valid[i, :k] = True
+
+        damage = self.expected_damage(
+            power, move_types, accuracy, category,
+            np.stack([pad_types(t) for t in attacker_types]) if n else np.zeros((0, 2), dtype=np.intp),
+            defender_types, levels, defender_level,
+        )
+        damage[~valid] = -np.inf
+        return damage
+
+    def best_slot(self, row, attacker_types, defender_types, level=None,
+                  defender_level=None) -> Optional[tuple]:
+        """``(slot, dano_esperado)`` do melhor golpe de um membro, ou None sem golpes."""
+        if row is None or len(row.slots) == 0:
+            return None
+        damage = self.team_damage([row], [attacker_types], defender_types, [level], defender_level)[0]
+        best = int(np.argmax(damage))
+        return int(row.slots[best]), float(damage[best])
@@ -0,0 +1,277 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..knowledge.knowledge_store import source_fingerprint
+from ..knowledge.pokemon_database import N_TYPES, UNKNOWN_TYPE
+from .damage_calculator import STAB, STATUS_CATEGORY_IDS, damage_class
+
+# Versão do formato do .npz (mudar invalida tabelas antigas)
+FORMAT_VERSION = 2
+
+# Penalidade de golpes de status (power 0) no score da tabela
+STATUS_PENALTY = 50.0
+
+# Combinações de tipo (a <= b; a == b é monotipo), incluindo o tipo desconhecido
+TYPE_COMBOS = [(a, b) for a in range(N_TYPES) for b in range(a, N_TYPES)]
+COMBO_INDEX = np.zeros((N_TYPES, N_TYPES), dtype=np.int16)
+for _i, (_a, _b) in enumerate(TYPE_COMBOS):
+    COMBO_INDEX[_a, _b] = COMBO_INDEX[_b, _a] = _i
+N_COMBOS = len(TYPE_COMBOS)
+
+
+def combo_of(type_indices) -> int:
+    """Índice da combinação para 0, 1 ou 2 tipos já internados (``PokemonDatabase.type_index``)."""
+    idx = [int(t) for t in list(type_indices)[:2]]
+    if not idx:
+        return int(COMBO_INDEX[UNKNOWN_TYPE, UNKNOWN_TYPE])
+    return int(COMBO_INDEX[idx[0], idx[-1]])
+
+
+def build_tensors(type_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pré-computa ``(effectiveness, scores)`` a partir da matriz 19x19 de tipos.
+
+    - ``effectiveness[tipo_golpe, combo_defensor]``: multiplicador total de tipo.
+    - ``scores[combo_atacante, tipo_golpe, combo_defensor]``: STAB x eficácia,
+      o fator que multiplica o poder do golpe.
+
+    Os valores (0, 0.25 ... 6) são exatos em float16, então o tensor é salvo assim.
+    """
+    combos = np.array(TYPE_COMBOS, dtype=np.intp)
+    first = type_matrix[:, combos[:, 0]]
+    second = np.where(combos[:, 0] == combos[:, 1], 1.0, type_matrix[:, combos[:, 1]])
+    effectiveness = (first * second).astype(np.float32)
+
+    move_types = np.arange(N_TYPES)
+    is_stab = (move_types[None, :] == combos[:, :1]) | (move_types[None, :] == combos[:, 1:])
+    is_stab[:, UNKNOWN_TYPE] = False
+    stab = np.where(is_stab, STAB, 1.0).astype(np.float32)
+
+    scores = stab[:, :, None] * effectiveness[None, :, :]
+    return effectiveness.astype(np.float16), scores.astype(np.float16)
+
+
+@dataclass
+class MoveRow:
+    """Golpes conhecidos de uma espécie, já convertidos em arrays para o ``argmax``."""
+
+    names: Tuple[str, ...]
+    combo: int               # combinação de tipos do atacante
+    slots: np.ndarray        # índice original do golpe na lista conhecida
+    types: np.ndarray        # tipo internado de cada golpe
+    power: np.ndarray
+    penalty: np.ndarray
+    accuracy: np.ndarray
+    category: np.ndarray     # classe de dano (damage_calculator.PHYSICAL/SPECIAL/STATUS)
+
+    @property
+    def attacker_types(self) -> Tuple[int, int]:
+        return TYPE_COMBOS[self.combo]
+
+
+def move_row(db, pokemon_name: str, moves: List[str]) -> MoveRow:
+    """Converte os golpes conhecidos de um Pokémon em arrays (tipo, poder, precisão, classe)."""
+    slots, types, power, penalty, accuracy, category = [], [], [], [], [], []
+    for i, move_name in enumerate(moves or []):
+        move_data = db.get_move_data(move_name.strip().lower()) if move_name else None
+        if not move_data:
+            continue
+        move_power = float(move_data.get("power", 0) or 0)
+        category_id = move_data.get("category_id")
+        slots.append(i)
+        types.append(db.type_index(move_data.get("type_id")) if move_data.get("type_id") else UNKNOWN_TYPE)
+        power.append(move_power)
+        penalty.append(STATUS_PENALTY if move_power == 0 and str(category_id) in STATUS_CATEGORY_IDS else 0.0)
+        accuracy.append(float(move_data.get("accuracy", 100) or 100))
+        category.append(damage_class(category_id, move_power))
+
+    return MoveRow(
+        names=tuple(moves or ()),
+        combo=combo_of(db.type_indices(db.get_pokemon_types(pokemon_name))),
+        slots=np.array(slots, dtype=np.int16),
+        types=np.array(types, dtype=np.intp),
+        power=np.array(power, dtype=np.float32),
+        penalty=np.array(penalty, dtype=np.float32),
+        accuracy=np.array(accuracy, dtype=np.float32),
+        category=np.array(category, dtype=np.int8),
+    )
+
+
+class MatchupTable:
+    """Tensor de matchups pré-computado offline + tabela de golpes da equipe.
+
+    A decisão em runtime vira indexação (``scores[atacante, tipos, defensor]``)
+    e um ``argmax`` sobre os golpes do Pokémon atual. A tabela é salva em
+    ``data/matchups.npz`` (``tools/build_matchup_table.py``) com um fingerprint
+    dos JSONs de ``data/`` e do ``known_moves.json``, e só é reconstruída quando
+    algum deles muda.
+    """
+
+    def __init__(self, db, effectiveness, scores, rows: Optional[Dict[int, MoveRow]] = None, fingerprint=None):
+        self.db = db
+        self.effectiveness = effectiveness
+        self.scores = scores
+        self.rows: Dict[int, MoveRow] = rows or {}
+        self.fingerprint = fingerprint or {}
+
+    # ---------- Construção ----------
+
+    @classmethod
+    def build(cls, db, known_moves: Dict[str, List[str]], fingerprint=None):
+        effectiveness, scores = build_tensors(db.type_matrix)
+        table = cls(db, effectiveness, scores, fingerprint=fingerprint)
+        for name, moves in (known_moves or {}).items():
+            table.set_moves(name, moves)
+        return table
+
+    @classmethod
+    def load_or_build(cls, db, known_moves: Dict[str, List[str]], known_moves_path, path):
+        """Carrega ``path`` se o fingerprint bater; senão reconstrói e salva."""
+        path = Path(path)
+        fingerprint = cls.fingerprint_for(db.data_dir, known_moves_path)
+        if path.exists():
+            try:
+                table = cls.load(path, db)
+                if table.fingerprint == fingerprint:
+                    return table
+                logger.info(f"Tabela de matchups {path} desatualizada; reconstruindo.")
+            except Exception as e:
+                logger.error(f"Erro ao carregar tabela de matchups {path}: {e}")
+        table = cls.build(db, known_moves, fingerprint)
+        table.save(path)
+        return table
+
+    @staticmethod
+    def fingerprint_for(data_dir, known_moves_path) -> dict:
+        """Fontes do ``source_fingerprint`` + golpes conhecidos.
+
+        ``known_moves_path``: snapshot ou sequência (snapshot, journal) do TeamManager.
+        """
+        fp = source_fingerprint(data_dir)
+        if isinstance(known_moves_path, (str, os.PathLike)):
+            known_moves_path = [known_moves_path]
+        for extra in map(Path, known_moves_path):
+            if extra.exists():
+                st = extra.stat()
+                fp[extra.name] = f"{st.st_mtime_ns}:{st.st_size}"
+        fp["format"] = str(FORMAT_VERSION)
+        return fp
+
+    def set_moves(self, pokemon_name: str, moves: List[str]) -> Optional[MoveRow]:
+        """(Re)calcula a linha de golpes de uma espécie. Retorna None se o nome não resolver."""
+        species_id = self.db.species_id(pokemon_name)
+        if species_id is None:
+            return None
+        row = move_row(self.db, pokemon_name, moves)
+        self.rows[species_id] = row
+        return row
+
+    # ---------- Consultas ----------
+
+    def row_for(self, pokemon_name: str, moves: List[str]) -> Optional[MoveRow]:
+        """Linha da espécie; recalcula em memória se os golpes conhecidos mudaram."""
+        species_id = self.db.species_id(pokemon_name)
+        if species_id is None:
+            return None
+        row = self.rows.get(species_id)
+        if row is None or row.names != tuple(moves or ()):
+            row = self.set_moves(pokemon_name, moves)
+        return row
+
+    def defender_combo(self, enemy_types) -> int:
+        return combo_of(self.db.type_indices(enemy_types))
+
+    def move_scores(self, row: MoveRow, enemy_combo: int) -> np.ndarray:
+        return row.power * self.scores[row.combo, row.types, enemy_combo].astype(np.float32) - row.penalty
+
+    def best_move(self, pokemon_name: str, moves: List[str], enemy_types) -> Optional[Tuple[int, float]]:
+        """``(slot, score)`` do melhor golpe, ou None se nenhum golpe tiver dados."""
+        row = self.row_for(pokemon_name, moves)
+        if row is None or row.slots.size == 0:
+            return None
+        scores = self.move_scores(row, self.defender_combo(enemy_types))
+        best = int(np.argmax(scores))
+        return int(row.slots[best]), float(scores[best])
+
+    def has_super_effective(self, row: MoveRow, enemy_combo: int) -> bool:
+        return bool(row.types.size and (self.effectiveness[row.types, enemy_combo] > 1.0).any())
+
+    # ---------- Persistência ----------
+
+    def save(self, path):
+        path = Path(path)
+        ids = sorted(self.rows)
+        width = max([len(self.rows[s].slots) for s in ids] + [1])
+
+        def padded(attr, dtype, fill):
+            out = np.full((len(ids), width), fill, dtype=dtype)
+            for r, sid in enumerate(ids):
+                values = getattr(self.rows[sid], attr)
+                out[r, :len(values)] = values
+            return out
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            with tmp.open("wb") as f:
+                np.savez_compressed(
+                    f,
+                    effectiveness=self.effectiveness,
+                    scores=self.scores,
+                    species_ids=np.array(ids, dtype=np.int32),
+                    combos=np.array([self.rows[s].combo for s in ids], dtype=np.int16),
+                    counts=np.array([len(self.rows[s].slots) for s in ids], dtype=np.int16),
+                    slots=padded("slots", np.int16, -1),
+                    types=padded("types", np.int16, UNKNOWN_TYPE),
+                    power=padded("power", np.float32, 0.0),
+                    penalty=padded("penalty", np.float32, 0.0),
+                    accuracy=padded("accuracy", np.float32, 0.0),
+                    category=padded("category", np.int8, 0),
+                    names=np.array([json.dumps(self.rows[s].names) for s in ids], dtype=str),
+                    fingerprint=np.array(json.dumps(self.fingerprint, sort_keys=True)),
+                )
+            os.replace(tmp, path)
+            logger.info(f"Tabela de matchups salva: {len(ids)} espécies -> {path}")
+        except Exception as e:
+            logger.error(f"Erro ao salvar tabela de matchups {path}: {e}")
+
+    @classmethod
+    def load(cls, path, db):
+        with np.load(path, allow_pickle=False) as data:
+            rows = {}
+            for r, sid in enumerate(data["species_ids"]):
+                n = int(data["counts"][r])
+                rows[int(sid)] = MoveRow(
+                    names=tuple(json.loads(str(data["names"][r]))),
+                    combo=int(data["combos"][r]),
+                    slots=data["slots"][r, :n].copy(),
+                    types=data["types"][r, :n].astype(np.intp),
+                    power=data["power"][r, :n].copy(),
+                    penalty=data["penalty"][r, :n].copy(),
+                    accuracy=data["accuracy"][r, :n].copy(),
+                    category=data["category"][r, :n].copy(),
+                )
+            return cls(
+                db,
+                data["effectiveness"],
+                data["scores"],
+                rows,
+                fingerprint=json.loads(str(data["fingerprint"])),
+            )
+
+    @classmethod
+    def from_config(cls, config, db, team_manager):
+        cfg = (config or {}).get('strategy', {}).get('matchup_table', {})
+        if not cfg.get('enabled', True):
+            return None
+        return cls.load_or_build(
+            db,
+            team_manager.known_moves,
+            (team_manager.moves_db_path, team_manager.journal_path),
+            cfg.get('path', 'data/matchups.npz'),
+        )
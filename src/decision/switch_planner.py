@@ -0,0 +1,216 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from .damage_calculator import pad_types
+from .matchup_table import move_row
+
+
+@dataclass
+class SwitchPlan:
+    """Resultado do planejador: ranking da equipe e (opcional) alvo de troca."""
+
+    ranked: List[str] = field(default_factory=list)   # melhor -> pior
+    scores: Dict[str, float] = field(default_factory=dict)
+    target: Optional[str] = None                      # None = ficar com o atual
+    current: Optional[str] = None
+    current_score: Optional[float] = None
+
+
+class SwitchPlanner:
+    """Planejador de trocas sobre uma matriz de score equipe x inimigos.
+
+    ``score = ofensa - peso * dano_recebido / HP``, onde ofensa é o maior dano
+    esperado do membro (``DamageCalculator``) e dano recebido vem do moveset
+    provável do inimigo no nível lido. Tudo é calculado numa passada vetorizada
+    para a equipe inteira.
+
+    Histerese: só troca se o melhor candidato (já pagando o golpe grátis que o
+    inimigo ganha na troca) superar o atual por ``margin``; mantém o último alvo
+    enquanto ele estiver dentro da margem do melhor; e respeita
+    ``min_turns_between`` turnos entre trocas.
+
+    ``plan`` não altera o planejador (pode rodar especulado, em outra thread);
+    o estado da histerese só avança em ``commit``, chamado uma vez por turno
+    jogado com o plano da troca feita.
+    """
+
+    def __init__(self, db, team_manager, damage, config=None, matchups=None):
+        self.db = db
+        self.tm = team_manager
+        self.damage = damage
+        self.matchups = matchups
+        cfg = (config or {}).get('strategy', {}).get('switch', {}) or {}
+        self.margin = float(cfg.get('margin', 0.2))
+        self.incoming_weight = float(cfg.get('incoming_weight', 1.0))
+        self.enemy_move_power = float(cfg.get('enemy_move_power', 70))
+        self.min_turns_between = int(cfg.get('min_turns_between', 2))
+        self.turn = 0
+        self._last_switch_turn = None
+        self._last_target = None
+
+    def key(self, name) -> object:
+        """Chave de identidade (id canônico quando o db suporta) para casar nomes lidos pelo OCR."""
+        key = (name or "").strip().lower()
+        if key and hasattr(self.db, "species_id"):
+            species_id = self.db.species_id(key)
+            if species_id is not None:
+                return species_id
+        return key
+
+    def member_key(self, name) -> str:
+        """Nome como chave da equipe do TeamManager (a dos dicts de HP/nível)."""
+        if hasattr(self.tm, "member_key"):
+            return self.tm.member_key(name)
+        return (name or "").strip().lower()
+
+    def score_matrix(self, team: Sequence[str], enemies: Sequence[str], hp: Optional[Dict[str, float]] = None,
+                     levels: Optional[Dict[str, int]] = None, enemy_levels: Optional[Sequence[int]] = None):
+        """Matriz ``(len(team), len(enemies))`` de scores; membros sem dados ficam em ``-inf``."""
+        hp = hp or {}
+        levels = levels or {}
+        scores = np.full((len(team), len(enemies)), -np.inf, dtype=np.float32)
+
+        rows = []
+        for name in team:
+            moves = self.tm.get_moves(name)
+            row = None
+            if moves:
+                row = self.matchups.row_for(name, moves) if self.matchups is not None else None
+                row = row or move_row(self.db, name, moves)
+            rows.append(row)
+        known = [i for i, row in enumerate(rows) if row is not None and len(row.slots)]
+        if not known:
+            return scores
+
+        known_rows = [rows[i] for i in known]
+        member_types = np.stack([pad_types(r.attacker_types) for r in known_rows])
+        member_levels = [levels.get(team[i]) for i in known]
+        hp_ratio = np.array([hp.get(team[i], 1.0) for i in known], dtype=np.float32)
+
+        for j, enemy in enumerate(enemies):
+            enemy_types = self.db.type_indices(self.db.get_pokemon_types(enemy))
+            enemy_level = enemy_levels[j] if enemy_levels else None
+            offense = self.damage.team_damage(
+                known_rows, member_types, enemy_types, member_levels, enemy_level
+            ).max(axis=1)
+            incoming = self._incoming(enemy, enemy_types, enemy_level, member_types, member_levels)
+            column = offense - self.incoming_weight * incoming / np.maximum(hp_ratio, 0.05)
+            column[hp_ratio <= 0] = -np.inf   # desmaiado
+            scores[known, j] = column
+        return scores
+
+    def plan(self, enemy_name: str, current_name: Optional[str] = None, hp: Optional[Dict[str, float]] = None,
+             enemy_level: Optional[int] = None, levels: Optional[Dict[str, int]] = None) -> SwitchPlan:
+        """Ranking da equipe contra ``enemy_name`` e alvo de troca (com histerese).
+
+        Puro: lê o estado da histerese mas não o altera (ver ``commit``).
+        """
+        turn = self.turn + 1   # turno sendo decidido
+        team = list(getattr(self.tm, "current_team", []) or [])
+        # Nome lido na batalha vira a chave da equipe: é com ela que HP/nível são buscados
+        current_name = self.member_key(current_name) if current_name else None
+        if current_name and self.key(current_name) not in {self.key(n) for n in team}:
+            team.append(current_name)
+        if not team or not enemy_name:
+            return SwitchPlan()
+
+        column = self.score_matrix(team, [enemy_name], hp, levels, [enemy_level])[:, 0]
+        order = np.argsort(-column, kind="stable")
+        plan = SwitchPlan(
+            ranked=[team[i] for i in order if np.isfinite(column[i])],
+            scores={team[i]: float(column[i]) for i in order if np.isfinite(column[i])},
+        )
+        if not plan.ranked:
+            return plan
+
+        plan.current = current_name
+        current_key = self.key(current_name) if current_name else None
+        current_idx = next((i for i, n in enumerate(team) if self.key(n) == current_key), None)
+        current = float(column[current_idx]) if current_idx is not None else None
+        plan.current_score = current if current is not None and np.isfinite(current) else None
+
+        # Quem entra leva um golpe grátis do inimigo
+        incoming = self._free_hit(team, enemy_name, enemy_level, levels)
+        candidates = {
+            team[i]: float(column[i] - self.incoming_weight * incoming[i])
+            for i in order
+            if np.isfinite(column[i]) and i != current_idx
+        }
+        if not candidates:
+            return plan
+
+        best = max(candidates, key=candidates.get)
+        # Mantém o último alvo se ainda estiver dentro da margem do melhor (evita ping-pong)
+        if self._last_target in candidates and candidates[self._last_target] >= candidates[best] - self._slack(candidates[best]):
+            best = self._last_target
+
+        if self._last_switch_turn is not None and turn - self._last_switch_turn < self.min_turns_between:
+            return plan
+        if plan.current_score is not None and candidates[best] <= plan.current_score + self._slack(plan.current_score):
+            return plan
+        # Sem saber quem está em campo, só troca por alguém com saldo positivo
+        if plan.current_score is None and candidates[best] <= 0:
+            return plan
+
+        plan.target = best
+        logger.info(f"Troca planejada: {best} (score={candidates[best]:.1f}, atual={plan.current_score})")
+        return plan
+
+    def commit(self, plan: Optional[SwitchPlan] = None):
+        """Fecha um turno jogado; com o ``plan`` de uma troca feita, registra o alvo para a histerese."""
+        self.turn += 1
+        if plan is not None and plan.target is not None:
+            self._last_target = plan.target
+            self._last_switch_turn = self.turn
+
+    def match_slot(self, plan: SwitchPlan, menu_names: Sequence[str]) -> Optional[int]:
+        """Índice da linha do menu de troca para o melhor membro do ranking presente no menu.
+
+        Casa pelos nomes lidos no menu (não pela ordem de ``current_team``),
+        então funciona mesmo se o OCR/jogo reordenar os slots.
+        """
+        if plan.target is None:
+            return None
+        rows = {}
+        for i, name in enumerate(menu_names):
+            if name:
+                rows.setdefault(self.key(name), i)
+        current_key = self.key(plan.current) if plan.current else None
+        for name in [plan.target] + [n for n in plan.ranked if n != plan.target]:
+            if self.key(name) == current_key:
+                continue
+            idx = rows.get(self.key(name))
+            if idx is not None:
+                return idx
+        return None
+
+    def _free_hit(self, team, enemy_name, enemy_level, levels):
+        levels = levels or {}
+        rows = []
+        for name in team:
+            types = self.db.type_indices(self.db.get_pokemon_types(name))
+            rows.append(pad_types(types))
+        enemy_types = self.db.type_indices(self.db.get_pokemon_types(enemy_name))
+        return self._incoming(enemy_name, enemy_types, enemy_level, np.stack(rows), [levels.get(n) for n in team])
+
+    def _incoming(self, enemy_name, enemy_types, enemy_level, member_types, member_levels):
+        """Dano esperado que o inimigo causa em cada membro.
+
+        Usa o moveset provável da espécie no nível lido (``LearnsetIndex``), com a
+        média entre os golpes (selvagens escolhem ao acaso); sem moveset com dano,
+        assume um golpe STAB de ``enemy_move_power``.
+        """
+        if hasattr(self.db, "probable_moves"):
+            moves = self.db.probable_moves(enemy_name, enemy_level or self.damage.default_level)
+            row = move_row(self.db, enemy_name, moves) if moves else None
+            if row is not None and row.power.any():
+                return self.damage.moveset_damage(row, member_types, enemy_level, member_levels).mean(axis=1)
+        return self.damage.incoming_damage(
+            enemy_types, member_types, self.enemy_move_power, enemy_level, member_levels
+        )
+
+    def _slack(self, score: float) -> float:
+        return self.margin * max(abs(score), 1.0)
@@ -0,0 +1,172 @@
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+ALIASES_FILENAME = "aliases.json"
+
+_GENDER = {"♀": " f", "♂": " m"}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def canonical_form(name) -> str:
+    """Forma canônica de um nome para busca de alias.
+
+    Remove diacríticos e símbolos (†, ‡, pontuação), troca ♀/♂ por f/m,
+    põe em minúsculas e unifica hífen/underscore/espaços num único espaço.
+    Ex.: ``"Charmander†"`` -> ``"charmander"``, ``"sand-attack"`` -> ``"sand attack"``.
+    """
+    if not name:
+        return ""
+    text = str(name)
+    for symbol, repl in _GENDER.items():
+        text = text.replace(symbol, repl)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    # Apóstrofo/ponto colam as partes (Farfetch'd -> farfetchd, Mr. Mime -> mr mime)
+    text = text.replace("'", "").replace("’", "").replace(".", " ")
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def _squashed(form: str) -> str:
+    """Sem espaços: pega leituras de OCR que grudam palavras ('SandAttack')."""
+    return form.replace(" ", "")
+
+
+class _Namespace:
+    """Tabela id -> chave/nome + mapa de aliases -> id para um tipo de entidade."""
+
+    def __init__(self):
+        self.keys: List[Optional[str]] = [None]   # id 0 reservado (desconhecido)
+        self.names: List[Optional[str]] = [None]
+        self.aliases: Dict[str, int] = {}
+
+    def add(self, entity_id: int, key: str, name: str):
+        while len(self.keys) <= entity_id:
+            self.keys.append(None)
+            self.names.append(None)
+        self.keys[entity_id] = key
+        self.names[entity_id] = name
+        for alias in (canonical_form(key), canonical_form(name)):
+            self._register(alias, entity_id)
+
+    def add_alias(self, alias: str, target: str) -> bool:
+        entity_id = self.resolve(target)
+        if entity_id is None:
+            return False
+        self._register(canonical_form(alias), entity_id, override=True)
+        return True
+
+    def _register(self, form: str, entity_id: int, override: bool = False):
+        if not form:
+            return
+        for variant in (form, _squashed(form)):
+            if override or variant not in self.aliases:
+                self.aliases[variant] = entity_id
+
+    def resolve(self, name) -> Optional[int]:
+        form = canonical_form(name)
+        if not form:
+            return None
+        entity_id = self.aliases.get(form)
+        if entity_id is None:
+            entity_id = self.aliases.get(_squashed(form))
+        return entity_id
+
+
+class IdentityIndex:
+    """Ids canônicos de espécies e golpes com mapa de aliases pré-computado.
+
+    Os ids são os mesmos do knowledge store (``compile_sources``/``build_store``):
+    posição 1..N na ordem das chaves normalizadas. Toda resolução de nome é um
+    ``canonical_form`` + um lookup de dict (O(1)), cobrindo caixa, hífens,
+    espaços, diacríticos, símbolos e erros conhecidos (``data/aliases.json``).
+    """
+
+    def __init__(self):
+        self._species = _Namespace()
+        self._moves = _Namespace()
+
+    # ---------- Construção ----------
+
+    @classmethod
+    def from_rows(cls, species_rows, move_rows, aliases=None):
+        """``species_rows``/``move_rows``: iteráveis de ``(id, key, name)``."""
+        index = cls()
+        for sid, key, name in species_rows:
+            index._species.add(int(sid), key, name)
+        for mid, key, name in move_rows:
+            index._moves.add(int(mid), key, name)
+        if aliases:
+            index.load_aliases(aliases)
+        return index
+
+    @classmethod
+    def from_tables(cls, tables, aliases=None):
+        species = ((sid, row[0], row[1]) for sid, row in enumerate(tables.species, start=1))
+        moves = ((mid, row[0], row[1]) for mid, row in enumerate(tables.moves, start=1))
+        return cls.from_rows(species, moves, aliases)
+
+    @classmethod
+    def from_store(cls, store, aliases=None):
+        return cls.from_rows(store.species_index(), store.move_index(), aliases)
+
+    @staticmethod
+    def load_aliases_file(data_dir) -> dict:
+        path = Path(data_dir) / ALIASES_FILENAME
+        if not path.exists():
+            return {}
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Erro ao carregar {path}: {e}")
+            return {}
+
+    def load_aliases(self, aliases: dict):
+        """``{"species": {alias: nome_canônico}, "moves": {...}}``."""
+        for kind, namespace in (("species", self._species), ("moves", self._moves)):
+            for alias, target in (aliases.get(kind) or {}).items():
+                if not namespace.add_alias(alias, target):
+                    logger.debug(f"Alias '{alias}' -> '{target}' ignorado: alvo desconhecido ({kind})")
+
+    # ---------- Consultas ----------
+
+    def species_id(self, name) -> Optional[int]:
+        return self._species.resolve(name)
+
+    def move_id(self, name) -> Optional[int]:
+        return self._moves.resolve(name)
+
+    def species_key(self, species_id: int) -> Optional[str]:
+        return self._species.keys[species_id] if 0 < species_id < len(self._species.keys) else None
+
+    def species_name(self, species_id: int) -> Optional[str]:
+        return self._species.names[species_id] if 0 < species_id < len(self._species.names) else None
+
+    def move_key(self, move_id: int) -> Optional[str]:
+        return self._moves.keys[move_id] if 0 < move_id < len(self._moves.keys) else None
+
+    def move_name(self, move_id: int) -> Optional[str]:
+        return self._moves.names[move_id] if 0 < move_id < len(self._moves.names) else None
+
+    def canonical_species(self, name) -> Optional[str]:
+        """Chave canônica (``normalize_key``) da espécie, ou None se não resolver."""
+        sid = self.species_id(name)
+        return self.species_key(sid) if sid else None
+
+    def canonical_move(self, name) -> Optional[str]:
+        """Nome de exibição canônico do golpe (ex.: ``'Sand Attack'``), ou None."""
+        mid = self.move_id(name)
+        return self.move_name(mid) if mid else None
+
+    @property
+    def n_species(self) -> int:
+        return len(self._species.keys) - 1
+
+    @property
+    def n_moves(self) -> int:
+        return len(self._moves.keys) - 1
@@ -0,0 +1,322 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+# Fontes compiladas no store (relativas ao diretório data/)
+SOURCES = (
+    "dex.json", "movimentos.json", "tipos.json", "pokeapi_pokemon.json", "pokeapi_moves.json", "type_efficacy.json",
+)
+STORE_FILENAME = "knowledge.sqlite"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE types (name TEXT PRIMARY KEY, data TEXT);
+CREATE TABLE species (id INTEGER PRIMARY KEY, key TEXT UNIQUE, name TEXT, types TEXT);
+CREATE TABLE moves (
+    id INTEGER PRIMARY KEY, key TEXT UNIQUE, name TEXT,
+    type TEXT, power INTEGER, accuracy INTEGER, category TEXT
+);
+CREATE TABLE learnset (species_id INTEGER, level INTEGER, move_id INTEGER);
+CREATE INDEX learnset_species ON learnset (species_id, level);
+"""
+
+
+def normalize_key(name) -> str:
+    """Chave de busca: minúsculas, hífen/underscore viram espaço, espaços colapsados."""
+    if not name:
+        return ""
+    key = str(name).strip().lower().replace("-", " ").replace("_", " ")
+    return re.sub(r"\s+", " ", key)
+
+
+def source_fingerprint(data_dir) -> Dict[str, str]:
+    """``{arquivo: 'mtime_ns:tamanho'}`` das fontes existentes (detecta store desatualizado)."""
+    data_dir = Path(data_dir)
+    fp = {}
+    for name in SOURCES:
+        path = data_dir / name
+        if path.exists():
+            st = path.stat()
+            fp[name] = f"{st.st_mtime_ns}:{st.st_size}"
+    return fp
+
+
+def _load_json(path: Path):
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@dataclass
+class KnowledgeTables:
+    """Tabelas mescladas das fontes JSON, com ids inteiros 1..N (ordem das chaves normalizadas).
+
+    - ``species``: ``[(key, name, types)]``
+    - ``moves``: ``[(key, name, type, power, accuracy, category)]``
+    - ``learnset``: ``[(species_id, level, move_id)]``
+    - ``types``: conteúdo de ``tipos.json``
+    - ``type_efficacy``: conteúdo de ``type_efficacy.json`` (type_ids da PokeAPI)
+    """
+
+    species: List[tuple] = field(default_factory=list)
+    moves: List[tuple] = field(default_factory=list)
+    learnset: List[tuple] = field(default_factory=list)
+    types: dict = field(default_factory=dict)
+    type_efficacy: dict = field(default_factory=dict)
+
+
+def compile_sources(data_dir="data") -> KnowledgeTables:
+    """Mescla dex.json, movimentos.json, tipos.json, type_efficacy.json e caches da PokeAPI em tabelas indexadas."""
+    from .pokemon_database import TYPE_NAMES
+
+    data_dir = Path(data_dir)
+    dex = _load_json(data_dir / "dex.json")
+    moves_legacy = _load_json(data_dir / "movimentos.json")
+    types_legacy = _load_json(data_dir / "tipos.json")
+    pokeapi_pokemon = _load_json(data_dir / "pokeapi_pokemon.json")
+    pokeapi_moves = _load_json(data_dir / "pokeapi_moves.json")
+    type_efficacy = _load_json(data_dir / "type_efficacy.json")
+
+    def type_name(ref):
+        ref = str(ref).strip()
+        if ref.isdigit():
+            num = int(ref)
+            return TYPE_NAMES[num - 1].title() if 1 <= num <= len(TYPE_NAMES) else None
+        return ref.title() if ref else None
+
+    # --- Espécies: dex.json (nomes/tipos por nome) + PokeAPI (type_ids) ---
+    species = {}
+    for name, data in pokeapi_pokemon.items():
+        types = [t for t in (type_name(x) for x in data.get("types", [])) if t]
+        species[normalize_key(name)] = [name.replace("-", " ").title(), types]
+    for name, data in dex.items():
+        key = normalize_key(name)
+        types = [type_name(t) for t in data.get("tipos", []) if type_name(t)]
+        prev = species.get(key)
+        species[key] = [name, types or (prev[1] if prev else [])]
+
+    # --- Golpes: movimentos.json (poder/precisão/categoria) + PokeAPI (tipo) + learnsets ---
+    moves = {}
+    for name, data in pokeapi_moves.items():
+        moves[normalize_key(name)] = [
+            name.replace("-", " ").title(), type_name(data.get("type_id") or ""),
+            int(data.get("power") or 0), int(data.get("accuracy") or 100), str(data.get("category_id") or ""),
+        ]
+    for name, data in moves_legacy.items():
+        key = normalize_key(name)
+        prev = moves.get(key)
+        moves[key] = [
+            name,
+            type_name(data.get("tipo") or "") or (prev[1] if prev else None),
+            int(data.get("poder") or 0) or (prev[2] if prev else 0),
+            int(data.get("precisao") or 0) or (prev[3] if prev else 100),
+            data.get("categoria") or (prev[4] if prev else ""),
+        ]
+    for data in dex.values():
+        for entries in data.get("movimentos_por_nivel", {}).values():
+            for move_name, power in entries:
+                key = normalize_key(move_name)
+                if key not in moves:
+                    moves[key] = [move_name, None, int(power or 0), 100, "" if power else "Status"]
+                elif power and not moves[key][2]:
+                    moves[key][2] = int(power)
+
+    tables = KnowledgeTables(types=types_legacy, type_efficacy=type_efficacy)
+    species_ids, move_ids = {}, {}
+    for sid, (key, (name, types)) in enumerate(sorted(species.items()), start=1):
+        species_ids[key] = sid
+        tables.species.append((key, name, types))
+    for mid, (key, row) in enumerate(sorted(moves.items()), start=1):
+        move_ids[key] = mid
+        tables.moves.append((key, *row))
+    for name, data in dex.items():
+        sid = species_ids[normalize_key(name)]
+        for level, entries in data.get("movimentos_por_nivel", {}).items():
+            for move_name, _ in entries:
+                tables.learnset.append((sid, int(level), move_ids[normalize_key(move_name)]))
+    return tables
+
+
+def build_store(data_dir="data", out_path=None) -> Path:
+    """Compila todas as fontes JSON num único SQLite indexado (escrita atômica)."""
+    data_dir = Path(data_dir)
+    out_path = Path(out_path) if out_path else data_dir / STORE_FILENAME
+    tables = compile_sources(data_dir)
+
+    # Temporário por processo: duas instâncias recompilando juntas não se atropelam
+    tmp_path = out_path.with_suffix(f"{out_path.suffix}.{os.getpid()}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("fingerprint", json.dumps(source_fingerprint(data_dir), sort_keys=True)),
+                ("type_efficacy", json.dumps(tables.type_efficacy)),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO types VALUES (?, ?)",
+            [(name, json.dumps(info, ensure_ascii=False)) for name, info in tables.types.items()],
+        )
+        conn.executemany(
+            "INSERT INTO species VALUES (?, ?, ?, ?)",
+            [(sid, key, name, json.dumps(types)) for sid, (key, name, types) in enumerate(tables.species, start=1)],
+        )
+        conn.executemany(
+            "INSERT INTO moves VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(mid, *row) for mid, row in enumerate(tables.moves, start=1)],
+        )
+        conn.executemany("INSERT INTO learnset VALUES (?, ?, ?)", tables.learnset)
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, out_path)
+    logger.info(
+        f"Knowledge store compilado: {len(tables.species)} espécies, {len(tables.moves)} golpes -> {out_path}"
+    )
+    return out_path
+
+
+class KnowledgeStore:
+    """Leitura preguiçosa (somente leitura) do SQLite compilado por ``build_store``.
+
+    A conexão só é aberta na primeira consulta e as páginas são lidas sob
+    demanda pelo SQLite (compartilhadas via page cache do SO entre instâncias),
+    sem materializar as árvores JSON em memória.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_if_fresh(cls, data_dir="data", path=None) -> Optional["KnowledgeStore"]:
+        """Retorna o store se existir e estiver em dia com as fontes JSON; senão None."""
+        data_dir = Path(data_dir)
+        path = Path(path) if path else data_dir / STORE_FILENAME
+        if not path.exists():
+            return None
+        store = cls(path)
+        try:
+            row = store._query_one("SELECT value FROM meta WHERE key = 'fingerprint'")
+            stored = json.loads(row[0]) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Knowledge store inválido em {path}: {e}")
+            store.close()
+            return None
+        if stored != source_fingerprint(data_dir):
+            logger.warning(f"Knowledge store {path} desatualizado em relação a {data_dir}.")
+            store.close()
+            return None
+        return store
+
+    @classmethod
+    def open_or_build(cls, data_dir="data", path=None) -> Optional["KnowledgeStore"]:
+        """Abre o store; se faltar ou estiver desatualizado, recompila antes (primeira partida).
+
+        Falha na compilação (ex.: ``data/`` somente leitura) devolve None: o chamador usa os JSONs.
+        """
+        store = cls.open_if_fresh(data_dir, path)
+        if store is not None or not source_fingerprint(data_dir):
+            return store
+        try:
+            built = build_store(data_dir, path)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            logger.error(f"Falha ao compilar o knowledge store: {e}. Usando JSON.")
+            return None
+        return cls.open_if_fresh(data_dir, built)
+
+    def _connection(self):
+        if self._conn is None:
+            uri = f"file:{self.path.resolve().as_posix()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return self._conn
+
+    def _query_one(self, sql, params=()):
+        with self._lock:
+            return self._connection().execute(sql, params).fetchone()
+
+    def _query_all(self, sql, params=()):
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- Consultas ----------
+
+    def pokemon_types(self, name) -> Optional[List[str]]:
+        row = self._query_one("SELECT types FROM species WHERE key = ?", (normalize_key(name),))
+        return json.loads(row[0]) if row else None
+
+    def move(self, name) -> Optional[dict]:
+        row = self._query_one(
+            "SELECT name, type, power, accuracy, category FROM moves WHERE key = ?",
+            (normalize_key(name),),
+        )
+        if not row:
+            return None
+        return {"name": row[0], "type_id": row[1], "power": row[2], "accuracy": row[3], "category_id": row[4]}
+
+    def species_index(self) -> List[tuple]:
+        """``[(id, key, name)]`` de todas as espécies (para montar o índice de identidade)."""
+        return self._query_all("SELECT id, key, name FROM species ORDER BY id")
+
+    def move_index(self) -> List[tuple]:
+        """``[(id, key, name)]`` de todos os golpes."""
+        return self._query_all("SELECT id, key, name FROM moves ORDER BY id")
+
+    def species_types_by_id(self, species_id: int) -> Optional[List[str]]:
+        row = self._query_one("SELECT types FROM species WHERE id = ?", (int(species_id),))
+        return json.loads(row[0]) if row else None
+
+    def move_by_id(self, move_id: int) -> Optional[dict]:
+        row = self._query_one(
+            "SELECT name, type, power, accuracy, category FROM moves WHERE id = ?", (int(move_id),)
+        )
+        if not row:
+            return None
+        return {"name": row[0], "type_id": row[1], "power": row[2], "accuracy": row[3], "category_id": row[4]}
+
+    def learnset_rows(self) -> List[tuple]:
+        """``[(species_id, level, move_id)]`` na ordem original do ``dex.json``."""
+        return self._query_all("SELECT species_id, level, move_id FROM learnset ORDER BY rowid")
+
+    def count(self, table: str) -> int:
+        if table not in ("species", "moves", "learnset"):
+            raise ValueError(f"Tabela desconhecida: {table}")
+        return self._query_one(f"SELECT COUNT(*) FROM {table}")[0]
+
+    def learnset(self, name) -> List[tuple]:
+        """``[(nível, nome_do_golpe, power), ...]`` em ordem de nível."""
+        return self._query_all(
+            "SELECT l.level, m.name, m.power FROM learnset l "
+            "JOIN species s ON s.id = l.species_id JOIN moves m ON m.id = l.move_id "
+            "WHERE s.key = ? ORDER BY l.level, l.rowid",
+            (normalize_key(name),),
+        )
+
+    def type_chart(self) -> dict:
+        """Conteúdo equivalente a ``tipos.json``."""
+        return {name: json.loads(data) for name, data in self._query_all("SELECT name, data FROM types")}
+
+    def type_efficacy(self) -> dict:
+        """Conteúdo equivalente a ``type_efficacy.json`` ({} se a fonte não existia)."""
+        row = self._query_one("SELECT value FROM meta WHERE key = 'type_efficacy'")
+        return json.loads(row[0]) if row else {}
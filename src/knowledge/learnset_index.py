@@ -0,0 +1,60 @@
+from typing import Iterable, List
+
+import numpy as np
+
+MAX_LEVEL = 100
+MOVESET_SIZE = 4
+
+
+class LearnsetIndex:
+    """Moveset provável de cada espécie em cada nível, pré-computado.
+
+    ``movesets[species_id, level]`` guarda os ids dos 4 últimos golpes aprendidos
+    até aquele nível (como um Pokémon selvagem do jogo; 0 = vazio). A tabela é
+    cumulativa por nível, então a consulta ``(espécie, nível)`` é um único
+    acesso ao array (O(1)). Ids são os mesmos do ``IdentityIndex``/knowledge store.
+    """
+
+    def __init__(self, movesets: np.ndarray):
+        self.movesets = movesets
+
+    @classmethod
+    def build(cls, learnset_rows: Iterable[tuple], n_species: int, n_moves: int):
+        """``learnset_rows``: ``(species_id, level, move_id)`` na ordem do ``dex.json``."""
+        dtype = np.uint16 if n_moves < np.iinfo(np.uint16).max else np.uint32
+        movesets = np.zeros((n_species + 1, MAX_LEVEL + 1, MOVESET_SIZE), dtype=dtype)
+
+        by_species = {}
+        for species_id, level, move_id in learnset_rows:
+            level = max(0, min(int(level), MAX_LEVEL))
+            by_species.setdefault(int(species_id), []).append((level, int(move_id)))
+
+        for species_id, entries in by_species.items():
+            entries.sort(key=lambda e: e[0])   # estável: mantém a ordem dentro do nível
+            known: List[int] = []
+            i = 0
+            for level in range(MAX_LEVEL + 1):
+                while i < len(entries) and entries[i][0] <= level:
+                    move_id = entries[i][1]
+                    if move_id not in known:
+                        known.append(move_id)
+                        if len(known) > MOVESET_SIZE:
+                            known.pop(0)
+                    i += 1
+                movesets[species_id, level, :len(known)] = known
+        return cls(movesets)
+
+    @classmethod
+    def from_tables(cls, tables):
+        return cls.build(tables.learnset, len(tables.species), len(tables.moves))
+
+    @classmethod
+    def from_store(cls, store):
+        return cls.build(store.learnset_rows(), store.count("species"), store.count("moves"))
+
+    def move_ids(self, species_id: int, level: int) -> np.ndarray:
+        """Ids (não vazios) dos golpes prováveis de ``species_id`` no ``level``."""
+        if not 0 < species_id < self.movesets.shape[0]:
+            return self.movesets[0, 0, :0]
+        row = self.movesets[species_id, max(0, min(int(level), MAX_LEVEL))]
+        return row[row > 0]
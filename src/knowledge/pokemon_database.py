@@ -1,7 +1,26 @@
 import json
+from functools import cached_property
 from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
 from loguru import logger
 
+from .identity_index import IdentityIndex
+from .knowledge_store import KnowledgeStore, compile_sources
+from .learnset_index import LearnsetIndex
+
+# Ordem dos tipos = type_id da PokeAPI - 1 (1=normal ... 18=fairy)
+TYPE_NAMES = [
+    "normal", "fighting", "flying", "poison", "ground", "rock",
+    "bug", "ghost", "steel", "fire", "water", "grass",
+    "electric", "psychic", "ice", "dragon", "dark", "fairy",
+]
+# Índice extra para tipos desconhecidos (ex.: 10001/10002 da PokeAPI, nomes ilegíveis):
+# linha/coluna neutra (multiplicador 1.0)
+UNKNOWN_TYPE = len(TYPE_NAMES)
+N_TYPES = len(TYPE_NAMES) + 1
+
 
 class PokemonDatabase:
     """Fornece dados de Pokémon, tipos e golpes para a BattleStrategy.
@@ -9,20 +28,123 @@ class PokemonDatabase:
     Carrega tanto os arquivos legados (dex.json, tipos.json, movimentos.json)
     como os caches da PokeAPI (pokeapi_pokemon.json, pokeapi_moves.json) e
     uma matriz de eficácia de tipos (type_efficacy.json).
+
+    A eficácia de tipos fica numa matriz densa ``float32`` de 19x19
+    (18 tipos + desconhecido), indexada por ids pequenos internados a partir
+    de nomes (``tipos.json``/``dex.json``) ou type_ids da PokeAPI.
+
+    Abre ``data/knowledge.sqlite`` de forma preguiçosa e não carrega nenhum JSON
+    no startup; na primeira partida (ou com alguma fonte alterada) o store é
+    compilado antes.
     """
 
-    def __init__(self, data_path: str = "data"):
+    def __init__(self, data_path: str = "data", store_path=None, use_store: bool = True, build_store: bool = True):
         self.data_dir = Path(data_path)
 
-        # Bases legadas
-        self.dex_legacy = self._load_json("dex.json")
-        self.types_legacy = self._load_json("tipos.json")
-        self.moves_legacy = self._load_json("movimentos.json")
+        # Store compilado (tools/build_knowledge_store.py): as consultas vão ao SQLite e os
+        # JSONs nunca são carregados. Ausente ou desatualizado, é recompilado aqui (``build_store``).
+        self.store = None
+        if use_store:
+            opener = KnowledgeStore.open_or_build if build_store else KnowledgeStore.open_if_fresh
+            self.store = opener(self.data_dir, store_path)
+        # Caches por id canônico (int), não por variação de nome
+        self._types_cache = {}
+        self._moves_cache = {}
+
+        # Tipos internados em ints + matriz densa [tipo_atacante, tipo_defensor]
+        self._type_ids = {}
+        self.type_matrix = self._build_type_matrix()
+
+    # Bases JSON carregadas sob demanda (só sem store ou para ferramentas offline)
+    @cached_property
+    def dex_legacy(self):
+        return self._load_json("dex.json")
+
+    @cached_property
+    def types_legacy(self):
+        if self.store is not None:
+            return self.store.type_chart()
+        return self._load_json("tipos.json")
+
+    @cached_property
+    def moves_legacy(self):
+        return self._load_json("movimentos.json")
+
+    @cached_property
+    def pokeapi_pokemon(self):
+        return self._load_json("pokeapi_pokemon.json")
+
+    @cached_property
+    def pokeapi_moves(self):
+        return self._load_json("pokeapi_moves.json")
+
+    @cached_property
+    def type_efficacy(self):
+        if self.store is not None:
+            return self.store.type_efficacy()
+        return self._load_json("type_efficacy.json")
 
-        # Bases derivadas da PokeAPI
-        self.pokeapi_pokemon = self._load_json("pokeapi_pokemon.json")
-        self.pokeapi_moves = self._load_json("pokeapi_moves.json")
-        self.type_efficacy = self._load_json("type_efficacy.json")
+    @cached_property
+    def tables(self):
+        """Tabelas mescladas em memória (mesmos ids do store), usadas quando não há store."""
+        return compile_sources(self.data_dir)
+
+    @cached_property
+    def identity(self) -> IdentityIndex:
+        """Índice de ids canônicos de espécies/golpes com aliases (OCR, hífens, erros conhecidos)."""
+        aliases = IdentityIndex.load_aliases_file(self.data_dir)
+        if self.store is not None:
+            return IdentityIndex.from_store(self.store, aliases)
+        return IdentityIndex.from_tables(self.tables, aliases)
+
+    @cached_property
+    def learnsets(self) -> LearnsetIndex:
+        """Moveset provável por (espécie, nível), montado a partir do learnset do dex."""
+        if self.store is not None:
+            return LearnsetIndex.from_store(self.store)
+        return LearnsetIndex.from_tables(self.tables)
+
+    # ---------- Identidade (ids canônicos) ----------
+
+    def species_id(self, name) -> Optional[int]:
+        return self.identity.species_id(name)
+
+    def move_id(self, name) -> Optional[int]:
+        return self.identity.move_id(name)
+
+    def probable_moves(self, pokemon_name: str, level: int) -> List[str]:
+        """Os (até) 4 golpes mais recentes que a espécie aprendeu até ``level``.
+
+        Ex.: ``probable_moves("pikachu", 20)`` -> ``["Thunder Wave", "Double Team", ...]``.
+        """
+        species_id = self.species_id(pokemon_name)
+        if species_id is None or not level:
+            return []
+        return [self.identity.move_name(int(mid)) for mid in self.learnsets.move_ids(species_id, level)]
+
+    def species_types(self, species_id: int) -> List[str]:
+        """Nomes dos tipos (Title Case) da espécie com id canônico ``species_id``."""
+        if species_id not in self._types_cache:
+            if self.store is not None:
+                types = self.store.species_types_by_id(species_id) or []
+            else:
+                types = self.tables.species[species_id - 1][2]
+            self._types_cache[species_id] = list(types)
+        return self._types_cache[species_id]
+
+    def move_record(self, move_id: int) -> dict:
+        """Dados do golpe com id canônico ``move_id`` (inclui ``name`` e ``accuracy``)."""
+        if move_id not in self._moves_cache:
+            if self.store is not None:
+                record = self.store.move_by_id(move_id) or {}
+            else:
+                _, name, type_name, power, accuracy, category = self.tables.moves[move_id - 1]
+                record = {
+                    "name": name, "type_id": type_name, "power": power,
+                    "accuracy": accuracy, "category_id": category,
+                }
+            self._moves_cache[move_id] = record
+        return self._moves_cache[move_id]
 
     def _load_json(self, filename: str):
         path = self.data_dir / filename
@@ -38,87 +160,124 @@ class PokemonDatabase:
     # ---------- Tipos / Fraquezas ----------
 
     def get_pokemon_types(self, pokemon_name: str):
-        """Retorna lista de type_ids do Pokémon.
+        """Retorna lista de nomes de tipos do Pokémon (ex.: ``["Fire", "Flying"]``).
 
-        Usa `pokeapi_pokemon.json` quando disponível, com fallback para `dex.json`.
+        O nome é resolvido para o id canônico (tolerando caixa, hífens, símbolos
+        e erros conhecidos de OCR) e os tipos vêm da tabela mesclada dex + PokeAPI.
         """
         if not pokemon_name:
             return []
 
-        key = pokemon_name.strip().lower()
-        data = self.pokeapi_pokemon.get(key)
-        if data and "types" in data:
-            return data["types"]
-
-        # Fallback para dex antigo, tentando variações de nome
-        legacy = (
-            self.dex_legacy.get(pokemon_name)
-            or self.dex_legacy.get(pokemon_name.capitalize())
-            or self.dex_legacy.get(pokemon_name.lower())
-        )
-        if legacy:
-            return legacy.get("tipos", [])
-
-        return []
+        species_id = self.species_id(pokemon_name)
+        if species_id is None:
+            return []
+        return self.species_types(species_id)
 
     def get_weaknesses(self, pokemon_name: str):
-        """Retorna lista de type_ids ou nomes de tipos aos quais o Pokémon é fraco.
-
-        Se `type_efficacy.json` estiver disponível, calcula a partir da matriz.
-        Caso contrário, usa `tipos.json` legado.
-        """
+        """Retorna lista de nomes de tipos (Title Case) aos quais o Pokémon é fraco (>= 2x)."""
         if not pokemon_name:
             return []
 
         enemy_types = self.get_pokemon_types(pokemon_name)
-        if enemy_types and self.type_efficacy:
-            weak_to = set()
-            for target_type in enemy_types:
-                rels = self.type_efficacy.get(str(target_type), {})
-                for atk_type, mult in rels.items():
-                    try:
-                        if float(mult) >= 2.0:
-                            weak_to.add(str(atk_type))
-                    except (TypeError, ValueError):
-                        continue
-            return list(weak_to)
-
-        # Fallback para dados legados, se existirem
-        legacy = (
-            self.dex_legacy.get(pokemon_name)
-            or self.dex_legacy.get(pokemon_name.capitalize())
-            or self.dex_legacy.get(pokemon_name.lower())
-        )
-        if legacy:
-            weaknesses = set()
-            for p_type in legacy.get("tipos", []):
-                type_info = self.types_legacy.get(p_type, {})
-                weaknesses.update(type_info.get("fraquezas", []))
-            return list(weaknesses)
-
-        return []
+        if not enemy_types:
+            return []
+
+        defenders = self.type_indices(enemy_types[:2])
+        mults = self.type_matrix[:UNKNOWN_TYPE, defenders].prod(axis=1)
+        return [TYPE_NAMES[i].title() for i in np.flatnonzero(mults >= 2.0)]
+
+    def type_index(self, type_ref) -> int:
+        """Interna nome de tipo ('Fire', 'fire') ou type_id da PokeAPI (10, '10') num int 0..18."""
+        try:
+            return self._type_ids[type_ref]
+        except (KeyError, TypeError):
+            pass
+
+        idx = UNKNOWN_TYPE
+        if isinstance(type_ref, (int, np.integer)) or (isinstance(type_ref, str) and type_ref.strip().isdigit()):
+            num = int(type_ref)
+            if 1 <= num <= len(TYPE_NAMES):
+                idx = num - 1
+        elif isinstance(type_ref, str):
+            name = type_ref.strip().lower()
+            if name in TYPE_NAMES:
+                idx = TYPE_NAMES.index(name)
+
+        try:
+            self._type_ids[type_ref] = idx
+        except TypeError:
+            pass
+        return idx
+
+    def type_indices(self, type_refs: Iterable) -> np.ndarray:
+        return np.fromiter((self.type_index(t) for t in type_refs), dtype=np.intp)
 
     def get_type_multiplier(self, move_type_id, enemy_types):
         """Retorna multiplicador total de tipo (float) para um golpe.
 
-        enemy_types é uma lista de type_ids (strings ou ints).
+        enemy_types é uma lista de type_ids ou nomes de tipo (strings ou ints).
         """
-        if not move_type_id or not enemy_types or not self.type_efficacy:
+        if not move_type_id or not enemy_types:
             return 1.0
 
-        rels = self.type_efficacy.get(str(move_type_id), {})
-        if not rels:
-            return 1.0
+        atk = self.type_index(move_type_id)
+        defenders = self.type_indices(enemy_types[:2])
+        return float(self.type_matrix[atk, defenders].prod())
+
+    def type_multipliers(self, move_types: Iterable, enemy_types: Iterable) -> np.ndarray:
+        """Versão vetorizada: multiplicadores de vários golpes contra um inimigo (1 ou 2 tipos).
+
+        ``move_types`` pode ser nomes/type_ids ou um array de índices já internados.
+        """
+        if isinstance(move_types, np.ndarray) and move_types.dtype.kind in "iu":
+            attackers = move_types.astype(np.intp, copy=False)
+        else:
+            attackers = self.type_indices(move_types)
+        defenders = self.type_indices(list(enemy_types)[:2])
+        if attackers.size == 0:
+            return np.ones(0, dtype=np.float32)
+        if defenders.size == 0:
+            return np.ones(attackers.size, dtype=np.float32)
+        return self.type_matrix[attackers[:, None], defenders[None, :]].prod(axis=1)
+
+    def _build_type_matrix(self) -> np.ndarray:
+        """Monta a matriz de eficácia a partir dos dados de tipo disponíveis.
 
-        mult = 1.0
-        for t in enemy_types:
-            try:
-                m = float(rels.get(str(t), 1.0) or 1.0)
-            except (TypeError, ValueError):
-                m = 1.0
-            mult *= m
+        - ``tipos.json`` (por nome, do ponto de vista do defensor: fraquezas=2x,
+          resistencias=0.5x, imunidades=0x).
+        - ``type_efficacy.json`` (type_ids da PokeAPI), quando presente, sobrescreve.
+        """
+        matrix = np.ones((N_TYPES, N_TYPES), dtype=np.float32)
 
-        return mult
+        for def_name, info in (self.types_legacy or {}).items():
+            d = self.type_index(def_name)
+            if d == UNKNOWN_TYPE or not isinstance(info, dict):
+                continue
+            for atk_name in info.get("fraquezas", []):
+                matrix[self.type_index(atk_name), d] = 2.0
+            for atk_name in info.get("resistencias", []):
+                matrix[self.type_index(atk_name), d] = 0.5
+            for atk_name in info.get("imunidades", []):
+                matrix[self.type_index(atk_name), d] = 0.0
+
+        for atk_ref, rels in (self.type_efficacy or {}).items():
+            a = self.type_index(atk_ref)
+            if a == UNKNOWN_TYPE or not isinstance(rels, dict):
+                continue
+            for def_ref, factor in rels.items():
+                d = self.type_index(def_ref)
+                try:
+                    factor = float(factor)
+                except (TypeError, ValueError):
+                    continue
+                if d != UNKNOWN_TYPE:
+                    # damage_factor da PokeAPI vem em porcentagem (200, 50, 0)
+                    matrix[a, d] = factor / 100.0 if factor > 4 else factor
+
+        # Linha/coluna de tipo desconhecido sempre neutra
+        matrix[UNKNOWN_TYPE, :] = 1.0
+        matrix[:, UNKNOWN_TYPE] = 1.0
+        return matrix
 
     # ---------- Golpes ----------
 
@@ -127,36 +286,26 @@ class PokemonDatabase:
 
         Formato esperado:
         {
-            "type_id": <int ou str>,
+            "type_id": <nome do tipo>,
             "power": <int>,
-            "category_id": <int ou str>,
+            "accuracy": <int>,
+            "category_id": <"Physical"/"Special"/"Status" ou meta_category da PokeAPI>,
         }
 
-        Tenta primeiro `pokeapi_moves.json` (chave em lower), depois `movimentos.json`
-        legado (nome exato ou Title Case). Se nada encontrado, retorna dict vazio.
+        O nome é resolvido para o id canônico do golpe; se não resolver, retorna dict vazio.
         """
         if not move_name:
             return {}
 
-        key = move_name.strip().lower()
-
-        # PokeAPI moves
-        data = self.pokeapi_moves.get(key)
-        if data:
-            return {
-                "type_id": data.get("type_id"),
-                "power": data.get("power", 0),
-                "category_id": data.get("category_id"),
-            }
-
-        # Fallback: base legada de movimentos
-        legacy = self.moves_legacy.get(move_name) or self.moves_legacy.get(move_name.title())
-        if legacy:
-            return {
-                "type_id": legacy.get("type_id") or legacy.get("tipo_id") or legacy.get("tipo"),
-                "power": legacy.get("power", 0) or legacy.get("poder", 0),
-                "category_id": legacy.get("category_id") or legacy.get("categoria_id") or legacy.get("categoria"),
-            }
-
-        logger.debug(f"Dados de golpe não encontrados para '{move_name}'")
-        return {}
+        move_id = self.move_id(move_name)
+        if move_id is None:
+            logger.debug(f"Dados de golpe não encontrados para '{move_name}'")
+            return {}
+
+        record = self.move_record(move_id)
+        return {
+            "type_id": record.get("type_id"),
+            "power": record.get("power", 0),
+            "accuracy": record.get("accuracy", 100),
+            "category_id": record.get("category_id"),
+        }
@@ -1,44 +1,104 @@
 import json
+import os
+import queue
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from loguru import logger
+
+_STOP = object()
+
 
 class TeamManager:
-    """Gerencia equipe atual (volátil) e golpes conhecidos (persistente)."""
+    """Gerencia equipe atual (volátil) e golpes conhecidos (persistente).
+
+    O estado em memória é a fonte da verdade. Mudanças de golpes vão para uma
+    fila e uma thread de fundo as anexa a um journal (``known_moves.journal``,
+    uma linha JSON por mudança); a cada ``compact_every`` entradas (e no
+    ``close``) o journal é compactado num snapshot ``known_moves.json`` escrito
+    de forma atômica (arquivo temporário + ``os.replace``). Nenhuma escrita em
+    disco acontece no turno de batalha.
+    """
 
-    def __init__(self):
+    def __init__(self, identity=None, config=None):
+        # Índice de ids canônicos (IdentityIndex); sem ele as chaves são só lower/strip
+        self.identity = identity
+        cfg = (config or {}).get('known_moves', {}) or {}
         # Banco de golpes conhecidos (persistente)
-        self.moves_db_path = Path("data/known_moves.json")
+        self.moves_db_path = Path(cfg.get('path', "data/known_moves.json"))
+        self.compact_every = int(cfg.get('compact_every', 50))
         self.current_team: List[str] = []  # Lista volátil, atualizada em tempo real
+        # HP (fração 0..1) e nível por Pokémon da equipe, lidos do HUD na exploração
+        self.team_hp: Dict[str, float] = {}
+        self.team_levels: Dict[str, int] = {}
         self.known_moves: Dict[str, List[str]] = {}  # Dicionário persistente {pokemon_name: [moves]}
+
+        # Protege ``known_moves`` e o contador de linhas do journal (flusher x thread do bot)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._flusher: Optional[threading.Thread] = None
+        self._journal_entries = 0
         self._load_moves()
 
+    @property
+    def journal_path(self) -> Path:
+        return self.moves_db_path.with_suffix(".journal")
+
     # --------- API nova ---------
     def update_team_from_hud(self, ocr_results_list: List[str]):
         """Atualiza a equipe atual a partir dos nomes lidos no HUD (exploração)."""
         # Limita a 6 slots e normaliza
-        self.current_team = [name.lower().strip() for name in ocr_results_list[:6] if name]
+        self.current_team = [self._species_key(name) for name in ocr_results_list[:6] if name]
+
+    def update_team_status(self, hp: Dict[str, float], levels: Dict[str, int]):
+        """Atualiza HP/nível dos membros (chaves normalizadas como em ``current_team``)."""
+        self.team_hp = {self._species_key(name): ratio for name, ratio in hp.items() if name}
+        self.team_levels = {self._species_key(name): int(level) for name, level in levels.items() if name}
+
+    def set_member_hp(self, pokemon_name: str, ratio: Optional[float]):
+        """HP lido na batalha para um membro (mesma chave de ``team_hp``)."""
+        if pokemon_name and ratio is not None:
+            self.team_hp[self._species_key(pokemon_name)] = float(ratio)
+
+    def hp_with(self, pokemon_name: str, ratio: Optional[float]) -> Dict[str, float]:
+        """Cópia de ``team_hp`` com o HP de ``pokemon_name`` trocado (sem alterar a equipe)."""
+        hp = dict(self.team_hp)
+        if pokemon_name and ratio is not None:
+            hp[self._species_key(pokemon_name)] = float(ratio)
+        return hp
 
     def update_pokemon_moves(self, pokemon_name: str, moves_list: List[str]):
         """Atualiza golpes conhecidos de um pokémon (chamado na batalha)."""
         if not pokemon_name:
             return
-        name = pokemon_name.lower().strip()
+        name = self._species_key(pokemon_name)
         if not name:
             return
 
         # Remove entradas vazias ou muito curtas dos golpes
-        cleaned_moves = [m.strip() for m in moves_list if m and m.strip()]
+        cleaned_moves = [self._move_name(m) for m in moves_list if m and m.strip()]
 
         # Atualiza apenas se algo mudou para evitar escrita desnecessária em disco
         if name not in self.known_moves or self.known_moves[name] != cleaned_moves:
-            self.known_moves[name] = cleaned_moves
-            self._save_moves()
+            with self._lock:
+                self.known_moves[name] = cleaned_moves
+            self._enqueue(name, cleaned_moves)
+
+    def member_key(self, pokemon_name: str) -> str:
+        """Chave de um nome lido em ``current_team``/``team_hp``/``team_levels``."""
+        return self._species_key(pokemon_name or "")
+
+    def get_level(self, pokemon_name: str) -> Optional[int]:
+        """Nível do membro lido no HUD de equipe (``team_levels``); None se ainda não lido."""
+        if not pokemon_name:
+            return None
+        return self.team_levels.get(self._species_key(pokemon_name))
 
     def get_moves_for(self, pokemon_name: str) -> List[str]:
         if not pokemon_name:
             return []
-        return self.known_moves.get(pokemon_name.lower().strip(), [])
+        return self.known_moves.get(self._species_key(pokemon_name), [])
 
     # --------- Compatibilidade com código existente ---------
     def save_moves(self, pokemon_name: str, moves: List[str]):
@@ -49,13 +109,121 @@ class TeamManager:
         """Wrapper para compatibilidade com BattleStrategy."""
         return self.get_moves_for(pokemon_name)
 
-    # --------- Persistência interna ---------
+    # --------- Identidade ---------
+    def _species_key(self, pokemon_name: str) -> str:
+        """Chave canônica da espécie (ex.: 'Ivyssaur' -> 'ivysaur'); sem índice, lower/strip.
+
+        É a chave normalizada do id canônico, não o id: ``known_moves`` é persistido
+        e os ids (1..N na ordem das chaves) mudam quando as fontes JSON mudam.
+        """
+        key = pokemon_name.lower().strip()
+        if self.identity is not None:
+            return self.identity.canonical_species(pokemon_name) or key
+        return key
+
+    def _move_name(self, move_name: str) -> str:
+        move_name = move_name.strip()
+        if self.identity is not None:
+            return self.identity.canonical_move(move_name) or move_name
+        return move_name
+
+    # --------- Persistência ---------
+    def flush(self):
+        """Bloqueia até a fila de mudanças estar gravada no journal."""
+        if self._flusher is not None:
+            self._queue.join()
+
+    def close(self):
+        """Grava pendências, compacta o journal no snapshot e encerra a thread de fundo."""
+        if self._flusher is not None:
+            self._queue.put(_STOP)
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            pending = self._journal_entries
+        if pending:
+            self._save_moves()
+
+    def _enqueue(self, name: str, moves: List[str]):
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="known-moves-flusher", daemon=True)
+            self._flusher.start()
+        self._queue.put((name, moves))
+
+    def _flush_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Junta o que mais estiver na fila: jitter de OCR vira uma linha por Pokémon
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            latest = {}
+            for item in batch:
+                if item is not _STOP:
+                    latest[item[0]] = item[1]
+            try:
+                if latest:
+                    self._append_journal(latest)
+                with self._lock:
+                    due = self._journal_entries >= self.compact_every
+                if due:
+                    self._save_moves()
+            except Exception as e:
+                logger.error(f"Erro ao gravar golpes conhecidos: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _append_journal(self, changes: Dict[str, List[str]]):
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open('a', encoding='utf-8') as f:
+            for name, moves in changes.items():
+                f.write(json.dumps({"name": name, "moves": moves}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            self._journal_entries += len(changes)
+
     def _load_moves(self):
         if self.moves_db_path.exists():
-            with self.moves_db_path.open('r', encoding='utf-8') as f:
-                self.known_moves = json.load(f)
+            try:
+                with self.moves_db_path.open('r', encoding='utf-8') as f:
+                    self.known_moves = json.load(f)
+            except ValueError as e:
+                logger.error(f"Snapshot de golpes corrompido em {self.moves_db_path}: {e}")
+
+        # Reaplica o journal por cima do snapshot (última escrita vence)
+        if self.journal_path.exists():
+            with self.journal_path.open('r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Linha truncada por queda no meio da escrita: ignora
+                        continue
+                    with self._lock:
+                        self.known_moves[entry["name"]] = entry["moves"]
+                        self._journal_entries += 1
 
     def _save_moves(self):
+        """Compacta: grava o snapshot atomicamente e zera o journal."""
+        with self._lock:
+            snapshot = dict(self.known_moves)
         self.moves_db_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.moves_db_path.open('w', encoding='utf-8') as f:
-            json.dump(self.known_moves, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        tmp = self.moves_db_path.with_suffix(self.moves_db_path.suffix + ".tmp")
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.moves_db_path)
+        # Se cair entre o replace e o truncate, reaplicar o journal é idempotente
+        if self.journal_path.exists():
+            self.journal_path.open('w').close()
+        with self._lock:
+            self._journal_entries = 0
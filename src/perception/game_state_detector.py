@@ -1,6 +1,8 @@
+import os
+import re
+
 import cv2
 import numpy as np
-import winsound
 from enum import Enum
 from loguru import logger
 
@@ -10,17 +12,35 @@ class GameState(Enum):
     SHINY_FOUND = "shiny_found"
     UNKNOWN = "unknown"
 
-from ..utils.geometry import crop_roi_safe
+from ..utils.geometry import crop_roi_safe, normalize_roi
+from .sprite_index import SpriteIndex
+from .team_hud_tracker import hp_bar_ratio
+
+# Texto do HUD de batalha que fica sempre na tela (não serve para detectar menus por cor)
+HUD_TEXT_ROIS = ('player_name', 'player_hp_text', 'enemy_name', 'enemy_level')
 
 class GameStateDetector:
-    def __init__(self, screen_capture, ocr_engine, config):
+    def __init__(self, screen_capture, ocr_engine, config, templates=None):
         self.cap = screen_capture
         self.ocr = ocr_engine
         self.rois = config.get('rois', {})
         self.cfg_detection = config.get('detection', {})
-        self.templates = self._load_templates(config)
+        self._hud_overlap_warned = set()
+        # ``templates``: banco já carregado (somente leitura), compartilhado entre instâncias
+        self.templates = templates if templates is not None else self.load_templates(config)
+
+        # Identificação do inimigo pelo sprite (fast path sem OCR), opcional
+        self.sprite_index = SpriteIndex.from_config(config)
+        # Callable(nome) -> bool que confirma um nome lido por OCR antes de indexá-lo
+        # (ex.: nome existe no PokemonDatabase). Sem validador, aceita nomes com 3+ letras.
+        self.name_validator = None
+
+        # Classificador aprendido de estado (opcional); import tardio evita ciclo com GameState
+        from .state_classifier import FrameStateClassifier
+        self.state_classifier = FrameStateClassifier.from_config(config)
 
-    def _load_templates(self, config):
+    @staticmethod
+    def load_templates(config):
         # Carrega imagem de shiny, talk e botões de batalha
         assets_dir = config.get('assets', {}).get('templates_dir', 'assets/templates/')
         shiny_path = assets_dir + config.get('assets', {}).get('shiny_image', 'shiny.png')
@@ -30,6 +50,7 @@ class GameStateDetector:
         bag_path = assets_dir + config.get('assets', {}).get('bag_image', 'bag.png')
         pokemon_path = assets_dir + config.get('assets', {}).get('pokemon_image', 'pokemon.png')
         run_path = assets_dir + config.get('assets', {}).get('run_image', 'run.png')
+        switch_menu_path = assets_dir + config.get('assets', {}).get('switch_menu_image', 'switch_menu.png')
         return {
             'shiny': cv2.imread(shiny_path),
             'talk': cv2.imread(talk_path),
@@ -38,6 +59,8 @@ class GameStateDetector:
             'bag': cv2.imread(bag_path),
             'pokemon': cv2.imread(pokemon_path),
             'run': cv2.imread(run_path),
+            # Opcional: recorte do popup de troca; sem ele a troca é detectada por área calibrada
+            'switch_menu': cv2.imread(switch_menu_path) if os.path.exists(switch_menu_path) else None,
         }
 
     def detect_state(self, image):
@@ -45,8 +68,27 @@ class GameStateDetector:
         if self._detect_shiny(image):
             return GameState.SHINY_FOUND
 
-        # 2. Verifica Botões de Batalha (qualquer um dos 4) via template matching
-        # em uma única região ampla de combate (battle_area)
+        # 2. Classificador aprendido: uma multiplicação matriz-vetor por frame.
+        # Só decide quando está confiante; caso contrário cai no template matching.
+        if self.state_classifier is not None:
+            state, confidence = self.state_classifier.predict(image)
+            if state is not None and state != GameState.SHINY_FOUND:
+                logger.debug(f"Estado pelo classificador: {state.name} (confiança={confidence:.3f})")
+                return state
+
+        # 3. Verifica Botões de Batalha (qualquer um dos 4) via template matching
+        if self.detect_battle_buttons(image):
+            return GameState.IN_BATTLE
+
+        return GameState.EXPLORING
+
+    # ---------- Detectores individuais (usados também pela máquina de estados) ----------
+
+    def detect_battle_buttons(self, image):
+        """True se qualquer botão de batalha (FIGHT/ITEMS/POKEMON/RUN) está visível.
+
+        Busca numa única região ampla de combate (``detection.battle_area``).
+        """
         battle_area = self.cfg_detection.get('battle_area')
         if battle_area and isinstance(battle_area, (list, tuple)) and len(battle_area) == 4:
             x1, y1, x2, y2 = battle_area
@@ -79,9 +121,115 @@ class GameStateDetector:
                 logger.debug(
                     f"Botão de batalha '{name}' detectado com score={max_val:.3f} (threshold={battle_thresh})"
                 )
-                return GameState.IN_BATTLE
+                return True
 
-        return GameState.EXPLORING
+        return False
+
+    def match_template(self, tpl_key, image, area=None):
+        """Template matching genérico. Retorna ``(score, (x, y))`` em coordenadas da imagem inteira.
+
+        ``area`` ([x1, y1, x2, y2] ou [x, y, w, h]) restringe a busca. Sem template, ``(0.0, None)``.
+        """
+        template = self.templates.get(tpl_key)
+        if template is None:
+            return 0.0, None
+
+        offset = (0, 0)
+        search_img = image
+        if area:
+            coords = normalize_roi(area)
+            search_img = crop_roi_safe(image, area)
+            if coords and search_img is not image:
+                offset = (max(0, coords[0]), max(0, coords[1]))
+
+        try:
+            res = cv2.matchTemplate(search_img, template, cv2.TM_CCOEFF_NORMED)
+        except cv2.error as e:
+            logger.error(f"Erro em matchTemplate para {tpl_key}: {e}")
+            return 0.0, None
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        return float(max_val), (max_loc[0] + offset[0], max_loc[1] + offset[1])
+
+    def detect_talk(self, image):
+        """True se o ícone de diálogo (talk.png) está na área de busca configurada."""
+        score, _ = self.match_template('talk', image, self.cfg_detection.get('talk_search_area'))
+        return score > float(self.cfg_detection.get('talk_threshold', 0.95))
+
+    def detect_goto(self, image):
+        """True se o botão de missão (goto.png) está visível."""
+        score, _ = self.match_template('goto', image)
+        return score > float(self.cfg_detection.get('goto_threshold', 0.8))
+
+    def detect_moves_menu(self, image):
+        """True se os botões de golpe estão renderizados (texto branco nos slots de golpe).
+
+        Os slots ficam sobre os botões FIGHT/BAG/POKÉMON/RUN, que também têm texto
+        branco: com o botão FIGHT visível na posição dele (``rois.btn_fight``) a tela
+        é o menu de batalha, não o de golpes.
+        """
+        moves_rois = self.rois.get('moves', {}) or {}
+        if not moves_rois:
+            return False
+        if self._button_visible(image, 'fight', 'btn_fight'):
+            return False
+        min_ratio = float(self.cfg_detection.get('moves_menu_white_ratio', 0.04))
+        ratios = [self._white_ratio(image, roi) for roi in moves_rois.values()]
+        # Basta a maioria dos slots ter texto (slots vazios existem)
+        return sum(r >= min_ratio for r in ratios) >= max(1, len(ratios) // 2)
+
+    def detect_switch_menu(self, image):
+        """True se o popup de troca de Pokémon está aberto.
+
+        Com o template ``assets.switch_menu_image``, por template matching (em
+        ``detection.switch_menu_area``, se houver). Sem ele, pela fração de branco em
+        ``detection.switch_menu_area``, que precisa ser calibrada fora do HUD sempre
+        visível (nome/HP do meu Pokémon); sem área válida o detector fica desligado.
+        """
+        area = self.cfg_detection.get('switch_menu_area')
+        if self.templates.get('switch_menu') is not None:
+            score, _ = self.match_template('switch_menu', image, area)
+            return score >= float(self.cfg_detection.get('switch_menu_threshold', 0.8))
+        if not area or self._overlaps_hud(area):
+            return False
+        min_ratio = float(self.cfg_detection.get('switch_menu_white_ratio', 0.08))
+        return self._white_ratio(image, area) >= min_ratio
+
+    def _button_visible(self, image, tpl_key, roi_key, pad=12):
+        """Template do botão na posição dele (ROI com folga de ``pad`` px)."""
+        coords = normalize_roi(self.rois.get(roi_key))
+        if not coords or self.templates.get(tpl_key) is None:
+            return False
+        x1, y1, x2, y2 = coords
+        area = [max(0, x1 - pad), max(0, y1 - pad), x2 + pad, y2 + pad]
+        score, _ = self.match_template(tpl_key, image, area)
+        return score >= float(self.cfg_detection.get('battle_button_threshold', 0.75))
+
+    def _overlaps_hud(self, area) -> bool:
+        """True (com aviso, uma vez) se ``area`` cobre texto do HUD que está sempre na tela."""
+        box = normalize_roi(area)
+        for key in HUD_TEXT_ROIS:
+            other = normalize_roi(self.rois.get(key))
+            if box and other and box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                if key not in self._hud_overlap_warned:
+                    self._hud_overlap_warned.add(key)
+                    logger.warning(
+                        f"detection.switch_menu_area {list(area)} cobre rois.{key}: detecção do menu de "
+                        f"troca por cor desligada (calibre outra área ou use assets.switch_menu_image)."
+                    )
+                return True
+        return False
+
+    @staticmethod
+    def _white_ratio(image, roi):
+        """Fração de pixels brancos/brilhantes (baixa saturação, alto valor) na ROI."""
+        if not roi:
+            return 0.0
+        crop = crop_roi_safe(image, roi)
+        if crop is None or crop.size == 0 or crop is image:
+            return 0.0
+        hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, np.array([0, 0, 200]), np.array([180, 60, 255]))
+        return float(np.count_nonzero(mask)) / mask.size
 
     def _detect_shiny(self, image):
         template = self.templates.get('shiny')
@@ -102,26 +250,93 @@ class GameStateDetector:
 
     def get_battle_info(self, image):
         """Extrai nome do inimigo, nome do player e (futuro) HP."""
-        # Nome do inimigo
-        enemy_name_img = crop_roi_safe(image, self.rois.get('enemy_name'))
-        enemy_name_raw = self.ocr.extract_text_optimized(
-            enemy_name_img,
-            whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz- ",
-            invert_for_white_text=True,
-        )
-        enemy_name = enemy_name_raw.replace("Lv", "").strip()
+        return {
+            "enemy_name": self.read_enemy_name(image),
+            "player_name": self.read_player_name(image),
+            # Adicionar leitura de HP e Level aqui usando as ROIs
+        }
+
+    def read_enemy_name(self, image):
+        """OCR do nome do inimigo (ROI ``rois.enemy_name``)."""
+        return self._read_name_roi(image, 'enemy_name')
+
+    def identify_enemy(self, image):
+        """Identifica o inimigo pelo sprite; cai para OCR do nome apenas em caso de miss.
+
+        Cada nome confirmado pelo OCR é adicionado ao índice de sprites, então após
+        alguns encontros a maioria das identificações não chama o Tesseract.
+        """
+        if self.sprite_index is None:
+            return self.read_enemy_name(image)
 
-        # Nome do Pokémon do player (HUD)
-        player_name_img = crop_roi_safe(image, self.rois.get('player_name'))
-        player_name_raw = self.ocr.extract_text_optimized(
-            player_name_img,
+        sprite_img = crop_roi_safe(image, self.rois.get('enemy_sprite'))
+        name, dist = self.sprite_index.lookup(sprite_img)
+        if name:
+            logger.debug(f"Inimigo identificado pelo sprite: '{name}' (distância={dist})")
+            return name
+
+        name = self.read_enemy_name(image)
+        if self._is_confirmed_name(name):
+            if self.sprite_index.add(sprite_img, name):
+                logger.info(f"Sprite de '{name}' adicionado ao índice ({len(self.sprite_index)} entradas)")
+        return name
+
+    def _is_confirmed_name(self, name):
+        if not name:
+            return False
+        if self.name_validator is not None:
+            try:
+                return bool(self.name_validator(name))
+            except Exception as e:
+                logger.error(f"Erro ao validar nome '{name}': {e}")
+                return False
+        return len(name.replace(" ", "")) >= 3
+
+    def read_enemy_level(self, image):
+        """OCR do nível do inimigo (ROI ``rois.enemy_level``, ex.: ``'Lv.23'``). None se ilegível."""
+        roi = self.rois.get('enemy_level')
+        if not roi:
+            return None
+        level_img = crop_roi_safe(image, roi)
+        if level_img is None or level_img.size == 0:
+            return None
+        raw = self.ocr.extract_text_optimized(level_img, whitelist="Lv.0123456789", invert_for_white_text=True)
+        digits = "".join(ch for ch in raw if ch.isdigit())
+        if not digits:
+            return None
+        level = int(digits[-3:])
+        return level if 1 <= level <= 100 else None
+
+    def read_enemy_hp(self, image):
+        """Fração 0..1 da barra de HP do inimigo (ROI ``rois.enemy_hp_bar``, só cor). None sem ROI."""
+        roi = self.rois.get('enemy_hp_bar')
+        if not roi:
+            return None
+        return hp_bar_ratio(crop_roi_safe(image, roi))
+
+    def read_player_hp(self, image):
+        """HP do meu Pokémon como fração, pelo texto ``atual/máximo`` (ROI ``rois.player_hp_text``)."""
+        roi = self.rois.get('player_hp_text')
+        if not roi:
+            return None
+        hp_img = crop_roi_safe(image, roi)
+        if hp_img is None or hp_img.size == 0:
+            return None
+        raw = self.ocr.extract_text_optimized(hp_img, whitelist="0123456789/", invert_for_white_text=True)
+        match = re.search(r"(\d+)\s*/\s*(\d+)", raw or "")
+        if not match or int(match.group(2)) == 0:
+            return None
+        return min(1.0, int(match.group(1)) / int(match.group(2)))
+
+    def read_player_name(self, image):
+        """OCR do nome do Pokémon do player no HUD (ROI ``rois.player_name``)."""
+        return self._read_name_roi(image, 'player_name')
+
+    def _read_name_roi(self, image, roi_key):
+        name_img = crop_roi_safe(image, self.rois.get(roi_key))
+        name_raw = self.ocr.extract_text_optimized(
+            name_img,
             whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz- ",
             invert_for_white_text=True,
         )
-        player_name = player_name_raw.replace("Lv", "").strip()
-
-        return {
-            "enemy_name": enemy_name,
-            "player_name": player_name,
-            # Adicionar leitura de HP e Level aqui usando as ROIs
-        }
+        return name_raw.replace("Lv", "").strip()
@@ -0,0 +1,129 @@
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+from loguru import logger
+
+N_SLOTS = 4
+# Tamanho (largura, altura) da assinatura de cada slot de golpe
+SIGNATURE_SIZE = (32, 8)
+
+
+def slot_signature(image) -> Optional[np.ndarray]:
+    """Miniatura em cinza do botão do golpe, usada para detectar mudança no slot."""
+    if image is None or image.size == 0:
+        return None
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    return cv2.resize(gray, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class _Moveset:
+    def __init__(self):
+        self.votes = [Counter() for _ in range(N_SLOTS)]
+        self.locked: Optional[List[str]] = None
+        self.signatures: List[Optional[np.ndarray]] = [None] * N_SLOTS
+
+    def best(self) -> List[str]:
+        return [v.most_common(1)[0][0] if v else "" for v in self.votes]
+
+
+class MoveConsensus:
+    """Consenso de leituras de OCR dos 4 slots de golpes, por Pokémon.
+
+    Cada turno soma um voto por slot (só leituras validadas no dicionário de
+    golpes contam). Quando todos os slots têm ``lock_votes`` votos no mesmo
+    golpe com pelo menos ``min_agreement`` das leituras, o moveset é travado
+    junto com a assinatura visual de cada slot. A partir daí o OCR dos golpes
+    é pulado enquanto os slots continuarem iguais à assinatura; um slot
+    "sujo" (diferença média > ``dirty_threshold``) destrava e reabre a votação.
+    """
+
+    def __init__(self, validator: Optional[Callable[[str], Optional[str]]] = None,
+                 lock_votes: int = 3, min_agreement: float = 0.75, dirty_threshold: float = 12.0):
+        self.validator = validator
+        self.lock_votes = int(lock_votes)
+        self.min_agreement = float(min_agreement)
+        self.dirty_threshold = float(dirty_threshold)
+        self._movesets: Dict[str, _Moveset] = {}
+        self.ocr_skipped = 0
+
+    @classmethod
+    def from_config(cls, config, validator=None):
+        cfg = (config or {}).get('battle', {}).get('move_consensus', {})
+        if not cfg.get('enabled', True):
+            return None
+        return cls(
+            validator=validator,
+            lock_votes=cfg.get('lock_votes', 3),
+            min_agreement=cfg.get('min_agreement', 0.75),
+            dirty_threshold=cfg.get('dirty_threshold', 12.0),
+        )
+
+    def _get(self, pokemon_name: str) -> _Moveset:
+        key = (pokemon_name or "").strip().lower()
+        if key not in self._movesets:
+            self._movesets[key] = _Moveset()
+        return self._movesets[key]
+
+    def _validate(self, read: str) -> Optional[str]:
+        read = (read or "").strip()
+        if not read:
+            return ""   # slot vazio também é uma leitura (Pokémon com menos de 4 golpes)
+        if self.validator is None:
+            return read
+        try:
+            return self.validator(read) or None
+        except Exception as e:
+            logger.error(f"Erro ao validar golpe '{read}': {e}")
+            return None
+
+    def locked_moves(self, pokemon_name: str) -> Optional[List[str]]:
+        return self._get(pokemon_name).locked
+
+    def stable_moves(self, pokemon_name: str, slot_images: Sequence) -> Optional[List[str]]:
+        """Moveset travado se os slots na tela ainda batem com as assinaturas; senão None.
+
+        Um slot sujo destrava o moveset e zera os votos daquele slot.
+        """
+        entry = self._get(pokemon_name)
+        if entry.locked is None:
+            return None
+        for i, image in enumerate(list(slot_images)[:N_SLOTS]):
+            ref = entry.signatures[i]
+            sig = slot_signature(image)
+            if ref is None or sig is None:
+                continue
+            diff = float(np.abs(sig - ref).mean())
+            if diff > self.dirty_threshold:
+                logger.info(f"Slot {i + 1} de '{pokemon_name}' mudou (diff={diff:.1f}); reabrindo OCR dos golpes.")
+                entry.locked = None
+                entry.votes[i].clear()
+                return None
+        self.ocr_skipped += 1
+        return list(entry.locked)
+
+    def observe(self, pokemon_name: str, reads: Sequence[str], slot_images: Optional[Sequence] = None) -> List[str]:
+        """Soma as leituras do turno e retorna o moveset de consenso atual."""
+        entry = self._get(pokemon_name)
+        reads = list(reads)[:N_SLOTS] + [""] * (N_SLOTS - len(reads))
+        for i, read in enumerate(reads):
+            move = self._validate(read)
+            if move is not None:
+                entry.votes[i][move] += 1
+
+        if entry.locked is None and self._settled(entry):
+            entry.locked = entry.best()
+            images = list(slot_images or [])[:N_SLOTS]
+            entry.signatures = [slot_signature(img) for img in images] + [None] * (N_SLOTS - len(images))
+            logger.info(f"Golpes de '{pokemon_name}' travados: {entry.locked}")
+        return list(entry.locked) if entry.locked is not None else entry.best()
+
+    def _settled(self, entry: _Moveset) -> bool:
+        for votes in entry.votes:
+            if not votes:
+                return False
+            _, count = votes.most_common(1)[0]
+            if count < self.lock_votes or count / sum(votes.values()) < self.min_agreement:
+                return False
+        return any(entry.best())
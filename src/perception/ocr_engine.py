@@ -4,14 +4,82 @@ import pytesseract
 from loguru import logger
 import re
 import os
+import threading
+import time
+from contextlib import contextmanager
 from difflib import get_close_matches
 
 
+class OCRWorkerPool:
+    """Limita quantos processos do Tesseract rodam ao mesmo tempo no processo inteiro.
+
+    Compartilhado entre os ``OCREngine`` de várias instâncias do bot: com N
+    instâncias lendo ao mesmo tempo, no máximo ``workers`` Tesseracts disputam a
+    CPU e o resto espera na fila (o tempo de espera entra em ``stats``).
+    """
+
+    def __init__(self, workers=None):
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        # Tempo de parede com Tesseract rodando (somado entre slots): CPU dos filhos onde o SO não a reporta
+        self.busy_seconds = 0.0
+
+    @contextmanager
+    def slot(self):
+        started = time.monotonic()
+        with self._slots:
+            waited = time.monotonic() - started
+            with self._lock:
+                self.calls += 1
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+            acquired = time.monotonic()
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.busy_seconds += time.monotonic() - acquired
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'calls': self.calls,
+                'in_flight': self.in_flight,
+                'peak': self.peak,
+                'avg_wait_ms': 1000.0 * self.total_wait / self.calls if self.calls else 0.0,
+                'max_wait_ms': 1000.0 * self.max_wait,
+            }
+
+
 class OCREngine:
-    def __init__(self, tesseract_path):
+    def __init__(self, tesseract_path, timeout=2.0, pool=None):
         if not os.path.exists(tesseract_path):
             logger.error(f"Tesseract não encontrado em: {tesseract_path}")
         pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        # Tesseract travado é morto após ``timeout`` s (o próximo OCR sobe um processo novo)
+        self.timeout = float(timeout) if timeout else 0
+        self.timeouts = 0
+        # Chamado com (duração, origem) a cada timeout; o BotController liga no Watchdog
+        self.on_timeout = None
+        # ``guard(fn, *args)``: roda a chamada ao Tesseract num worker com deadline
+        # (``Watchdog.guard``; devolve "" se travar). None chama direto na thread atual
+        self.guard = None
+        # OCRWorkerPool compartilhado entre instâncias (None: sem limite de concorrência)
+        self.pool = pool
+        self.calls = 0
+        # Tempo de parede das chamadas ao Tesseract (ver tick_governor.cpu_clock)
+        self.busy_seconds = 0.0
+        self._stats_lock = threading.Lock()
         
         # Carrega moves conhecidos de data/known_moves.json
         self.known_moves = []
@@ -35,6 +103,34 @@ class OCREngine:
             logger.error(f"Erro ao carregar known_moves.json: {e}")
             self.known_moves = []
 
+    def _image_to_string(self, image, config, origin):
+        """``pytesseract.image_to_string`` com timeout; processo travado vira leitura vazia."""
+        with self._stats_lock:
+            self.calls += 1
+        started = time.monotonic()
+        try:
+            if self.guard is None:
+                return self._tesseract(image, config)
+            return self.guard(self._tesseract, image, config)
+        except RuntimeError as e:
+            if "timeout" not in str(e).lower():
+                raise
+            self.timeouts += 1
+            duration = time.monotonic() - started
+            logger.warning(f"Tesseract passou de {self.timeout}s em {origin}; processo encerrado.")
+            if self.on_timeout is not None:
+                self.on_timeout(duration, origin)
+            return ""
+        finally:
+            with self._stats_lock:
+                self.busy_seconds += time.monotonic() - started
+
+    def _tesseract(self, image, config):
+        if self.pool is None:
+            return pytesseract.image_to_string(image, config=config, timeout=self.timeout)
+        with self.pool.slot():
+            return pytesseract.image_to_string(image, config=config, timeout=self.timeout)
+
     def process_dynamic_background_text(self, image):
         """Isola texto branco brilhante em fundo colorido (botões de moves / HUD).
         Migrado de ImageProcessor.
@@ -121,7 +217,7 @@ class OCREngine:
             if whitelist:
                 config += f" -c tessedit_char_whitelist={whitelist}"
 
-            text = pytesseract.image_to_string(ocr_img, config=config)
+            text = self._image_to_string(ocr_img, config, "extract_text_optimized")
             return text.strip()
         except Exception as e:
             logger.error(f"Erro no OCR Otimizado: {e}")
@@ -140,7 +236,7 @@ class OCREngine:
                 "-c tessedit_char_whitelist="
                 "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- "
             )
-            text = pytesseract.image_to_string(processed_image, config=config)
+            text = self._image_to_string(processed_image, config, "read_text")
             return text.strip()
         except Exception as e:
             logger.error(f"Erro no OCR (read_text): {e}")
@@ -214,7 +310,7 @@ class OCREngine:
                 "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
             )
 
-            text = pytesseract.image_to_string(inverted, config=config)
+            text = self._image_to_string(inverted, config, "ocr_party_list")
 
             # 6. Limpeza das linhas
             names = [line.strip() for line in text.split("\n") if line.strip()]
@@ -0,0 +1,167 @@
+import heapq
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+
+class Priority(IntEnum):
+    """Prioridade de um job de percepção (menor valor roda primeiro)."""
+
+    CRITICAL = 0  # shiny, estado da tela: nunca descartados
+    HIGH = 1      # nome do inimigo / do meu pokémon
+    NORMAL = 2    # leituras úteis mas adiáveis (HP, level)
+    LOW = 3       # HUD da equipe, chat
+
+
+@dataclass(order=True)
+class PerceptionJob:
+    priority: Priority
+    deadline_at: float
+    seq: int
+    name: str = field(compare=False)
+    fn: Callable[[], Any] = field(compare=False)
+
+
+class PerceptionScheduler:
+    """Executa jobs de percepção por prioridade e deadline dentro de um orçamento por tick.
+
+    - CRITICAL e HIGH sempre rodam (apenas contam deadline perdido).
+    - NORMAL e LOW (nessa ordem) são descartados quando o orçamento acaba ou o
+      deadline já passou. Nada atravessa ticks: o resultado de um job é do frame
+      de quem o submeteu, então o que não rodou no ``run_tick`` é descartado (e
+      contado) em vez de rodar no tick de outro chamador.
+
+    O custo de cada job é estimado por média móvel das execuções anteriores,
+    então jobs caros deixam de ser tentados quando não cabem mais no tick. Para
+    a estimativa não ficar presa numa leitura lenta isolada, um job pulado
+    ``probe_every`` vezes seguidas roda mesmo assim (se ainda houver orçamento)
+    e é medido de novo.
+
+    ``shed_priority`` (ajustado pelo ``TickGovernor`` para respeitar o orçamento de CPU)
+    descarta de cara os jobs opcionais com prioridade >= a ela.
+
+    ``begin_tick`` abre o tick do loop: os ``run_tick`` seguintes (estado, HUD, turno
+    de batalha) dividem o mesmo orçamento, e os deadlines contam a partir da captura
+    do frame, não do ``submit``. Sem ``begin_tick`` cada ``run_tick`` tem orçamento
+    próprio e o deadline conta do ``submit``.
+    """
+
+    def __init__(self, config=None, clock: Callable[[], float] = time.perf_counter):
+        cfg = (config or {}).get('perception', {})
+        self.tick_budget = float(cfg.get('tick_budget', 0.25))
+        self.default_deadline = float(cfg.get('default_deadline', 0.5))
+        self.probe_every = int(cfg.get('probe_every', 10))
+        self.clock = clock
+
+        self._queue = []
+        self._seq = itertools.count()
+        self._cost_ema: Dict[str, float] = {}
+        self._skips: Counter = Counter()   # pulos seguidos por orçamento, por job
+        self.shed_priority: Optional[Priority] = None
+        # Tick aberto por ``begin_tick``: tempo já gasto em ``run_tick`` e captura do frame
+        self._tick_spent: Optional[float] = None
+        self._captured_at: Optional[float] = None
+
+        # Métricas
+        self.missed_deadlines: Counter = Counter()
+        self.dropped: Counter = Counter()
+        self.probes: Counter = Counter()
+        self.shed: Counter = Counter()
+        self.last_tick_duration = 0.0
+
+    def begin_tick(self, captured_at: Optional[float] = None):
+        """Abre um tick: zera o orçamento gasto e marca a captura do frame (no ``clock``)."""
+        self._tick_spent = 0.0
+        self.begin_frame(captured_at)
+
+    def begin_frame(self, captured_at: Optional[float] = None):
+        """Novo frame no mesmo tick (ex.: menu de golpes após o clique): só muda a base dos deadlines."""
+        self._captured_at = self.clock() if captured_at is None else float(captured_at)
+
+    def submit(self, name: str, fn: Callable[[], Any], priority: Priority = Priority.NORMAL,
+               deadline: Optional[float] = None):
+        """Agenda um job. ``deadline`` é relativo à captura do frame (ou a agora, sem tick aberto)."""
+        deadline = self.default_deadline if deadline is None else float(deadline)
+        base = self.clock() if self._captured_at is None else self._captured_at
+        job = PerceptionJob(Priority(priority), base + deadline, next(self._seq), name, fn)
+        heapq.heappush(self._queue, job)
+
+    def estimated_cost(self, name: str) -> float:
+        return self._cost_ema.get(name, 0.0)
+
+    def run_tick(self, budget: Optional[float] = None) -> Dict[str, Any]:
+        """Roda os jobs pendentes e devolve ``{nome: resultado}`` dos que executaram."""
+        budget = self.tick_budget if budget is None else float(budget)
+        spent = self._tick_spent or 0.0
+        start = self.clock()
+        results: Dict[str, Any] = {}
+
+        while self._queue:
+            job = heapq.heappop(self._queue)
+            now = self.clock()
+            elapsed = spent + (now - start)
+            optional = job.priority >= Priority.NORMAL
+
+            if optional and self.shed_priority is not None and job.priority >= self.shed_priority:
+                # Orçamento de CPU do processo estourado: detector opcional desligado
+                self.shed[job.name] += 1
+                continue
+
+            if optional and now > job.deadline_at:
+                # Frame já velho: resultado não serve mais
+                self.missed_deadlines[job.name] += 1
+                self.dropped[job.name] += 1
+                continue
+
+            if optional and elapsed + self.estimated_cost(job.name) > budget:
+                if elapsed < budget and self._skips[job.name] + 1 >= self.probe_every:
+                    # Re-mede um job que a estimativa vem barrando (o custo pode ter caído):
+                    # a medição nova substitui a média em vez de se diluir nela
+                    self.probes[job.name] += 1
+                    self._cost_ema.pop(job.name, None)
+                else:
+                    self._skips[job.name] += 1
+                    self.dropped[job.name] += 1
+                    continue
+            self._skips[job.name] = 0
+
+            try:
+                results[job.name] = job.fn()
+            except Exception as e:
+                logger.error(f"Erro no job de percepção '{job.name}': {e}")
+                results[job.name] = None
+
+            finished = self.clock()
+            self._update_cost(job.name, finished - now)
+            if finished > job.deadline_at:
+                self.missed_deadlines[job.name] += 1
+
+        self.last_tick_duration = spent + (self.clock() - start)
+        if self._tick_spent is not None:
+            self._tick_spent = self.last_tick_duration
+        return results
+
+    def clear(self):
+        """Descarta jobs pendentes (ex.: frame mudou de contexto)."""
+        for job in self._queue:
+            self.dropped[job.name] += 1
+        self._queue.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "missed_deadlines": dict(self.missed_deadlines),
+            "dropped": dict(self.dropped),
+            "probes": dict(self.probes),
+            "shed": dict(self.shed),
+            "pending": len(self._queue),
+            "last_tick_duration": self.last_tick_duration,
+        }
+
+    def _update_cost(self, name: str, duration: float, alpha: float = 0.3):
+        prev = self._cost_ema.get(name)
+        self._cost_ema[name] = duration if prev is None else (1 - alpha) * prev + alpha * duration
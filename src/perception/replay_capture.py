@@ -0,0 +1,80 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import cv2
+from loguru import logger
+
+from ..utils.geometry import crop_roi_safe
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class ReplayCapture:
+    """Fonte de frames gravados com a interface do ``ScreenCapture``.
+
+    Substitui a tela por uma sequência de imagens (lista de arrays ou um
+    diretório de PNGs em ordem de nome), para rodar o bot sem jogo/monitor:
+    testes, reprodução de bugs e várias instâncias no supervisor.
+
+    - ``interval`` > 0: os frames avançam pelo relógio (um a cada ``interval``
+      segundos), como uma tela ao vivo; todas as threads veem o mesmo frame.
+    - ``interval`` = 0: cada ``capture()`` avança um frame.
+    - Sem ``loop``, para no último frame (``exhausted`` fica True).
+    """
+
+    origin = (0, 0)
+
+    def __init__(self, frames: List, loop: bool = True, interval: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if not frames:
+            raise ValueError("ReplayCapture precisa de pelo menos um frame")
+        self.frames = list(frames)
+        self.loop = loop
+        self.interval = float(interval)
+        self.clock = clock
+        self.served = 0
+        self._cursor = -1
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, path, loop: bool = True, interval: float = 0.0):
+        files = sorted(p for p in Path(path).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        frames = [img for img in (cv2.imread(str(p)) for p in files) if img is not None]
+        logger.info(f"Replay: {len(frames)} frames carregados de {path}")
+        return cls(frames, loop=loop, interval=interval)
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.loop and self._index() >= len(self.frames) - 1
+
+    def clone(self):
+        """A própria fonte: é thread-safe e todas as threads devem ver a mesma sequência."""
+        return self
+
+    def capture(self):
+        with self._lock:
+            if self.interval > 0:
+                if self._started is None:
+                    self._started = self.clock()
+            else:
+                self._cursor += 1
+            self.served += 1
+            return self.frames[self._index()]
+
+    def capture_region(self, roi):
+        """Recorte do frame atual (sem avançar a sequência)."""
+        with self._lock:
+            frame = self.frames[max(0, self._index())]
+        return crop_roi_safe(frame, roi) if roi else frame
+
+    def _index(self) -> int:
+        if self.interval > 0:
+            position = 0 if self._started is None else int((self.clock() - self._started) / self.interval)
+        else:
+            position = max(0, self._cursor)
+        if self.loop:
+            return position % len(self.frames)
+        return min(position, len(self.frames) - 1)
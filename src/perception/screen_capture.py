@@ -2,12 +2,56 @@ import mss
 import numpy as np
 import cv2
 
+from ..utils.geometry import normalize_roi
+
+
 class ScreenCapture:
-    def __init__(self, config=None):
+    def __init__(self, config=None, monitor=1, region=None):
+        """``region`` ([x,y,w,h] ou [x1,y1,x2,y2], relativa ao monitor): captura só a
+        janela de uma instância do jogo; os frames (e as ROIs) passam a ser relativos a ela."""
+        self.cfg = config
+        self.monitor_index = monitor
+        self.region = region
         self.sct = mss.mss()
-        self.monitor = self.sct.monitors[1] # Default to primary monitor
+        self.monitor = dict(self.sct.monitors[monitor]) # Default to primary monitor
+        coords = normalize_roi(region) if region else None
+        if coords:
+            x1, y1, x2, y2 = coords
+            self.monitor = {
+                'left': self.monitor['left'] + x1,
+                'top': self.monitor['top'] + y1,
+                'width': max(1, x2 - x1),
+                'height': max(1, y2 - y1),
+            }
+
+    def clone(self):
+        """Nova captura da mesma região/monitor (para outra thread: ``mss`` não é compartilhável)."""
+        return ScreenCapture(self.cfg, self.monitor_index, self.region)
+
+    @property
+    def origin(self):
+        """Canto superior esquerdo do frame em coordenadas absolutas da tela (offset do input)."""
+        return self.monitor['left'], self.monitor['top']
 
     def capture(self):
         screenshot = self.sct.grab(self.monitor)
         img = np.array(screenshot)
-        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
\ No newline at end of file
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+    def capture_region(self, roi):
+        """Captura apenas uma ROI ([x1,y1,x2,y2] ou [x,y,w,h]) relativa ao monitor.
+
+        Bem mais barato que ``capture()`` quando a região é pequena.
+        """
+        coords = normalize_roi(roi)
+        if not coords:
+            return self.capture()
+        x1, y1, x2, y2 = coords
+        region = {
+            'left': self.monitor['left'] + x1,
+            'top': self.monitor['top'] + y1,
+            'width': max(1, x2 - x1),
+            'height': max(1, y2 - y1),
+        }
+        img = np.array(self.sct.grab(region))
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
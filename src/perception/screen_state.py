@@ -0,0 +1,152 @@
+from collections import Counter
+from enum import Enum
+
+from loguru import logger
+
+from .game_state_detector import GameState
+
+
+class ScreenState(Enum):
+    """Estados de tela mais finos que ``GameState``, com transições explícitas."""
+
+    UNKNOWN = "unknown"
+    WALKING = "walking"
+    DIALOG = "dialog"
+    BATTLE_MENU = "battle_menu"
+    MOVES_MENU = "moves_menu"
+    SWITCH_MENU = "switch_menu"
+    SHINY = "shiny"
+
+    @property
+    def game_state(self) -> GameState:
+        return _GAME_STATE[self]
+
+    @property
+    def in_battle(self) -> bool:
+        return self.game_state == GameState.IN_BATTLE
+
+
+_GAME_STATE = {
+    ScreenState.UNKNOWN: GameState.UNKNOWN,
+    ScreenState.WALKING: GameState.EXPLORING,
+    ScreenState.DIALOG: GameState.EXPLORING,
+    ScreenState.BATTLE_MENU: GameState.IN_BATTLE,
+    ScreenState.MOVES_MENU: GameState.IN_BATTLE,
+    ScreenState.SWITCH_MENU: GameState.IN_BATTLE,
+    ScreenState.SHINY: GameState.SHINY_FOUND,
+}
+
+# Transições legais (SHINY é global e alcançável de qualquer estado)
+TRANSITIONS = {
+    ScreenState.UNKNOWN: set(ScreenState),
+    ScreenState.WALKING: {ScreenState.DIALOG, ScreenState.BATTLE_MENU},
+    ScreenState.DIALOG: {ScreenState.WALKING, ScreenState.BATTLE_MENU},
+    ScreenState.BATTLE_MENU: {ScreenState.MOVES_MENU, ScreenState.SWITCH_MENU, ScreenState.WALKING, ScreenState.DIALOG},
+    ScreenState.MOVES_MENU: {ScreenState.BATTLE_MENU, ScreenState.WALKING},
+    ScreenState.SWITCH_MENU: {ScreenState.BATTLE_MENU, ScreenState.WALKING},
+    ScreenState.SHINY: set(),
+}
+
+# Quais detectores podem mover cada estado adiante (em ordem de prioridade).
+# Só esses rodam no tick: no menu de golpes não procuramos goto, andando não
+# lemos ROIs de batalha.
+STATE_DETECTORS = {
+    ScreenState.UNKNOWN: ('battle_buttons', 'talk', 'goto'),
+    ScreenState.WALKING: ('battle_buttons', 'talk'),
+    ScreenState.DIALOG: ('talk', 'battle_buttons'),
+    ScreenState.BATTLE_MENU: ('moves_menu', 'switch_menu', 'battle_buttons'),
+    ScreenState.MOVES_MENU: ('moves_menu', 'battle_buttons'),
+    ScreenState.SWITCH_MENU: ('switch_menu', 'battle_buttons'),
+    ScreenState.SHINY: (),
+}
+
+# Estado alcançado por cada detector quando ele dispara
+DETECTOR_TARGETS = {
+    'battle_buttons': ScreenState.BATTLE_MENU,
+    'moves_menu': ScreenState.MOVES_MENU,
+    'switch_menu': ScreenState.SWITCH_MENU,
+    'talk': ScreenState.DIALOG,
+    'goto': ScreenState.WALKING,
+}
+
+# Para onde ir quando nenhum detector do estado dispara por ``miss_tolerance`` ticks
+FALLBACK = {
+    ScreenState.UNKNOWN: ScreenState.WALKING,
+    ScreenState.WALKING: ScreenState.WALKING,
+    ScreenState.DIALOG: ScreenState.WALKING,
+    ScreenState.BATTLE_MENU: ScreenState.WALKING,
+    ScreenState.MOVES_MENU: ScreenState.WALKING,
+    ScreenState.SWITCH_MENU: ScreenState.WALKING,
+    ScreenState.SHINY: ScreenState.SHINY,
+}
+
+
+class ScreenStateMachine:
+    """Máquina de estados de tela que só roda os detectores relevantes ao estado atual.
+
+    O detector de shiny é global e roda em todo tick. Os demais são métodos do
+    ``GameStateDetector`` (``detect_battle_buttons``, ``detect_talk``, ...).
+    """
+
+    def __init__(self, detector, config=None):
+        self.detector = detector
+        cfg = (config or {}).get('detection', {}).get('state_machine', {}) or {}
+        # Ticks seguidos sem nenhum detector disparar antes de cair no fallback
+        # (animações escondem os botões por alguns frames)
+        self.miss_tolerance = int(cfg.get('miss_tolerance', 2))
+        self.state = ScreenState.UNKNOWN
+        self.misses = 0
+        # True só quando algum detector disparou no último ``update``: nos ticks de
+        # tolerância (e no fallback) o estado é herdado, não visto neste frame
+        self.confirmed = False
+        self.detector_runs: Counter = Counter()
+        self._detectors = {
+            'battle_buttons': detector.detect_battle_buttons,
+            'moves_menu': detector.detect_moves_menu,
+            'switch_menu': detector.detect_switch_menu,
+            'talk': detector.detect_talk,
+            'goto': detector.detect_goto,
+        }
+
+    def reset(self, state: ScreenState = ScreenState.UNKNOWN):
+        self.state = state
+        self.misses = 0
+        self.confirmed = False
+
+    def update(self, image) -> ScreenState:
+        self.confirmed = False
+        self.detector_runs['shiny'] += 1
+        if self.detector._detect_shiny(image):
+            self.confirmed = True
+            return self._transition(ScreenState.SHINY)
+
+        for name in STATE_DETECTORS[self.state]:
+            self.detector_runs[name] += 1
+            try:
+                hit = self._detectors[name](image)
+            except Exception as e:
+                logger.error(f"Erro no detector '{name}': {e}")
+                continue
+            if not hit:
+                continue
+
+            target = DETECTOR_TARGETS[name]
+            self.misses = 0
+            self.confirmed = True
+            if target == self.state:
+                return self.state
+            if target in TRANSITIONS[self.state]:
+                return self._transition(target)
+            logger.debug(f"Transição ilegal ignorada: {self.state.name} -> {target.name} (detector '{name}')")
+
+        self.misses += 1
+        if self.misses >= self.miss_tolerance:
+            return self._transition(FALLBACK[self.state])
+        return self.state
+
+    def _transition(self, target: ScreenState) -> ScreenState:
+        if target != self.state:
+            logger.debug(f"Estado de tela: {self.state.name} -> {target.name}")
+            self.state = target
+            self.misses = 0
+        return self.state
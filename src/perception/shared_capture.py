@@ -0,0 +1,160 @@
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from ..utils.geometry import normalize_roi
+
+
+def mss_grabber(monitor: int = 1) -> Callable[[], np.ndarray]:
+    """Grab do monitor inteiro em BGR com uma conversão só (o BGRA do mss é lido sem cópia).
+
+    Deve ser criado na thread que vai capturar (``mss`` não é compartilhável entre threads).
+    """
+    import mss
+    sct = mss.mss()
+    area = sct.monitors[monitor]
+
+    def grab():
+        shot = sct.grab(area)
+        bgra = np.frombuffer(shot.bgra, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR)
+    return grab
+
+
+def monitor_origin(monitor: int = 1) -> Tuple[int, int]:
+    import mss
+    with mss.mss() as sct:
+        area = sct.monitors[monitor]
+    return area['left'], area['top']
+
+
+class SharedScreenCapture:
+    """Captura o monitor uma vez por período e entrega a cada instância a fatia dela.
+
+    Uma thread faz o grab do monitor inteiro a cada ``interval`` segundos e
+    publica o frame; ``tile(region)`` devolve um ``TileCapture`` cujo
+    ``capture()`` é uma view NumPy (sem cópia) do último frame. O custo de
+    captura fica constante com o número de clientes na tela (um grab e uma
+    conversão de cor por período, em vez de um ``mss.grab`` por instância).
+
+    Cada grab gera um array novo: views entregues antes continuam válidas e não
+    mudam. Os frames são compartilhados, então quem os recebe não deve escrever neles.
+    """
+
+    def __init__(self, monitor: int = 1, interval: float = 0.05,
+                 grab_factory: Optional[Callable[[], Callable[[], np.ndarray]]] = None,
+                 origin: Optional[Tuple[int, int]] = None, clock: Callable[[], float] = time.monotonic):
+        self.monitor = monitor
+        self.interval = float(interval)
+        self.grab_factory = grab_factory or (lambda: mss_grabber(monitor))
+        self.origin = tuple(origin) if origin is not None else (
+            monitor_origin(monitor) if grab_factory is None else (0, 0)
+        )
+        self.clock = clock
+        self.grabs = 0
+        self.errors = 0
+        self.total_grab = 0.0
+        self.tiles = 0
+        self._frame: Optional[np.ndarray] = None
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config, monitor: int = 1):
+        cfg = (config or {}).get('supervisor', {}).get('shared_capture', {}) or {}
+        if not cfg.get('enabled', False):
+            return None
+        return cls(monitor, interval=cfg.get('interval', 0.05))
+
+    def tile(self, region) -> "TileCapture":
+        self.tiles += 1
+        return TileCapture(self, region)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"SharedCapture-{self.monitor}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def latest(self, timeout: float = 2.0) -> Tuple[np.ndarray, int]:
+        """Último frame e o número dele; sobe a thread de captura se ainda não estiver rodando."""
+        with self._cond:
+            if self._thread is None:
+                self.start()
+            if not self._cond.wait_for(lambda: self._frame is not None, timeout):
+                raise RuntimeError(f"Captura compartilhada do monitor {self.monitor} sem frame após {timeout}s")
+            return self._frame, self._seq
+
+    def stats(self):
+        return {
+            'grabs': self.grabs,
+            'errors': self.errors,
+            'tiles': self.tiles,
+            'grab_ms': 1000.0 * self.total_grab / self.grabs if self.grabs else 0.0,
+        }
+
+    def _run(self):
+        grab = self.grab_factory()
+        while not self._stop.is_set():
+            started = self.clock()
+            try:
+                frame = grab()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Erro na captura compartilhada: {e}")
+                frame = None
+            finished = self.clock()
+            if frame is not None:
+                self.grabs += 1
+                self.total_grab += finished - started
+                with self._cond:
+                    self._frame, self._seq = frame, self._seq + 1
+                    self._cond.notify_all()
+            self._stop.wait(max(0.0, self.interval - (finished - started)))
+
+
+class TileCapture:
+    """Fatia de uma ``SharedScreenCapture`` com a interface do ``ScreenCapture``.
+
+    ``region`` ([x,y,w,h] ou [x1,y1,x2,y2]) é relativa ao monitor capturado;
+    ``origin`` soma o offset da fatia (vai para o offset do ``InputSimulator``).
+    Pode ser usada de várias threads (a captura de verdade é da thread compartilhada).
+    """
+
+    def __init__(self, shared: SharedScreenCapture, region):
+        coords = normalize_roi(region)
+        if not coords:
+            raise ValueError(f"Região inválida para a fatia: {region}")
+        self.shared = shared
+        self.x1, self.y1, self.x2, self.y2 = coords
+        self.origin = (shared.origin[0] + self.x1, shared.origin[1] + self.y1)
+        self.last_seq = 0
+
+    def clone(self):
+        """A própria fatia: a captura de verdade é da thread compartilhada."""
+        return self
+
+    def capture(self):
+        frame, self.last_seq = self.shared.latest()
+        return frame[self.y1:self.y2, self.x1:self.x2]
+
+    def capture_region(self, roi):
+        """ROI relativa à fatia, também como view do frame compartilhado."""
+        tile = self.capture()
+        coords = normalize_roi(roi)
+        if not coords:
+            return tile
+        x1, y1, x2, y2 = coords
+        return tile[max(0, y1):max(0, y2), max(0, x1):max(0, x2)]
@@ -0,0 +1,203 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+def sprite_hash(image) -> Optional[np.uint64]:
+    """dHash de 64 bits do sprite (gradiente horizontal num grid 9x8 em cinza).
+
+    Robusto a pequenas variações de brilho/escala e barato (um resize + comparação).
+    """
+    if image is None or image.size == 0:
+        return None
+    if image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return np.packbits(bits.ravel()).view(">u8")[0].astype(np.uint64)
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class SpriteIndex:
+    """Índice de vizinho mais próximo (distância de Hamming) de hashes de sprites.
+
+    Cada encontro confirmado (nome validado pelo OCR) vira uma entrada. A busca é
+    um XOR + popcount vetorizado sobre todas as entradas, então com algumas
+    centenas de sprites fica bem abaixo de 1 ms.
+
+    Com ``max_per_label`` variações, a nova substitui a mais antiga do label
+    (ordem de inserção em ``_stamps``). O .npz é regravado em lote: a cada
+    ``save_every`` mudanças, numa thread à parte (fora do turno de batalha), e
+    em ``close()``.
+
+    ``add`` e ``lookup`` podem ser chamados de threads diferentes (a especulação
+    de turno consulta o índice enquanto o bot confirma encontros): hashes, labels
+    e stamps só mudam sob ``_lock``.
+    """
+
+    def __init__(self, path=None, max_distance: int = 6, max_per_label: int = 8, save_every: int = 8):
+        self.path = Path(path) if path else None
+        self.max_distance = int(max_distance)
+        self.max_per_label = int(max_per_label)
+        self.save_every = max(1, int(save_every))
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._labels: List[str] = []
+        self._stamps = np.zeros(0, dtype=np.int64)   # ordem de inserção de cada entrada
+        self._next_stamp = 0
+        self._dirty = 0
+        self._generation = 0
+        self._written = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None:
+            self.load()
+
+    @classmethod
+    def from_config(cls, config):
+        cfg = (config or {}).get('detection', {}).get('sprite_index', {})
+        if not cfg.get('enabled', False):
+            return None
+        return cls(
+            path=cfg.get('path', 'data/sprite_index.npz'),
+            max_distance=cfg.get('max_distance', 6),
+            max_per_label=cfg.get('max_per_label', 8),
+            save_every=cfg.get('save_every', 8),
+        )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._labels)
+
+    def lookup(self, image) -> Tuple[Optional[str], Optional[int]]:
+        """Retorna ``(nome, distância)`` do vizinho mais próximo ou ``(None, None)``."""
+        h = sprite_hash(image)
+        if h is None:
+            with self._lock:
+                self.misses += 1
+            return None, None
+        return self.lookup_hash(h)
+
+    def lookup_hash(self, h) -> Tuple[Optional[str], Optional[int]]:
+        with self._lock:
+            if not self._labels:
+                self.misses += 1
+                return None, None
+            dists = _popcount64(self._hashes ^ np.uint64(h))
+            best = int(np.argmin(dists))
+            dist = int(dists[best])
+            if dist > self.max_distance:
+                self.misses += 1
+                return None, dist
+            self.hits += 1
+            return self._labels[best], dist
+
+    def add(self, image, label: str) -> bool:
+        """Adiciona um encontro confirmado. Retorna True se o índice mudou."""
+        h = sprite_hash(image)
+        if h is None or not label:
+            return False
+        label = label.strip().lower()
+
+        with self._lock:
+            changed = self._insert(h, label)
+            # Gravação em lote: o snapshot sai sob o lock, a escrita fica fora dele
+            snapshot = self._snapshot() if changed and self._dirty >= self.save_every else None
+        if snapshot is not None:
+            self._save(snapshot, background=True)
+        return changed
+
+    def _insert(self, h, label: str) -> bool:
+        """Insere/substitui a variação (com ``_lock`` já adquirido)."""
+        if self._labels:
+            dists = _popcount64(self._hashes ^ h)
+            same = [i for i, lbl in enumerate(self._labels) if lbl == label]
+            # Já existe uma variação praticamente idêntica: nada a fazer
+            if same and int(dists[same].min()) <= self.max_distance // 2:
+                return False
+            if len(same) >= self.max_per_label:
+                # Substitui a entrada mais antiga deste label
+                oldest = same[int(np.argmin(self._stamps[same]))]
+                self._hashes[oldest] = h
+                self._stamps[oldest] = self._stamp()
+                self._dirty += 1
+                return True
+
+        self._hashes = np.append(self._hashes, np.uint64(h))
+        self._labels.append(label)
+        self._stamps = np.append(self._stamps, self._stamp())
+        self._dirty += 1
+        return True
+
+    def _stamp(self) -> int:
+        self._next_stamp += 1
+        return self._next_stamp
+
+    # --------- Persistência ---------
+    def load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                hashes = data["hashes"].astype(np.uint64)
+                labels = [str(x) for x in data["labels"]]
+                # Arquivos antigos não têm a ordem de inserção: assume a ordem do array
+                stamps = data["stamps"] if "stamps" in data.files else np.arange(1, len(labels) + 1)
+            with self._lock:
+                self._hashes, self._labels = hashes, labels
+                self._stamps = stamps.astype(np.int64)
+                self._next_stamp = int(self._stamps.max(initial=0))
+            logger.info(f"Índice de sprites carregado: {len(labels)} entradas ({self.path})")
+        except Exception as e:
+            logger.error(f"Erro ao carregar índice de sprites {self.path}: {e}")
+
+    def flush(self, background: bool = False):
+        """Grava as mudanças pendentes (``background``: numa thread, sem bloquear o chamador)."""
+        with self._lock:
+            snapshot = self._snapshot()
+        if snapshot is not None:
+            self._save(snapshot, background)
+
+    def _snapshot(self):
+        """Cópia das mudanças pendentes para gravar (com ``_lock`` já adquirido); None se nada mudou."""
+        if self.path is None or not self._dirty:
+            return None
+        self._dirty = 0
+        self._generation += 1
+        return self._generation, self._hashes.copy(), list(self._labels), self._stamps.copy()
+
+    def _save(self, snapshot, background: bool):
+        if background:
+            threading.Thread(target=self._write, args=snapshot, name="SpriteIndexSave", daemon=True).start()
+        else:
+            self._write(*snapshot)
+
+    def close(self):
+        self.flush()
+
+    def _write(self, generation, hashes, labels, stamps):
+        with self._write_lock:
+            if generation <= self._written:
+                return   # uma gravação mais nova já passou na frente
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+                with tmp.open("wb") as f:
+                    np.savez(f, hashes=hashes, labels=np.array(labels, dtype=str), stamps=stamps)
+                os.replace(tmp, self.path)
+                self._written = generation
+            except Exception as e:
+                logger.error(f"Erro ao salvar índice de sprites {self.path}: {e}")
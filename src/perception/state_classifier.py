@@ -0,0 +1,107 @@
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from .game_state_detector import GameState
+
+# Tamanho do thumbnail usado como vetor de features (largura, altura)
+FEATURE_SIZE = (16, 9)
+
+
+def frame_features(image, size=FEATURE_SIZE) -> np.ndarray:
+    """Thumbnail BGR do frame achatado, com média zero e norma 1 (float32).
+
+    A normalização torna o produto escalar com os centróides uma similaridade
+    de cosseno, insensível a variações globais de brilho.
+    """
+    small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    vec = small.astype(np.float32).ravel()
+    vec -= vec.mean()
+    norm = float(np.linalg.norm(vec))
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+class FrameStateClassifier:
+    """Classificador nearest-centroid de frames -> ``GameState``.
+
+    Treinado offline (``tools/train_state_classifier.py``) a partir de frames
+    gravados e rotulados. Em runtime a classificação é um único produto
+    matriz-vetor (``centroids @ features``); a confiança é a margem de
+    similaridade entre o melhor e o segundo melhor centróide.
+    """
+
+    def __init__(self, centroids: np.ndarray, labels, min_confidence: float = 0.1):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.labels = [GameState(lbl) for lbl in labels]
+        self.min_confidence = float(min_confidence)
+
+    @classmethod
+    def fit(cls, frames: Iterable, labels: Iterable, min_confidence: float = 0.1):
+        feats = {}
+        for frame, label in zip(frames, labels):
+            state = GameState(label.value if isinstance(label, GameState) else label)
+            feats.setdefault(state, []).append(frame_features(frame))
+
+        if not feats:
+            raise ValueError("Nenhum frame rotulado para treinar o classificador")
+
+        states = sorted(feats, key=lambda s: s.value)
+        centroids = []
+        for state in states:
+            c = np.mean(feats[state], axis=0)
+            norm = float(np.linalg.norm(c))
+            centroids.append(c / norm if norm > 0 else c)
+        return cls(np.stack(centroids), [s.value for s in states], min_confidence)
+
+    @classmethod
+    def from_config(cls, config):
+        cfg = (config or {}).get('detection', {}).get('state_classifier', {})
+        if not cfg.get('enabled', False):
+            return None
+        path = Path(cfg.get('model_path', 'data/state_classifier.npz'))
+        if not path.exists():
+            logger.warning(f"Modelo de estado não encontrado em {path}; usando só template matching.")
+            return None
+        try:
+            model = cls.load(path)
+        except Exception as e:
+            logger.error(f"Erro ao carregar classificador de estado {path}: {e}")
+            return None
+        model.min_confidence = float(cfg.get('min_confidence', model.min_confidence))
+        return model
+
+    def predict(self, image) -> Tuple[Optional[GameState], float]:
+        """Retorna ``(estado, confiança)``; estado é None quando não há confiança suficiente."""
+        if image is None or image.size == 0 or len(self.labels) == 0:
+            return None, 0.0
+        sims = self.centroids @ frame_features(image)
+        if len(sims) == 1:
+            best, confidence = 0, float(sims[0])
+        else:
+            top2 = np.argpartition(-sims, 1)[:2]
+            best = int(top2[0]) if sims[top2[0]] >= sims[top2[1]] else int(top2[1])
+            confidence = float(abs(sims[top2[0]] - sims[top2[1]]))
+        if confidence < self.min_confidence:
+            return None, confidence
+        return self.labels[best], confidence
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                labels=np.array([s.value for s in self.labels], dtype=str),
+                min_confidence=np.float32(self.min_confidence),
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["centroids"], [str(x) for x in data["labels"]], float(data["min_confidence"]))
@@ -0,0 +1,126 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from ..utils.geometry import crop_roi_safe, normalize_roi
+from .move_consensus import slot_signature
+
+MAX_SLOTS = 6
+_LEVEL = re.compile(r"lv\.?\s*(\d{1,3})", re.IGNORECASE)
+
+
+@dataclass
+class TeamSlot:
+    name: Optional[str] = None
+    level: Optional[int] = None
+    hp: Optional[float] = None        # fração 0..1 da barra de HP
+    signature: Optional[np.ndarray] = None
+
+
+def hp_bar_ratio(image) -> Optional[float]:
+    """Fração preenchida de uma barra de HP colorida (verde/amarela/vermelha) em fundo escuro/cinza."""
+    if image is None or image.size == 0:
+        return None
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    colored = (hsv[:, :, 1] > 80) & (hsv[:, :, 2] > 80)
+    columns = colored.any(axis=0)
+    return float(columns.mean()) if columns.size else None
+
+
+def _rel_crop(image, rel):
+    """Recorta uma sub-região dada em frações ``[x1, y1, x2, y2]`` da imagem."""
+    h, w = image.shape[:2]
+    x1, y1, x2, y2 = rel
+    return image[int(y1 * h):max(int(y2 * h), int(y1 * h) + 1), int(x1 * w):max(int(x2 * w), int(x1 * w) + 1)]
+
+
+class TeamHudTracker:
+    """Acompanha o HUD de equipe (``rois.team_hud``) durante a exploração.
+
+    Cada slot tem uma assinatura barata da área do nome/nível; só os slots cuja
+    assinatura mudou são relidos pelo OCR. O HP (barra colorida) é medido em
+    todo update, sem OCR. O resultado vai para ``TeamManager.current_team`` e
+    para HP/nível por Pokémon, prontos para o planejador de trocas.
+    """
+
+    def __init__(self, ocr, team_manager, config=None):
+        self.ocr = ocr
+        self.tm = team_manager
+        cfg = config or {}
+        hud = cfg.get('rois', {}).get('team_hud', {}) or {}
+        tracker_cfg = cfg.get('team_hud_tracker', {}) or {}
+        self.container = normalize_roi(hud.get('container'))
+        self.slot_height = int(hud.get('slot_height', 47))
+        self.name_rel = tracker_cfg.get('name_area', [0.0, 0.0, 1.0, 0.6])
+        self.hp_rel = tracker_cfg.get('hp_bar_area', [0.0, 0.7, 1.0, 1.0])
+        self.change_threshold = float(tracker_cfg.get('change_threshold', 10.0))
+        self.slots: List[TeamSlot] = []
+        self.reads = 0
+
+    @classmethod
+    def from_config(cls, config, ocr, team_manager):
+        cfg = (config or {}).get('team_hud_tracker', {})
+        if not cfg.get('enabled', True):
+            return None
+        tracker = cls(ocr, team_manager, config)
+        if not tracker.container:
+            logger.warning("rois.team_hud.container não configurado; tracker do HUD de equipe desativado.")
+            return None
+        return tracker
+
+    def slot_rois(self) -> List[list]:
+        x1, y1, x2, y2 = self.container
+        n = min(MAX_SLOTS, max(0, (y2 - y1) // max(self.slot_height, 1)))
+        return [[x1, y1 + i * self.slot_height, x2, y1 + (i + 1) * self.slot_height] for i in range(n)]
+
+    def update(self, image) -> bool:
+        """Atualiza os slots a partir do frame; retorna True se a equipe (nomes) mudou."""
+        rois = self.slot_rois()
+        if len(self.slots) != len(rois):
+            self.slots = [TeamSlot() for _ in rois]
+
+        names_changed = False
+        for slot, roi in zip(self.slots, rois):
+            slot_img = crop_roi_safe(image, roi)
+            if slot_img is None or slot_img.size == 0:
+                continue
+            name_img = _rel_crop(slot_img, self.name_rel)
+            sig = slot_signature(name_img)
+            if slot.signature is None or sig is None or float(np.abs(sig - slot.signature).mean()) > self.change_threshold:
+                slot.signature = sig
+                name, level = self._read_slot(name_img)
+                names_changed |= name != slot.name
+                slot.name, slot.level = name, level
+            slot.hp = hp_bar_ratio(_rel_crop(slot_img, self.hp_rel)) if slot.name else None
+
+        self._publish(names_changed)
+        return names_changed
+
+    def _read_slot(self, name_img):
+        self.reads += 1
+        text = self.ocr.extract_text_optimized(
+            name_img,
+            whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789. ",
+            invert_for_white_text=True,
+        )
+        text = " ".join(text.split())
+        match = _LEVEL.search(text)
+        level = int(match.group(1)) if match and 1 <= int(match.group(1)) <= 100 else None
+        name = _LEVEL.sub("", text)
+        name = re.sub(r"[^A-Za-z ]", "", name).strip()
+        return (name or None), level
+
+    def _publish(self, names_changed: bool):
+        present = [s for s in self.slots if s.name]
+        if names_changed:
+            self.tm.update_team_from_hud([s.name for s in present])
+            logger.info(f"Equipe (HUD): {self.tm.current_team}")
+        if hasattr(self.tm, "update_team_status"):
+            self.tm.update_team_status(
+                {s.name: s.hp for s in present if s.hp is not None},
+                {s.name: s.level for s in present if s.level},
+            )
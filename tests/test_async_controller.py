@@ -0,0 +1,115 @@
+import threading
+import time
+
+import numpy as np
+
+from src.core.async_controller import AsyncBotController
+from src.perception.game_state_detector import GameState
+from src.perception.replay_capture import ReplayCapture
+
+
+class StampedReplay(ReplayCapture):
+    """Replay em que cada frame carrega o próprio número e o instante da captura fica registrado."""
+
+    def __init__(self, count):
+        frames = []
+        for i in range(count):
+            frame = np.zeros((8, 8, 3), dtype=np.uint8)
+            frame[0, 0, :2] = (i // 256, i % 256)
+            frames.append(frame)
+        super().__init__(frames, loop=False)
+        self.captured_at = {}
+
+    def capture(self):
+        frame = super().capture()
+        self.captured_at.setdefault(frame_number(frame), time.monotonic())
+        return frame
+
+
+def frame_number(frame):
+    return int(frame[0, 0, 0]) * 256 + int(frame[0, 0, 1])
+
+
+class StubDetector:
+    templates = {}
+
+    def detect_state(self, img):
+        return GameState.EXPLORING
+
+
+class RecordingBot(AsyncBotController):
+    """Handlers falsos: cada ação "espera uma animação" de ``action_time`` pelo ``_sleep`` do bot."""
+
+    action_time = 0.08
+
+    def __init__(self, config, components):
+        super().__init__(config, components)
+        self.actions = []        # (número do frame, início, fim)
+        self.shinies = 0
+
+    def handle_exploring(self, img):
+        started = time.monotonic()
+        try:
+            self._sleep(self.action_time)
+        finally:
+            self.actions.append((frame_number(img), started, time.monotonic()))
+
+    def handle_shiny(self):
+        self.shinies += 1
+        self.running = False
+
+
+def make_bot(capture):
+    config = {
+        'bot': {'loop_interval': 0.0, 'debug_mode': False, 'async': {'capture_interval': 0.01}},
+        'watchdog': {'enabled': False},
+        'team_hud_tracker': {'enabled': False},
+    }
+    components = {
+        'screen': capture, 'detector': StubDetector(), 'input': None,
+        'strategy': None, 'ocr': None, 'team_mgr': None,
+    }
+    return RecordingBot(config, components)
+
+
+def run_in_thread(bot):
+    thread = threading.Thread(target=bot.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_decides_only_on_frames_captured_after_the_last_action():
+    capture = StampedReplay(1000)
+    bot = make_bot(capture)
+    thread = run_in_thread(bot)
+    time.sleep(1.0)
+    bot.running = False
+    thread.join(timeout=3.0)
+
+    assert not thread.is_alive()
+    assert len(bot.actions) >= 5
+    # Captura e percepção seguem durante as ações: bem mais frames que decisões
+    assert bot.frames_captured > 3 * len(bot.actions)
+    for (_, _, previous_end), (frame, _, _) in zip(bot.actions, bot.actions[1:]):
+        assert capture.captured_at[frame] >= previous_end
+
+
+def test_stop_and_shiny_cancel_the_tasks():
+    bot = make_bot(StampedReplay(1000))
+    thread = run_in_thread(bot)
+    time.sleep(0.3)
+    bot.running = False
+    thread.join(timeout=3.0)
+    assert not thread.is_alive() and bot.shinies == 0
+
+    # Shiny no meio de uma ação: o _sleep do handler é interrompido e nada mais é decidido
+    bot = make_bot(StampedReplay(1000))
+    bot.action_time = 5.0
+    thread = run_in_thread(bot)
+    time.sleep(0.3)
+    bot.shiny_event.set()
+    thread.join(timeout=3.0)
+
+    assert not thread.is_alive()
+    assert bot.shinies == 1
+    assert len(bot.actions) == 1 and bot.actions[0][2] - bot.actions[0][1] < 1.0
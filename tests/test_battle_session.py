@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.core.battle_session import BattleSessionTracker
+
+CONFIG = {'rois': {'enemy_name': [0, 0, 40, 10], 'player_name': [0, 50, 40, 60]}}
+
+
+class FakeDetector:
+    def __init__(self):
+        self.reads = {'enemy': 0, 'player': 0, 'level': 0}
+        self.enemy, self.player = "Pidgey", "Pikachu"
+        self.player_hp = 0.8
+
+    def identify_enemy(self, image):
+        self.reads['enemy'] += 1
+        return self.enemy
+
+    def read_player_name(self, image):
+        self.reads['player'] += 1
+        return self.player
+
+    def read_enemy_level(self, image):
+        self.reads['level'] += 1
+        return 7
+
+    def read_enemy_hp(self, image):
+        return 0.5
+
+    def read_player_hp(self, image):
+        return self.player_hp
+
+
+def _frame(player_value=100):
+    img = np.zeros((80, 80, 3), dtype=np.uint8)
+    img[0:10, 0:40] = 200
+    img[50:60, 0:40] = player_value
+    return img
+
+
+def test_identity_is_read_once_per_battle_and_invalidated_on_switch_or_faint():
+    detector = FakeDetector()
+    tracker = BattleSessionTracker(detector, CONFIG)
+    tracker.observe(in_battle=True)
+    for _ in range(3):
+        tracker.update_hp(_frame())
+        assert (tracker.identify_enemy(_frame()), tracker.read_player_name(_frame())) == ("Pidgey", "Pikachu")
+        assert tracker.read_enemy_level(_frame()) == 7
+    assert detector.reads == {'enemy': 1, 'player': 1, 'level': 1}
+
+    tracker.on_switch()
+    detector.player = "Onix"
+    assert tracker.read_player_name(_frame()) == "Onix"
+
+    # Meu Pokémon desmaiou: identidade cai e é relida no próximo turno
+    detector.player_hp = 0.0
+    tracker.update_hp(_frame())
+    assert tracker.session.player_name is None
+    assert detector.reads['player'] == 2 and tracker.session.turns == 4
+
+
+def test_name_roi_change_and_battle_end_invalidate():
+    detector = FakeDetector()
+    tracker = BattleSessionTracker(detector, CONFIG)
+    tracker.observe(in_battle=True)
+    tracker.read_player_name(_frame())
+    tracker.read_player_name(_frame(player_value=20))   # troca não vista: ROI do nome mudou
+    assert detector.reads['player'] == 2
+
+    tracker.observe(in_battle=False)
+    assert tracker.session is not None                 # um tick fora não encerra
+    tracker.observe(in_battle=False)
+    assert tracker.session is None
+    tracker.observe(in_battle=True)
+    tracker.identify_enemy(_frame())
+    assert detector.reads['enemy'] == 1 and tracker.session.enemy_name == "Pidgey"
@@ -0,0 +1,34 @@
+from src.decision.battle_simulator import SimConfig, simulate
+
+TEAM = {
+    "pikachu": ["Growl", "Tail Whip", "Quick Attack", "Thunderbolt"],
+    "charmander": ["Growl", "Scratch", "Ember"],
+}
+
+
+def test_simulator_reports_metrics_and_is_deterministic():
+    cfg = SimConfig(battles=300, workers=1, seed=7, team=TEAM, batch_size=128)
+    report = simulate(cfg)
+    assert report.battles == 300
+    assert 0.0 < report.win_rate <= 1.0
+    assert 0.0 <= report.faint_rate <= 1.0
+    assert report.mean_turns_to_win >= 1.0
+    assert report.battles_per_second > 0
+
+    again = simulate(cfg)
+    assert (again.turns == report.turns).all() and (again.won == report.won).all()
+
+
+def test_strategy_beats_first_slot_baseline():
+    base = dict(battles=300, workers=1, seed=3, team=TEAM)
+    strategy = simulate(SimConfig(policy="strategy", **base))
+    first = simulate(SimConfig(policy="first_slot", **base))
+    # Slot 1 é Growl: a política de referência nunca causa dano
+    assert strategy.win_rate > first.win_rate
+
+
+def test_members_without_known_moves_struggle():
+    team = {"pikachu": [], "pidgey": ["Tackle"]}
+    report = simulate(SimConfig(battles=50, workers=1, seed=1, team=team))
+    assert report.battles == 50
+    assert report.win_rate > 0.0
@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+
+from src.core.battle_session import BattleSessionTracker
+from src.core.battle_speculation import TurnDecision, TurnSpeculator
+
+ROIS = {'enemy_name': [0, 0, 40, 10], 'player_name': [0, 50, 40, 60]}
+
+
+class SlowDetector:
+    def __init__(self, enemy="Pidgey"):
+        self.enemy = enemy
+
+    def identify_enemy(self, frame):
+        time.sleep(0.2)
+        return self.enemy
+
+    def read_player_name(self, frame):
+        time.sleep(0.2)
+        return "Pikachu"
+
+    def read_enemy_level(self, frame):
+        time.sleep(0.2)
+        return 7
+
+    def read_enemy_hp(self, frame):
+        return 0.5
+
+    def read_player_hp(self, frame):
+        return 0.8
+
+
+def _decide(enemy, player, level, hp=None):
+    return TurnDecision(enemy_name=enemy, player_name=player, enemy_level=level, best_slot=2, known_moves=["Thunder Shock"])
+
+
+def test_reads_run_in_parallel_and_turn_is_committed():
+    speculator = TurnSpeculator(SlowDetector(), _decide)
+    started = time.perf_counter()
+    future = speculator.start(frame=None)
+    time.sleep(0.1)   # "animação" do menu de golpes
+    turn = speculator.collect(future)
+    elapsed = time.perf_counter() - started
+    speculator.shutdown()
+
+    assert turn.speculative and (turn.enemy_name, turn.player_name, turn.enemy_level) == ("Pidgey", "Pikachu", 7)
+    assert turn.best_slot == 2
+    assert elapsed < 0.45   # uma rodada de OCR, não três em série
+    assert speculator.committed == 1
+
+
+def test_unread_enemy_discards_speculation():
+    decided = []
+    speculator = TurnSpeculator(SlowDetector(enemy=""), lambda *a: decided.append(a) or TurnDecision())
+    assert speculator.collect(speculator.start(frame=None)) is None
+    speculator.shutdown()
+    assert decided == [] and speculator.discarded == 1
+
+
+def test_speculation_is_validated_against_the_menu_frame_and_never_commits_state():
+    decided = []
+
+    def decide(enemy, player, level, hp=None):
+        decided.append(enemy)
+        return TurnDecision(enemy_name=enemy, player_name=player, enemy_level=level,
+                            enemy_hp=hp[0], player_hp=hp[1])
+
+    tracker = BattleSessionTracker(SlowDetector(), {'rois': ROIS})
+    tracker.observe(in_battle=True)
+    speculator = TurnSpeculator(tracker, decide, rois=ROIS)
+    before = np.zeros((80, 80, 3), dtype=np.uint8)
+    switched = before.copy()
+    switched[50:60, 0:40] = 200          # outro Pokémon meu em campo no frame do menu
+
+    assert speculator.collect(speculator.start(before), switched, opened=True) is None
+    assert speculator.collect(speculator.start(before), before.copy(), opened=False) is None
+    time.sleep(0.5)                      # leituras abandonadas terminam, mas a decisão não roda
+    assert decided == [] and speculator.discarded == 2
+
+    turn = speculator.collect(speculator.start(before), before.copy(), opened=True)
+    speculator.shutdown()
+    assert turn.speculative and decided == ["Pidgey"]
+    # HP só lido: a sessão só conta o turno quando o controlador registra o aceito
+    assert (turn.enemy_hp, turn.player_hp) == (0.5, 0.8)
+    assert tracker.session.turns == 0 and tracker.session.player_hp is None
+    tracker.commit_hp(turn.enemy_hp, turn.player_hp)
+    assert tracker.session.turns == 1 and tracker.session.player_hp == 0.8
@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.decision.damage_calculator import PHYSICAL, SPECIAL, STATUS, DamageCalculator
+from src.decision.matchup_table import move_row
+from src.knowledge.pokemon_database import PokemonDatabase
+
+
+def test_expected_damage_applies_stab_accuracy_levels_and_status():
+    db = PokemonDatabase(use_store=False)
+    calc = DamageCalculator(db.type_matrix)
+    fire, water, grass = db.type_indices(["Fire", "Water", "Grass"])
+
+    # Um atacante de fogo com 4 golpes de mesmo poder contra um alvo de grama
+    damage = calc.expected_damage(
+        power=[[80, 80, 80, 0]],
+        move_types=[[fire, water, fire, fire]],
+        accuracy=[[100, 100, 50, 100]],
+        category=[[SPECIAL, SPECIAL, PHYSICAL, STATUS]],
+        attacker_types=[[fire, fire]],
+        defender_types=[grass],
+    )[0]
+    # STAB (1.5) x super efetivo (2) contra não-STAB resistido (0.5): razão 6x
+    assert np.isclose(damage[0] / damage[1], 6.0)
+    assert np.isclose(damage[2], damage[0] / 2)  # precisão 50%
+    assert damage[3] == 0.0
+
+    low, high = calc.expected_damage(
+        [[80], [80]], [[fire], [fire]], [[100], [100]], [[SPECIAL], [SPECIAL]],
+        [[fire, fire], [fire, fire]], [grass], attacker_levels=[10, 60], defender_level=30,
+    )[:, 0]
+    assert high > low
+    # Sem base stats, a classe do golpe não muda o dano (só zera os de status)
+    special, physical = calc.expected_damage(
+        [[80], [80]], [[fire], [fire]], [[100], [100]], [[SPECIAL], [PHYSICAL]],
+        [[fire, fire], [fire, fire]], [grass],
+    )[:, 0]
+    assert special == physical
+
+
+def test_team_damage_is_one_call_over_the_whole_team():
+    db = PokemonDatabase(use_store=False)
+    calc = DamageCalculator(db.type_matrix)
+    team = {
+        "pikachu": ["Thunderbolt", "Tackle", "Growl"],
+        "charmander": ["Scratch", "Ember"],
+        "squirtle": ["Tackle", "Water Gun", "Tail Whip", "Bubble"],
+    }
+    rows = [move_row(db, name, moves) for name, moves in team.items()]
+    damage = calc.team_damage(rows, [r.attacker_types for r in rows], db.type_indices(["Water", "Flying"]))
+
+    assert damage.shape == (3, 4)
+    assert np.isneginf(damage[1, 2:]).all()
+    # Thunderbolt contra água/voador é o melhor golpe do time
+    assert np.unravel_index(np.argmax(damage), damage.shape) == (0, 0)
@@ -0,0 +1,45 @@
+from src.knowledge.identity_index import IdentityIndex, canonical_form
+from src.knowledge.pokemon_database import PokemonDatabase
+from src.knowledge.team_manager import TeamManager
+
+
+def test_name_variants_resolve_to_same_id():
+    assert canonical_form("Charmander†") == "charmander"
+    assert canonical_form("Nidoran♀") == "nidoran f"
+
+    db = PokemonDatabase(use_store=False)
+    assert db.species_id("Charmander†") == db.species_id("charmander") is not None
+    assert db.species_id("Ivyssaur") == db.species_id("IVYSAUR")
+    assert db.move_id("sand-attack") == db.move_id("Sand Attack") == db.move_id("SanadAttack") is not None
+    assert db.species_id("definitivamente não existe") is None
+    assert db.get_pokemon_types("Ivyssaur") == ["Grass", "Poison"]
+
+
+def test_store_and_json_modes_share_ids(tmp_path):
+    from src.knowledge.knowledge_store import build_store
+
+    store_path = build_store("data", tmp_path / "knowledge.sqlite")
+    store_db = PokemonDatabase(store_path=store_path)
+    json_db = PokemonDatabase(use_store=False)
+    assert store_db.store is not None
+    for name in ("Charizard", "Mr. Mime", "Venossaur"):
+        assert store_db.species_id(name) == json_db.species_id(name)
+    assert store_db.get_move_data("Thunder-Bolt") == json_db.get_move_data("thunderbolt")
+
+
+def test_team_manager_keys_moves_by_canonical_species(tmp_path):
+    identity = IdentityIndex.from_tables(PokemonDatabase(use_store=False).tables, {"species": {"Ivyssaur": "Ivysaur"}})
+    tm = TeamManager(identity=identity)
+    tm.moves_db_path = tmp_path / "known_moves.json"
+    tm.known_moves = {}
+
+    tm.update_pokemon_moves("Ivyssaur", ["sand-attack", "Tackle"])
+    assert tm.get_moves("ivysaur") == ["Sand Attack", "Tackle"]
+
+
+def test_species_aliases_point_to_dex_entries_with_learnsets():
+    db = PokemonDatabase(use_store=False)
+    aliases = IdentityIndex.load_aliases_file("data")["species"]
+    for alias, target in aliases.items():
+        assert db.species_id(alias) == db.species_id(target) is not None, alias
+        assert db.probable_moves(alias, 50), alias    # ex.: "Deoxys" -> "Deoxys Normal" do dex
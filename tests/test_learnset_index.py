@@ -0,0 +1,22 @@
+from src.knowledge.learnset_index import LearnsetIndex
+from src.knowledge.pokemon_database import PokemonDatabase
+
+
+def test_cumulative_movesets_keep_last_four_moves():
+    # espécie 1: 5 golpes no nível 1, um no 10 e um repetido no 20
+    rows = [(1, 1, m) for m in (1, 2, 3, 4, 5)] + [(1, 10, 6), (1, 20, 2)]
+    index = LearnsetIndex.build(rows, n_species=1, n_moves=6)
+
+    assert index.move_ids(1, 0).tolist() == []
+    assert index.move_ids(1, 1).tolist() == [2, 3, 4, 5]
+    assert index.move_ids(1, 15).tolist() == [3, 4, 5, 6]
+    assert index.move_ids(1, 20).tolist() == [4, 5, 6, 2]
+    assert index.move_ids(1, 100).tolist() == [4, 5, 6, 2]
+    assert index.move_ids(99, 10).tolist() == []
+
+
+def test_probable_moves_from_dex():
+    db = PokemonDatabase(use_store=False)
+    assert db.probable_moves("Pikachu", 36) == ["Agility", "Iron Tail", "Discharge", "Thunderbolt"]
+    assert db.probable_moves("pikachu", 36) == db.probable_moves("PIKACHU", 39)
+    assert db.probable_moves("não existe", 10) == []
@@ -0,0 +1,48 @@
+from src.decision.battle_strategy import BattleStrategy
+from src.decision.matchup_table import MatchupTable, combo_of
+from src.knowledge.pokemon_database import PokemonDatabase
+from src.knowledge.team_manager import TeamManager
+
+
+def _team(tmp_path, db, known):
+    tm = TeamManager(identity=db.identity)
+    tm.moves_db_path = tmp_path / "known_moves.json"
+    tm.known_moves = dict(known)
+    return tm
+
+
+def test_tensor_matches_type_matrix_and_strategy_uses_argmax(tmp_path):
+    db = PokemonDatabase(use_store=False)
+    tm = _team(tmp_path, db, {"pikachu": ["Tackle", "Thunderbolt", "Growl"]})
+    table = MatchupTable.build(db, tm.known_moves)
+
+    gyarados = db.get_pokemon_types("gyarados")
+    combo = combo_of(db.type_indices(gyarados))
+    for move_type in ("Electric", "Rock", "Ground", "Normal"):
+        t = db.type_index(move_type)
+        assert float(table.effectiveness[t, combo]) == db.get_type_multiplier(move_type, gyarados)
+
+    strat = BattleStrategy(db, tm, matchups=table)
+    assert strat.get_best_move("pikachu", "Gyarados") == 1
+    tm.current_team = ["pikachu"]
+    assert strat.choose_switch_target("Gyarados") == 0
+
+
+def test_rebuilt_only_when_fingerprint_changes(tmp_path):
+    db = PokemonDatabase(use_store=False)
+    tm = _team(tmp_path, db, {"charmander": ["Scratch", "Ember"]})
+    tm._save_moves()
+    path = tmp_path / "matchups.npz"
+
+    first = MatchupTable.load_or_build(db, tm.known_moves, tm.moves_db_path, path)
+    mtime = path.stat().st_mtime_ns
+    again = MatchupTable.load_or_build(db, tm.known_moves, tm.moves_db_path, path)
+    assert path.stat().st_mtime_ns == mtime
+    assert again.best_move("charmander", ["Scratch", "Ember"], ["Grass"]) == first.best_move(
+        "charmander", ["Scratch", "Ember"], ["Grass"]
+    ) == (1, 120.0)
+
+    tm.update_pokemon_moves("charmander", ["Scratch", "Ember", "Smokescreen"])
+    tm.flush()
+    rebuilt = MatchupTable.load_or_build(db, tm.known_moves, (tm.moves_db_path, tm.journal_path), path)
+    assert rebuilt.rows[db.species_id("charmander")].names == ("Scratch", "Ember", "Smokescreen")
@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+import yaml
+
+from src.perception.game_state_detector import GameStateDetector
+from src.utils.geometry import normalize_roi
+
+
+def _settings():
+    with open("config/settings.yaml", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config['detection']['state_classifier'] = {'enabled': False}
+    config['detection']['sprite_index'] = {'enabled': False}
+    return config
+
+
+def _white(frame, roi):
+    x1, y1, x2, y2 = normalize_roi(roi)
+    frame[y1 + 3:y2 - 3, x1 + 4:x2 - 4:3] = 255   # "texto" branco em colunas alternadas
+
+
+def _battle_menu_frame(config):
+    """Tela de batalha com os botões reais (templates) nas ROIs calibradas e o HUD visível.
+
+    Pior caso: texto branco também onde ficariam os slots de golpe (por baixo dos botões).
+    """
+    rois = config['rois']
+    frame = np.full((1080, 1920, 3), (90, 60, 40), dtype=np.uint8)
+    for roi in rois['moves'].values():
+        _white(frame, roi)
+    assets = config['assets']
+    for roi_key, image_key in (('btn_fight', 'fight_image'), ('btn_bag', 'bag_image'),
+                               ('btn_pokemon', 'pokemon_image'), ('btn_run', 'run_image')):
+        template = cv2.imread(assets['templates_dir'] + assets[image_key])
+        x1, y1, _, _ = normalize_roi(rois[roi_key])
+        h, w = template.shape[:2]
+        frame[y1:y1 + h, x1:x1 + w] = template
+    _white(frame, rois['player_name'])
+    _white(frame, rois['player_hp_text'])
+    return frame
+
+
+def test_battle_menu_frame_is_not_moves_or_switch_menu():
+    config = _settings()
+    detector = GameStateDetector(None, None, config)
+    frame = _battle_menu_frame(config)
+    moves = config['rois']['moves'].values()
+    assert sum(detector._white_ratio(frame, roi) >= 0.04 for roi in moves) >= 2   # só a cor enganaria
+
+    assert detector.detect_battle_buttons(frame)
+    assert not detector.detect_moves_menu(frame)
+    assert not detector.detect_switch_menu(frame)
+
+    # Área calibrada em cima do nome do meu Pokémon é recusada (HUD sempre visível)
+    config['detection']['switch_menu_area'] = config['rois']['switch_menu']['container']
+    assert not GameStateDetector(None, None, config).detect_switch_menu(frame)
+
+
+def test_moves_menu_frame_detected_without_battle_buttons():
+    config = _settings()
+    detector = GameStateDetector(None, None, config)
+    frame = np.full((1080, 1920, 3), (90, 60, 40), dtype=np.uint8)
+    _white(frame, config['rois']['player_name'])
+    for roi in config['rois']['moves'].values():
+        _white(frame, roi)
+
+    assert detector.detect_moves_menu(frame)
+    assert not detector.detect_battle_buttons(frame)
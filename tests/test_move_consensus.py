@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.perception.move_consensus import MoveConsensus
+
+VALID = {"tackle": "Tackle", "sand attack": "Sand Attack", "sanadattack": "Sand Attack", "gust": "Gust"}
+
+
+def _slots(seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 255, (40, 160, 3), dtype=np.uint8) for _ in range(4)]
+
+
+def test_votes_lock_moveset_and_ignore_junk_reads():
+    consensus = MoveConsensus(validator=lambda m: VALID.get(m.lower()), lock_votes=3)
+    slots = _slots()
+    turns = [
+        ["Tackle", "SanadAttack", "", ""],
+        ["Tackle", "Oe", "", ""],            # lixo do OCR não vota
+        ["Tackle", "Sand Attack", "", ""],
+        ["Tackle", "Sand Attack", "", ""],
+    ]
+    results = [consensus.observe("Pidgey", reads, slots) for reads in turns]
+    assert results[1] == ["Tackle", "Sand Attack", "", ""]
+    assert consensus.locked_moves("pidgey") == ["Tackle", "Sand Attack", "", ""]
+
+    # Slots iguais: OCR pulado
+    assert consensus.stable_moves("pidgey", slots) == ["Tackle", "Sand Attack", "", ""]
+    assert consensus.ocr_skipped == 1
+
+
+def test_dirty_slot_unlocks_and_reopens_voting():
+    consensus = MoveConsensus(validator=lambda m: VALID.get(m.lower()), lock_votes=2)
+    slots = _slots()
+    for _ in range(2):
+        consensus.observe("pidgey", ["Tackle", "Sand Attack", "", ""], slots)
+    assert consensus.locked_moves("pidgey") is not None
+
+    changed = list(slots)
+    changed[3] = np.full_like(slots[3], 255)   # aprendeu um golpe novo no slot 4
+    assert consensus.stable_moves("pidgey", changed) is None
+    assert consensus.locked_moves("pidgey") is None
+    consensus.observe("pidgey", ["Tackle", "Sand Attack", "", "Gust"], changed)
+    assert consensus.observe("pidgey", ["Tackle", "Sand Attack", "", "Gust"], changed) == [
+        "Tackle", "Sand Attack", "", "Gust"
+    ]
+    assert consensus.stable_moves("pidgey", changed) == ["Tackle", "Sand Attack", "", "Gust"]
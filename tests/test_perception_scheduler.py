@@ -0,0 +1,100 @@
+import pytest
+
+from src.perception.perception_scheduler import PerceptionScheduler, Priority
+
+
+class FakeClock:
+    """Relógio manual: cada job avança o tempo pelo custo declarado."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _job(clock, cost, value, order=None):
+    def fn():
+        clock.now += cost
+        if order is not None:
+            order.append(value)
+        return value
+    return fn
+
+
+def test_scheduler_runs_by_priority_and_drops_low_over_budget():
+    clock = FakeClock()
+    sched = PerceptionScheduler({"perception": {"tick_budget": 0.1, "default_deadline": 1.0}}, clock=clock)
+
+    # Primeira rodada só para aprender o custo do job LOW
+    sched.submit("team_hud", _job(clock, 0.05, "hud"), Priority.LOW)
+    assert sched.run_tick() == {"team_hud": "hud"}
+
+    order = []
+    sched.submit("team_hud", _job(clock, 0.05, "team_hud", order), Priority.LOW)
+    sched.submit("enemy_name", _job(clock, 0.08, "enemy_name", order), Priority.HIGH)
+    sched.submit("state", _job(clock, 0.0, "state", order), Priority.CRITICAL)
+    results = sched.run_tick()
+
+    assert order == ["state", "enemy_name"]
+    assert "team_hud" not in results
+    assert sched.dropped["team_hud"] == 1
+
+
+def test_scheduler_drops_unrun_jobs_at_tick_end_and_reprobes():
+    clock = FakeClock()
+    sched = PerceptionScheduler({"perception": {"tick_budget": 0.1, "probe_every": 3}}, clock=clock)
+
+    sched.submit("hp", _job(clock, 0.2, 0.5), Priority.NORMAL, deadline=5.0)
+    sched.run_tick()  # aprende custo (0.2 > budget)
+
+    # Não cabe: descartado no fim do tick, nada fica para o tick de outro chamador
+    sched.submit("hp", _job(clock, 0.2, 0.5), Priority.NORMAL, deadline=5.0)
+    assert sched.run_tick() == {}
+    assert sched.dropped["hp"] == 1
+    assert sched.stats()["pending"] == 0
+    sched.submit("state", _job(clock, 0.0, "menu"), Priority.CRITICAL)
+    assert sched.run_tick() == {"state": "menu"}
+
+    # Após pulos seguidos, roda de novo e re-mede: a leitura ficou barata e volta a caber
+    sched.submit("hp", _job(clock, 0.01, 0.4), Priority.NORMAL, deadline=5.0)
+    assert sched.run_tick() == {}
+    sched.submit("hp", _job(clock, 0.01, 0.4), Priority.NORMAL, deadline=5.0)
+    assert sched.run_tick() == {"hp": 0.4}
+    assert sched.probes["hp"] == 1
+    assert sched.estimated_cost("hp") == pytest.approx(0.01)
+
+
+def test_scheduler_counts_missed_deadlines():
+    clock = FakeClock()
+    sched = PerceptionScheduler({"perception": {"tick_budget": 0.1}}, clock=clock)
+
+    # Critical sempre roda, mesmo estourando o deadline
+    sched.submit("state", _job(clock, 0.3, "battle"), Priority.CRITICAL, deadline=0.1)
+    assert sched.run_tick() == {"state": "battle"}
+    assert sched.missed_deadlines["state"] == 1
+
+
+def test_scheduler_shares_budget_across_run_ticks_and_times_deadlines_from_capture():
+    clock = FakeClock()
+    sched = PerceptionScheduler({"perception": {"tick_budget": 0.1}}, clock=clock)
+    sched.submit("hp", _job(clock, 0.04, 0.5), Priority.NORMAL, deadline=5.0)
+    sched.run_tick()  # aprende custo
+
+    # Frame capturado em t=10; o estado gasta 0.08 do orçamento do tick
+    clock.now = 10.2
+    sched.begin_tick(captured_at=10.0)
+    sched.submit("state", _job(clock, 0.08, "battle"), Priority.CRITICAL)
+    assert sched.run_tick() == {"state": "battle"}
+
+    # Segundo run_tick do mesmo tick: só sobram 0.02 e o hp (0.04) não cabe
+    sched.submit("hp", _job(clock, 0.04, 0.5), Priority.NORMAL, deadline=5.0)
+    assert sched.run_tick() == {}
+    assert sched.dropped["hp"] == 1
+    assert sched.last_tick_duration == pytest.approx(0.08)
+
+    # Deadline conta da captura: 0.1 s depois de t=10 já passou
+    sched.begin_tick(captured_at=10.0)
+    sched.submit("hp", _job(clock, 0.04, 0.5), Priority.NORMAL, deadline=0.1)
+    assert sched.run_tick() == {}
+    assert sched.missed_deadlines["hp"] == 1
@@ -0,0 +1,41 @@
+import itertools
+import time
+
+from src.core.pipeline import LatestQueue, Pipeline
+
+
+def test_latest_queue_drops_oldest_when_full():
+    q = LatestQueue(maxsize=2)
+    for i in range(5):
+        q.put(i)
+    assert [q.get(timeout=0), q.get(timeout=0)] == [3, 4]
+    assert q.dropped == 3 and q.max_depth == 2
+
+
+def test_throughput_follows_slowest_stage():
+    counter = itertools.count()
+    done = []
+
+    def stage(delay):
+        def fn(item):
+            time.sleep(delay)
+            return item
+        return fn
+
+    pipeline = Pipeline.chain(
+        lambda: next(counter),
+        ('perceive', stage(0.05)),
+        ('decide', stage(0.05)),
+        ('act', lambda item: done.append(item)),
+        source_interval=0.02,
+    )
+    pipeline.start()
+    time.sleep(1.0)
+    pipeline.stop()
+
+    # Em série seriam ~8 itens/s (0.12s cada); em pipeline, ~20/s (estágio de 0.05s)
+    assert len(done) >= 12
+    assert done == sorted(done)
+    metrics = pipeline.metrics()
+    assert metrics['perceive']['dropped'] > 0          # capturas mais rápidas que a percepção
+    assert metrics['perceive']['latency_ms'] >= 45
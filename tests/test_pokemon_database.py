@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+
+from src.knowledge.pokemon_database import N_TYPES, UNKNOWN_TYPE, PokemonDatabase
+
+
+def test_type_matrix_built_from_tipos_json():
+    db = PokemonDatabase()
+    assert db.type_matrix.shape == (N_TYPES, N_TYPES)
+    assert db.type_matrix.dtype == np.float32
+
+    # Nomes e type_ids da PokeAPI são internados no mesmo índice
+    assert db.type_index("Electric") == db.type_index("13") == db.type_index(13)
+    assert db.type_index("???") == UNKNOWN_TYPE
+
+    # Elétrico contra água/voador (ids PokeAPI) = 4x; contra terra = imune
+    assert db.get_type_multiplier("13", ["11", "3"]) == 4.0
+    assert db.get_type_multiplier("Electric", ["Ground"]) == 0.0
+    assert db.get_type_multiplier(None, ["Ground"]) == 1.0
+
+
+def test_type_multipliers_vectorized_against_dual_type():
+    db = PokemonDatabase()
+    # Charizard: fogo/voador
+    mults = db.type_multipliers(["Rock", "Water", "Grass", "Normal", None], ["10", "3"])
+    assert mults.tolist() == [4.0, 2.0, 0.25, 1.0, 1.0]
+    assert set(db.get_weaknesses("charizard")) == {"Rock", "Water", "Electric"}
+
+
+def test_compiled_store_answers_lookups_without_loading_json(tmp_path):
+    from src.knowledge.knowledge_store import build_store
+
+    store_path = build_store("data", tmp_path / "knowledge.sqlite")
+    db = PokemonDatabase(store_path=store_path)
+    assert db.store is not None
+
+    assert db.get_pokemon_types("Charizard") == ["Fire", "Flying"]
+    # Golpe da PokeAPI (power 0) completado com o poder da base legada
+    assert db.get_move_data("ember") == {"type_id": "Fire", "power": 40, "accuracy": 100, "category_id": "Special"}
+    assert db.get_type_multiplier("Water", db.get_pokemon_types("charizard")) == 2.0
+
+    # Nenhuma árvore JSON grande foi materializada
+    for attr in ("dex_legacy", "moves_legacy", "pokeapi_pokemon", "pokeapi_moves"):
+        assert attr not in db.__dict__
+
+
+def test_store_is_built_on_first_start_and_rebuilt_when_a_source_changes(tmp_path):
+    import shutil
+
+    from src.knowledge.knowledge_store import SOURCES, STORE_FILENAME
+
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in SOURCES:
+        if (Path("data") / name).exists():
+            shutil.copy(Path("data") / name, data / name)
+    (data / "type_efficacy.json").write_text('{"13": {"5": 100}}', encoding="utf-8")
+
+    db = PokemonDatabase(str(data))
+    assert db.store is not None and (data / STORE_FILENAME).exists()
+    assert db.get_type_multiplier("Electric", ["Ground"]) == 1.0   # type_efficacy vem do store
+
+    # type_efficacy.json entra no fingerprint: mudou, o store é recompilado
+    (data / "type_efficacy.json").write_text('{"13": {"5": 50}}', encoding="utf-8")
+    db = PokemonDatabase(str(data))
+    assert db.store is not None
+    assert db.get_type_multiplier("Electric", ["Ground"]) == 0.5
+    assert not list(data.glob("*.tmp"))
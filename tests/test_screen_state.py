@@ -0,0 +1,104 @@
+from src.core.bot_controller import BotController
+from src.perception.game_state_detector import GameState
+from src.perception.screen_state import ScreenState, ScreenStateMachine
+
+
+class FakeDetector:
+    """Detector fake: cada detector devolve o valor em ``hits`` e conta chamadas."""
+
+    templates = {}
+
+    def __init__(self):
+        self.hits = {}
+        self.calls = []
+
+    def _make(name):
+        def fn(self, image):
+            self.calls.append(name)
+            return self.hits.get(name, False)
+        return fn
+
+    _detect_shiny = _make('shiny')
+    detect_battle_buttons = _make('battle_buttons')
+    detect_moves_menu = _make('moves_menu')
+    detect_switch_menu = _make('switch_menu')
+    detect_talk = _make('talk')
+    detect_goto = _make('goto')
+
+
+def test_state_machine_runs_only_state_detectors():
+    det = FakeDetector()
+    fsm = ScreenStateMachine(det, {"detection": {"state_machine": {"miss_tolerance": 1}}})
+
+    assert fsm.update(None) == ScreenState.WALKING  # nada visível
+    det.calls.clear()
+    det.hits = {'battle_buttons': True}
+    assert fsm.update(None) == ScreenState.BATTLE_MENU
+    assert 'goto' not in det.calls
+
+    det.hits = {'moves_menu': True}
+    det.calls.clear()
+    state = fsm.update(None)
+    assert state == ScreenState.MOVES_MENU
+    assert state.game_state == GameState.IN_BATTLE
+
+    # No menu de golpes: nunca procura goto nem talk
+    det.calls.clear()
+    fsm.update(None)
+    assert set(det.calls) <= {'shiny', 'moves_menu', 'battle_buttons'}
+
+
+def test_state_machine_ignores_illegal_transitions_and_shiny_is_global():
+    det = FakeDetector()
+    fsm = ScreenStateMachine(det, {"detection": {"state_machine": {"miss_tolerance": 3}}})
+    fsm.reset(ScreenState.MOVES_MENU)
+
+    # Switch menu não é alcançável direto do menu de golpes (e nem é checado)
+    det.hits = {'switch_menu': True}
+    assert fsm.update(None) == ScreenState.MOVES_MENU
+    assert fsm.misses == 1
+
+    det.hits = {'shiny': True}
+    assert fsm.update(None) == ScreenState.SHINY
+    assert ScreenState.SHINY.game_state == GameState.SHINY_FOUND
+
+
+class RecordingInput:
+    def __init__(self):
+        self.actions = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.actions.append(name)
+
+
+def test_inherited_state_does_not_trigger_actions():
+    det = FakeDetector()
+    config = {
+        'detection': {'state_machine': {'enabled': True, 'miss_tolerance': 3}},
+        'watchdog': {'enabled': False},
+        'team_hud_tracker': {'enabled': False},
+    }
+    components = {
+        'screen': None, 'detector': det, 'input': RecordingInput(),
+        'strategy': None, 'ocr': None, 'team_mgr': None, 'capture_factory': lambda: None,
+    }
+    bot = BotController(config, components)
+
+    # Animação de ataque/fim da batalha: nenhum detector dispara, mas o menu é herdado
+    bot.screen_fsm.reset(ScreenState.BATTLE_MENU)
+    bot.screen_state = bot.screen_fsm.update(None)
+    assert bot.screen_state == ScreenState.BATTLE_MENU and not bot.screen_fsm.confirmed
+    bot.handle_battle(None)
+
+    # Diálogo que já fechou: não aperta espaço no estado antigo
+    bot.screen_fsm.reset(ScreenState.DIALOG)
+    bot.screen_state = bot.screen_fsm.update(None)
+    assert bot.screen_state == ScreenState.DIALOG
+    bot.handle_exploring(None)
+    assert bot.input.actions == []
+
+    det.hits = {'talk': True}
+    bot.screen_state = bot.screen_fsm.update(None)
+    assert bot.screen_fsm.confirmed
+    bot.handle_exploring(None)
+    assert bot.input.actions == ['press']
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from src.core.supervisor import InstanceSpec, SharedResources, Supervisor
+from src.perception.shared_capture import SharedScreenCapture
+
+
+def counting_grabber(frame):
+    calls = []
+
+    def factory():
+        def grab():
+            calls.append(time.monotonic())
+            return frame.copy()   # cada grab é um array novo, como o do mss
+        return grab
+    return factory, calls
+
+
+def test_capture_cost_is_constant_and_tiles_are_views():
+    display = np.random.randint(0, 255, (400, 1200, 3), dtype=np.uint8)
+    factory, calls = counting_grabber(display)
+    shared = SharedScreenCapture(interval=0.02, grab_factory=factory, origin=(1920, 0))
+    tiles = [shared.tile([150 * i, 0, 150, 200]) for i in range(8)]
+    frames = {}
+
+    def consume(i):
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            frames[i] = tiles[i].capture()
+
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    shared.stop()
+
+    # ~25 grabs em 0.5s com período de 20ms, independente das 8 instâncias consumindo
+    assert 5 <= len(calls) <= 30
+    frame, _ = shared.latest()
+    assert frames[3].shape == (200, 150, 3)
+    assert frames[3].base is not None                      # view, não cópia
+    assert np.array_equal(frames[3], display[0:200, 450:600])
+    assert tiles[3].origin == (1920 + 450, 0)
+    assert np.shares_memory(tiles[2].capture_region([10, 10, 20, 20]), shared.latest()[0])
+
+
+class RecordingInput:
+    def __init__(self):
+        self.clicks = []
+
+    def click(self, x=None, y=None):
+        self.clicks.append((x, y))
+
+    def moveTo(self, x, y, duration=0.0):
+        pass
+
+    def press(self, key):
+        pass
+
+
+def test_supervisor_instances_share_one_grab(tmp_path):
+    goto = cv2.imread('assets/templates/goto.png')
+    h, w = goto.shape[:2]
+    display = np.full((360, 960, 3), 30, dtype=np.uint8)
+    display[40:40 + h, 60:60 + w] = goto            # cliente da esquerda
+    display[100:100 + h, 480 + 90:480 + 90 + w] = goto   # cliente da direita
+    factory, calls = counting_grabber(display)
+
+    config = {
+        'bot': {'loop_interval': 0.05, 'debug_mode': False},
+        'assets': {'templates_dir': 'assets/templates/', 'goto_image': 'goto.png'},
+        'detection': {'goto_threshold': 0.8},
+        'known_moves': {'path': str(tmp_path / 'known_moves.json')},
+        'ocr': {'tesseract_path': 'tesseract'},
+        'watchdog': {'enabled': False},
+        'supervisor': {'shared_capture': {'enabled': True}},
+    }
+    shared = SharedResources(config)
+    shared.screens[1] = SharedScreenCapture(interval=0.05, grab_factory=factory, origin=(0, 100))
+    backend = RecordingInput()
+    specs = [InstanceSpec('left', region=[0, 0, 480, 360]), InstanceSpec('right', region=[480, 0, 480, 360])]
+    supervisor = Supervisor(config, specs, shared=shared, input_backend=backend)
+    started = time.monotonic()
+    supervisor.start()
+    time.sleep(1.5)
+    supervisor.stop()
+    elapsed = time.monotonic() - started
+
+    assert all(m['ticks'] > 0 and m['errors'] == 0 for m in supervisor.metrics().values())
+    assert supervisor.scaling()['capture_tiles'] == 2
+    assert len(calls) <= elapsed / 0.05 + 2          # um grab por período para as duas instâncias
+    # Cliques em coordenadas absolutas: origem do monitor + região da instância + botão
+    assert any(60 <= x < 60 + w and 140 <= y < 140 + h for x, y in backend.clicks)
+    assert any(570 <= x < 570 + w and 200 <= y < 200 + h for x, y in backend.clicks)
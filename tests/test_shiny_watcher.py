@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+
+from src.perception.shiny_watcher import ShinyWatcher
+
+
+class FakeRegionCapture:
+    """Captura fake: devolve fundo liso até ``shiny_after`` amostras, depois o brilho."""
+
+    def __init__(self, template, shiny_after=3):
+        self.template = template
+        self.shiny_after = shiny_after
+        self.regions = []
+
+    def capture_region(self, roi):
+        self.regions.append(roi)
+        frame = np.full((60, 60, 3), 30, dtype=np.uint8)
+        if len(self.regions) > self.shiny_after:
+            th, tw = self.template.shape[:2]
+            frame[10:10 + th, 10:10 + tw] = self.template
+        return frame
+
+
+def test_shiny_watcher_samples_region_and_sets_event():
+    rng = np.random.default_rng(0)
+    template = rng.integers(0, 255, size=(12, 12, 3), dtype=np.uint8)
+    cap = FakeRegionCapture(template)
+    event = threading.Event()
+    cfg = {
+        "shiny_watcher": {"enabled": True, "interval": 0.001, "area": [0, 0, 60, 60]},
+        "detection": {"shiny_threshold": 0.9},
+    }
+
+    watcher = ShinyWatcher.from_config(cfg, template, lambda: cap, event)
+    watcher.start()
+    assert event.wait(2.0)
+    watcher.join(1.0)
+
+    assert not watcher.is_alive()
+    assert watcher.samples == 4
+    assert all(r == [0, 0, 60, 60] for r in cap.regions)
+
+
+def test_shiny_watcher_disabled_by_config():
+    assert ShinyWatcher.from_config({"shiny_watcher": {"enabled": False}}, np.zeros((4, 4, 3)), None) is None
+
+
+def test_shiny_watcher_samples_full_frame_slowly_until_roi_is_calibrated():
+    template = np.zeros((4, 4, 3), dtype=np.uint8)
+    cfg = {"shiny_watcher": {"enabled": True}, "rois": {"enemy_sprite": [1090, 300, 1390, 600]}}
+    watcher = ShinyWatcher.from_config(cfg, template, None)
+    assert watcher.area is None and watcher.interval == 2.0
+
+    cfg["shiny_watcher"]["use_enemy_sprite"] = True
+    watcher = ShinyWatcher.from_config(cfg, template, None)
+    assert watcher.area == [1090, 300, 1390, 600] and watcher.interval == 0.1
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+
+from src.perception.sprite_index import SpriteIndex, sprite_hash
+
+
+def _sprite(seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, size=(64, 64, 3), dtype=np.uint8)
+
+
+def test_sprite_index_identifies_confirmed_encounter(tmp_path):
+    path = tmp_path / "sprites.npz"
+    index = SpriteIndex(path=path, max_distance=6)
+    pidgey, rattata = _sprite(1), _sprite(2)
+
+    assert index.lookup(pidgey) == (None, None)
+    assert index.add(pidgey, "Pidgey")
+    assert index.add(rattata, "rattata")
+
+    # Leve variação de brilho não muda o hash a ponto de errar o vizinho
+    brighter = np.clip(pidgey.astype(int) + 6, 0, 255).astype(np.uint8)
+    name, dist = index.lookup(brighter)
+    assert name == "pidgey"
+    assert dist <= 6
+
+    # Persistido em disco (em lote; close grava o pendente): nova instância já identifica
+    index.close()
+    reloaded = SpriteIndex(path=path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup(rattata)[0] == "rattata"
+
+
+def test_sprite_index_rejects_distant_sprites():
+    index = SpriteIndex(max_distance=2)
+    index.add(_sprite(3), "caterpie")
+    name, dist = index.lookup(_sprite(4))
+    assert name is None
+    assert dist > 2
+    assert sprite_hash(None) is None
+
+
+def test_sprite_index_replaces_oldest_variation_in_turn(tmp_path):
+    index = SpriteIndex(path=tmp_path / "sprites.npz", max_distance=2, max_per_label=2, save_every=100)
+    first, second, third, fourth = (_sprite(seed) for seed in (10, 11, 12, 13))
+    for sprite in (first, second, third, fourth):
+        index.add(sprite, "zubat")
+
+    # 2 variações por label: a 3ª substituiu a 1ª e a 4ª substituiu a 2ª (a mais antiga de cada vez)
+    assert len(index) == 2
+    assert index.lookup(third)[0] == index.lookup(fourth)[0] == "zubat"
+    assert index.lookup(first)[0] is None and index.lookup(second)[0] is None
+    assert not (tmp_path / "sprites.npz").exists()   # nada gravado ainda: abaixo de save_every
+
+    index.close()
+    reloaded = SpriteIndex(path=tmp_path / "sprites.npz", max_distance=2, max_per_label=2)
+    reloaded.add(_sprite(14), "zubat")                # ordem de inserção sobrevive ao reload
+    assert reloaded.lookup(fourth)[0] == "zubat" and reloaded.lookup(third)[0] is None
+
+
+def test_sprite_index_concurrent_add_and_lookup():
+    index = SpriteIndex(max_distance=6, max_per_label=2)
+    sprites = [_sprite(seed) for seed in range(40)]
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(20):
+                for sprite in sprites:
+                    index.lookup(sprite)
+        except Exception as e:  # IndexError com hashes e labels fora de sincronia
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for i, sprite in enumerate(sprites):
+        index.add(sprite, f"mon{i % 10}")
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(index) == len(index._hashes) == len(index._stamps) == 20
@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.perception.game_state_detector import GameState, GameStateDetector
+from src.perception.state_classifier import FrameStateClassifier
+
+
+def _frame(kind, seed):
+    """Frames sintéticos: exploração = mapa claro com céu; batalha = barra escura embaixo."""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(90, 140, size=(180, 320, 3), dtype=np.uint8)
+    if kind == "exploring":
+        img[:60, :] = (230, 200, 150)
+    else:
+        img[120:, :] = 20
+        img[130:170, 40:280] = (200, 60, 40)
+    return img
+
+
+def _model():
+    frames = [_frame("exploring", i) for i in range(5)] + [_frame("in_battle", i) for i in range(5)]
+    labels = ["exploring"] * 5 + ["in_battle"] * 5
+    return FrameStateClassifier.fit(frames, labels, min_confidence=0.2)
+
+
+def test_classifier_predicts_state_with_confidence(tmp_path):
+    model = _model()
+    state, conf = model.predict(_frame("in_battle", 42))
+    assert state == GameState.IN_BATTLE
+    assert conf >= 0.2
+
+    path = tmp_path / "model.npz"
+    model.save(path)
+    reloaded = FrameStateClassifier.load(path)
+    assert reloaded.predict(_frame("exploring", 43))[0] == GameState.EXPLORING
+
+
+def test_detect_state_falls_back_to_templates_when_unsure():
+    cfg = {"assets": {"templates_dir": "nao_existe/"}, "detection": {}, "rois": {}}
+    detector = GameStateDetector(None, None, cfg)
+    detector.state_classifier = _model()
+
+    assert detector.detect_state(_frame("in_battle", 7)) == GameState.IN_BATTLE
+
+    # Sem confiança suficiente o classificador não decide; sem templates => EXPLORING
+    detector.state_classifier.min_confidence = 1.5
+    assert detector.detect_state(_frame("in_battle", 8)) == GameState.EXPLORING
@@ -0,0 +1,84 @@
+import time
+
+import cv2
+import numpy as np
+
+from src.action.input_simulator import InputArbiter, InputSimulator
+from src.core.supervisor import InstanceSpec, Supervisor
+
+
+class RecordingInput:
+    """Backend falso do InputSimulator (no lugar do pyautogui)."""
+
+    def __init__(self):
+        self.events = []
+
+    def click(self, x=None, y=None):
+        self.events.append(('click', x, y))
+
+    def moveTo(self, x, y, duration=0.0):
+        self.events.append(('move', x, y))
+
+    def press(self, key):
+        self.events.append(('press', key))
+
+
+def test_input_offset_and_focus_between_instances():
+    backend, arbiter = RecordingInput(), InputArbiter()
+    left = InputSimulator({}, offset=(0, 0), arbiter=arbiter, focus_point=(5, 5), backend=backend, templates={})
+    right = InputSimulator({}, offset=(640, 0), arbiter=arbiter, focus_point=(5, 5), backend=backend, templates={})
+
+    left.click(10, 20)
+    right.press('space')     # outra instância usou o input por último: foca a janela antes
+    right.press('space')
+    left.press('esc')
+
+    assert backend.events == [
+        ('click', 10, 20),
+        ('click', 645, 5), ('press', 'space'),
+        ('press', 'space'),
+        ('click', 5, 5), ('press', 'esc'),
+    ]
+    assert arbiter.switches == 3
+
+
+def test_supervisor_runs_replay_instances_with_shared_resources(tmp_path):
+    goto = cv2.imread('assets/templates/goto.png')
+    h, w = goto.shape[:2]
+    specs = []
+    for name, (x, y), offset in (('a', (40, 30), (0, 0)), ('b', (200, 120), (1000, 500))):
+        frame = np.full((360, 480, 3), 30, dtype=np.uint8)
+        frame[y:y + h, x:x + w] = goto
+        replay_dir = tmp_path / name
+        replay_dir.mkdir()
+        cv2.imwrite(str(replay_dir / 'frame_000.png'), frame)
+        specs.append(InstanceSpec(name, input_offset=list(offset), replay_dir=str(replay_dir)))
+
+    config = {
+        'bot': {'loop_interval': 0.05, 'debug_mode': False},
+        'assets': {'templates_dir': 'assets/templates/', 'goto_image': 'goto.png'},
+        'detection': {'goto_threshold': 0.8},
+        'known_moves': {'path': str(tmp_path / 'known_moves.json')},
+        'ocr': {'tesseract_path': 'tesseract'},
+        'watchdog': {'enabled': False},
+    }
+    backend = RecordingInput()
+    supervisor = Supervisor(config, specs, input_backend=backend)
+    supervisor.start()
+    time.sleep(1.5)
+    supervisor.stop()
+
+    metrics = supervisor.metrics()
+    assert all(m['ticks'] > 0 and m['errors'] == 0 and not m['alive'] for m in metrics.values())
+    bots = [instance.controller for instance in supervisor.instances]
+    assert bots[0].detector.templates is bots[1].detector.templates
+    assert bots[0].ocr.pool is bots[1].ocr.pool
+    assert bots[0].team_mgr.moves_db_path.name == 'known_moves_a.json'
+    assert bots[1].team_mgr.moves_db_path.name == 'known_moves_b.json'
+
+    # Cliques no Goto de cada instância caem dentro do botão, deslocados pelo offset dela
+    clicks = [(x, y) for kind, x, y in (e for e in backend.events if e[0] == 'click')]
+    assert any(40 <= x < 40 + w and 30 <= y < 30 + h for x, y in clicks)
+    assert any(1200 <= x < 1200 + w and 620 <= y < 620 + h for x, y in clicks)
+    summary = supervisor.summary()
+    assert "0/2 ativas" in summary and "[a]" in summary and "[b]" in summary
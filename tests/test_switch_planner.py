@@ -0,0 +1,57 @@
+from src.decision.battle_strategy import BattleStrategy
+from src.knowledge.pokemon_database import PokemonDatabase
+from src.knowledge.team_manager import TeamManager
+
+
+def _strategy(tmp_path, config=None):
+    db = PokemonDatabase(use_store=False)
+    tm = TeamManager(identity=db.identity)
+    tm.moves_db_path = tmp_path / "known_moves.json"
+    tm.known_moves = {
+        "pikachu": ["Thunderbolt", "Quick Attack"],
+        "charmander": ["Scratch", "Ember"],
+        "geodude": ["Tackle", "Rock Throw"],
+    }
+    tm.current_team = ["charmander", "geodude", "pikachu"]
+    return BattleStrategy(db, tm, config)
+
+
+def test_planner_ranks_team_and_matches_reordered_menu(tmp_path):
+    strat = _strategy(tmp_path)
+    plan = strat.plan_switch("Gyarados", current_name="Charmander")
+
+    # Pikachu (elétrico) é o melhor contra água/voador; charmander apanha de água
+    assert plan.ranked[0] == "pikachu"
+    assert plan.target == "pikachu"
+    assert plan.scores["pikachu"] > plan.scores["charmander"]
+
+    # Menu de troca lido em outra ordem (e com ruído de OCR/caixa)
+    menu = ["GEODUDE", "Charmander", "Pikachu"]
+    assert strat.switch_planner.match_slot(plan, menu) == 2
+
+
+def test_hysteresis_blocks_back_to_back_switches(tmp_path):
+    strat = _strategy(tmp_path)
+    plan = strat.plan_switch("Gyarados", current_name="Charmander")
+    assert plan.target == "pikachu"
+    # Planejar (ex.: especulado) não mexe na histerese: sem commit, o mesmo plano de novo
+    assert strat.plan_switch("Gyarados", current_name="Charmander").target == "pikachu"
+    assert strat.switch_planner.turn == 0
+
+    strat.record_turn(plan)   # troca feita
+    # Logo no turno seguinte, mesmo com um alvo melhor que o atual, não troca de novo
+    assert strat.plan_switch("Gyarados", current_name="Geodude").target is None
+    # Estando no melhor, não há troca
+    assert strat.plan_switch("Gyarados", current_name="Pikachu").target is None
+
+
+def test_current_member_outside_team_uses_team_hp_and_level_keys(tmp_path):
+    strat = _strategy(tmp_path)
+    tm = strat.tm
+    tm.current_team = ["charmander", "geodude"]   # HUD ainda não listou o pikachu
+    tm.team_hp = {"pikachu": 0.0}
+
+    plan = strat.plan_switch("Gyarados", current_name=" Pikachu ")
+    # HP 0 lido com a chave da equipe: desmaiado, fora do ranking
+    assert plan.current == "pikachu"
+    assert "pikachu" not in plan.ranked
@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.knowledge.team_manager import TeamManager
+from src.perception.team_hud_tracker import TeamHudTracker
+
+CONFIG = {'rois': {'team_hud': {'container': [100, 50, 200, 50 + 3 * 40], 'slot_height': 40}}}
+
+
+class FakeOCR:
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.calls = 0
+
+    def extract_text_optimized(self, image, **kwargs):
+        text = self.texts[self.calls % len(self.texts)]
+        self.calls += 1
+        return text
+
+
+def _frame(hp=(1.0, 0.5, 0.0)):
+    rng = np.random.default_rng(0)
+    img = np.zeros((300, 300, 3), dtype=np.uint8)
+    for i, ratio in enumerate(hp):
+        y = 50 + i * 40
+        img[y:y + 24, 100:200] = rng.integers(0, 255, (24, 100, 3), dtype=np.uint8)   # nome/nível
+        img[y + 30:y + 40, 100:100 + int(100 * ratio)] = (0, 200, 0)                  # barra verde
+    return img
+
+
+def test_reads_names_levels_and_hp(tmp_path):
+    tm = TeamManager(config={'known_moves': {'path': str(tmp_path / "moves.json")}})
+    ocr = FakeOCR(["Pikachu Lv.23", "Pidgey Lv 7", ""])
+    tracker = TeamHudTracker(ocr, tm, CONFIG)
+
+    assert tracker.update(_frame()) is True
+    assert tm.current_team == ["pikachu", "pidgey"]
+    assert tm.team_levels == {"pikachu": 23, "pidgey": 7}
+    assert abs(tm.team_hp["pikachu"] - 1.0) < 0.05
+    assert abs(tm.team_hp["pidgey"] - 0.5) < 0.05
+
+
+def test_only_changed_slots_are_reread(tmp_path):
+    tm = TeamManager(config={'known_moves': {'path': str(tmp_path / "moves.json")}})
+    ocr = FakeOCR(["Pikachu Lv.23", "Pidgey Lv 7", ""])
+    tracker = TeamHudTracker(ocr, tm, CONFIG)
+    tracker.update(_frame())
+    assert ocr.calls == 3
+
+    # Só a barra de HP mudou: nenhum OCR, mas o HP é atualizado
+    assert tracker.update(_frame(hp=(0.25, 0.5, 0.0))) is False
+    assert ocr.calls == 3
+    assert abs(tm.team_hp["pikachu"] - 0.25) < 0.05
+
+    # Slot 2 mudou (evoluiu): só ele é relido
+    frame = _frame()
+    frame[90:114, 100:200] = 255
+    ocr.texts = ["Pidgeotto Lv 18"]
+    assert tracker.update(frame) is True
+    assert ocr.calls == 4
+    assert tm.current_team == ["pikachu", "pidgeotto"]
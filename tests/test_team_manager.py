@@ -0,0 +1,46 @@
+import json
+
+from src.knowledge.team_manager import TeamManager
+
+
+def _manager(tmp_path, compact_every=50):
+    config = {"known_moves": {"path": str(tmp_path / "known_moves.json"), "compact_every": compact_every}}
+    return TeamManager(config=config)
+
+
+def test_updates_go_to_journal_and_survive_restart(tmp_path):
+    tm = _manager(tmp_path)
+    tm.update_pokemon_moves("Pidgey", ["Tackle"])
+    tm.update_pokemon_moves("Pidgey", ["Tackle", "Gust"])
+    tm.update_pokemon_moves("Rattata", ["Tackle", "Tail Whip"])
+    assert tm.get_moves("pidgey") == ["Tackle", "Gust"]   # memória é a fonte da verdade
+    tm.flush()
+
+    assert not tm.moves_db_path.exists()                  # ainda sem compactação
+    # Linha truncada no fim (queda no meio da escrita) é ignorada na releitura
+    with tm.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"name": "pidg')
+
+    reloaded = _manager(tmp_path)
+    assert reloaded.get_moves("pidgey") == ["Tackle", "Gust"]
+    assert reloaded.get_moves("rattata") == ["Tackle", "Tail Whip"]
+
+
+def test_compaction_writes_snapshot_atomically_and_truncates_journal(tmp_path):
+    tm = _manager(tmp_path, compact_every=2)
+    tm.update_pokemon_moves("Pidgey", ["Tackle"])
+    tm.flush()
+    tm.update_pokemon_moves("Rattata", ["Tackle"])
+    tm.close()
+
+    with tm.moves_db_path.open(encoding="utf-8") as f:
+        assert json.load(f) == {"pidgey": ["Tackle"], "rattata": ["Tackle"]}
+    assert tm.journal_path.read_text(encoding="utf-8") == ""
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_level_from_hud_is_looked_up_by_species_key(tmp_path):
+    tm = _manager(tmp_path)
+    tm.update_team_status({"Pidgey": 0.5}, {"Pidgey ": 14})
+    assert tm.get_level("PIDGEY") == 14
+    assert tm.get_level("rattata") is None and tm.get_level("") is None
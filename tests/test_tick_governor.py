@@ -0,0 +1,81 @@
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from src.core import tick_governor
+from src.core.tick_governor import TickGovernor, cpu_clock, process_cpu_time
+from src.perception.game_state_detector import GameState
+from src.perception.ocr_engine import OCRWorkerPool
+from src.perception.perception_scheduler import PerceptionScheduler, Priority
+
+CONFIG = {'bot': {'governor': {
+    'enabled': True, 'intervals': {'battle': 0.3, 'exploring': 1.0},
+    'burst_interval': 0.1, 'burst_seconds': 2.0, 'idle_after': 5.0, 'idle_interval': 3.0,
+    'cpu_budget': 0.25, 'adjust_every': 0.0,
+}}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.cpu = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_on_battle_start_and_slow_when_idle():
+    clock = FakeClock()
+    governor = TickGovernor(CONFIG, clock=clock, cpu_clock=lambda: 0.0)
+    frame = np.zeros((72, 128, 3), dtype=np.uint8)
+
+    assert governor.next_interval(GameState.EXPLORING, frame) == 1.0
+    clock.now = 1.0
+    assert governor.next_interval(GameState.IN_BATTLE, frame + 50) == 0.1   # barra acabou de aparecer
+    clock.now = 3.5
+    assert governor.next_interval(GameState.IN_BATTLE, frame + 50) == 0.3
+    clock.now = 10.0                                                        # nada mudou há ~9s
+    assert governor.next_interval(GameState.EXPLORING, frame + 50) == 3.0
+
+
+def test_cpu_over_budget_sheds_optional_jobs():
+    clock = FakeClock()
+    scheduler = PerceptionScheduler()
+    governor = TickGovernor(CONFIG, scheduler=scheduler, clock=clock, cpu_clock=lambda: clock.cpu)
+
+    for _ in range(3):   # 80% de um núcleo com orçamento de 25%
+        clock.now += 2.0
+        clock.cpu += 1.6
+        interval = governor.next_interval(GameState.EXPLORING)
+    assert governor.shed_level == 2 and scheduler.shed_priority == Priority.NORMAL
+    assert interval > 1.0   # intervalo esticado
+
+    scheduler.submit('state', lambda: 'ok', Priority.CRITICAL)
+    scheduler.submit('team_hud', lambda: 'hud', Priority.LOW)
+    assert scheduler.run_tick() == {'state': 'ok'}
+    assert scheduler.shed == {'team_hud': 1}
+
+    for _ in range(3):   # carga cai: religa os detectores
+        clock.now += 20.0
+        governor.next_interval(GameState.EXPLORING)
+    assert governor.shed_level == 0 and scheduler.shed_priority is None
+
+
+def test_cpu_clock_counts_tesseract_child_processes(monkeypatch):
+    # Um filho que gira CPU (como um Tesseract) entra no relógio depois de encerrado
+    before = process_cpu_time()
+    subprocess.run([sys.executable, "-c", "import time\nt = time.process_time()\nwhile time.process_time() - t < 0.3: pass"],
+                   check=True)
+    if tick_governor.CHILD_CPU_REPORTED:
+        assert process_cpu_time() - before >= 0.25
+
+    # Sem CPU dos filhos no SO (Windows), o tempo com slot do pool de OCR ocupado conta no lugar
+    monkeypatch.setattr(tick_governor, "CHILD_CPU_REPORTED", False)
+    pool = OCRWorkerPool(2)
+    clock = cpu_clock(pool)
+    start = clock()
+    with pool.slot():
+        time.sleep(0.2)
+    assert clock() - start >= 0.2
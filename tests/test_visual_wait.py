@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.core.visual_wait import VisualWaiter, motion_settled
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+
+def test_returns_as_soon_as_condition_holds_and_records_time():
+    clock = FakeClock()
+    frames = iter(range(100))
+    waiter = VisualWaiter(lambda: next(frames), clock.sleep, poll=0.1, clock=clock)
+
+    met, frame = waiter.wait_until('moves_menu', lambda f: f >= 3, timeout=1.2)
+    assert met and frame == 3
+    assert abs(clock.now - 0.3) < 1e-9
+
+    met, _ = waiter.wait_until('moves_menu', lambda f: False, timeout=0.5)
+    assert not met
+    assert abs(clock.now - 0.8) < 1e-9   # timeout respeitado, sem passar do limite
+
+    stats = waiter.stats()['moves_menu']
+    assert stats['count'] == 2 and stats['timeouts'] == 1
+    assert abs(stats['saved'] - 0.9) < 1e-9
+
+
+def test_motion_settled_needs_consecutive_still_frames():
+    rng = np.random.default_rng(0)
+    moving = [rng.integers(0, 255, (72, 128, 3), dtype=np.uint8) for _ in range(3)]
+    still = np.full((72, 128, 3), 90, dtype=np.uint8)
+    condition = motion_settled(threshold=2.0, frames=2)
+
+    assert [condition(f) for f in moving] == [False, False, False]
+    assert [condition(still) for _ in range(3)] == [False, False, True]
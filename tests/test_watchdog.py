@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.core.watchdog import StageDeadlineExceeded, Watchdog
+from src.perception.ocr_engine import OCREngine
+
+
+def test_stalled_stage_is_reported_with_attribution_while_running():
+    watchdog = Watchdog({'battle': 0.1}, check_interval=0.05)
+    watchdog.start()
+    release = threading.Event()
+
+    def handler():
+        with watchdog.stage('battle'):
+            release.wait(1.0)   # "travado" esperando algo que não chega
+
+    worker = threading.Thread(target=handler, name="acao")
+    worker.start()
+    time.sleep(0.3)
+    ongoing = [e for e in watchdog.events if e.ongoing]
+    release.set()
+    worker.join()
+    watchdog.stop()
+
+    assert len(ongoing) == 1   # reportado uma vez, enquanto ainda rodava
+    assert ongoing[0].stage == 'battle' and ongoing[0].thread == "acao"
+    assert "wait" in ongoing[0].where   # linha onde a thread está parada
+    assert watchdog.stalls['battle'] == 1   # e de novo ao terminar, com a duração final
+
+    with watchdog.stage('capture'):
+        pass
+    assert 'capture' not in watchdog.stalls
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Tesseract falso é um script sh")
+def test_hung_tesseract_is_killed_and_read_returns_empty(tmp_path):
+    fake = tmp_path / "tesseract"
+    fake.write_text("#!/bin/sh\nsleep 30\n")
+    fake.chmod(0o755)
+    engine = OCREngine(str(fake), timeout=0.3)
+    stalls = []
+    engine.on_timeout = lambda duration, origin: stalls.append((origin, duration))
+
+    started = time.monotonic()
+    text = engine.extract_text_optimized(np.zeros((20, 60, 3), dtype=np.uint8))
+    assert text == "" and time.monotonic() - started < 5
+    assert engine.timeouts == 1 and stalls[0][0] == "extract_text_optimized"
+
+
+def test_stuck_ocr_worker_is_abandoned_and_replaced():
+    watchdog = Watchdog({'ocr': 0.2})
+    stuck = threading.Event()
+
+    started = time.monotonic()
+    assert watchdog.guard('ocr', stuck.wait, 5.0, fallback="") == ""   # leitura vazia, loop segue
+    assert time.monotonic() - started < 1.0
+    # O worker travado não segura as próximas leituras: um novo assume a vaga
+    assert watchdog.guard('ocr', lambda text: text.upper(), "pidgey", fallback="") == "PIDGEY"
+    assert watchdog.abandoned() == 1 and watchdog.stalls['ocr'] == 1
+    stuck.set()
+
+    observing = Watchdog({'ocr': 0.01}, enforce=False)
+    assert observing.guard('ocr', lambda: time.sleep(0.05) or "lido", fallback="") == "lido"
+
+
+def test_handler_past_deadline_is_cut_at_its_next_wait():
+    watchdog = Watchdog({'battle': 0.2})
+    waits = 0
+    with pytest.raises(StageDeadlineExceeded) as info:
+        with watchdog.stage('battle'):
+            while waits < 100:          # handler esperando uma animação que não termina
+                time.sleep(0.05)
+                waits += 1
+                watchdog.raise_if_overdue()
+    assert info.value.stage == 'battle' and waits < 10
+    watchdog.raise_if_overdue()          # fora do estágio não há o que cortar
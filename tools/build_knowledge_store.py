@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Compila as bases de conhecimento (dex.json, movimentos.json, tipos.json,
+type_efficacy.json, pokeapi_pokemon.json, pokeapi_moves.json) num único
+SQLite indexado (`data/knowledge.sqlite`), lido de forma preguiçosa pelo
+`PokemonDatabase`.
+
+O bot compila o store sozinho na partida quando ele falta ou algum JSON de
+`data/` mudou; rode à mão para compilar antes (ex.: `data/` somente leitura).
+
+Uso:
+  python tools/build_knowledge_store.py [--data data] [--out data/knowledge.sqlite]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.knowledge.knowledge_store import build_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila data/*.json num store SQLite.")
+    parser.add_argument("--data", default=str(ROOT / "data"), help="Diretório com os JSONs fonte")
+    parser.add_argument("--out", default=None, help="Arquivo de saída (padrão: <data>/knowledge.sqlite)")
+    args = parser.parse_args()
+
+    out = build_store(args.data, args.out)
+    print(f"Store salvo em {out}")
+
+
+if __name__ == "__main__":
+    main()
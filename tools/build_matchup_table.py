@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Pré-computa o tensor de matchups (eficácia e score STAB x tipo para toda
+combinação de tipos atacante/defensor e tipo de golpe) e a tabela de golpes
+da equipe a partir de `data/known_moves.json`, salvando em `data/matchups.npz`.
+
+O bot reconstrói a tabela sozinho no startup quando algum JSON de `data/` ou o
+`known_moves.json` muda; use este script para forçar/pré-gerar.
+
+Uso:
+  python tools/build_matchup_table.py [--data data] [--out data/matchups.npz]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.decision.matchup_table import MatchupTable
+from src.knowledge.pokemon_database import PokemonDatabase
+from src.knowledge.team_manager import TeamManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-computa data/matchups.npz.")
+    parser.add_argument("--data", default=str(ROOT / "data"), help="Diretório com os JSONs fonte")
+    parser.add_argument("--out", default=None, help="Arquivo de saída (padrão: <data>/matchups.npz)")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data)
+    out = Path(args.out) if args.out else data_dir / "matchups.npz"
+
+    db = PokemonDatabase(str(data_dir))
+    team = TeamManager(identity=db.identity)
+    table = MatchupTable.build(
+        db, team.known_moves, MatchupTable.fingerprint_for(data_dir, (team.moves_db_path, team.journal_path))
+    )
+    table.save(out)
+    print(f"Tabela salva em {out}: {len(table.rows)} espécies, tensor {table.scores.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Treina o classificador de estado de frames (nearest-centroid) usado por
+`GameStateDetector.detect_state`.
+
+Estrutura esperada dos frames gravados (PNG/JPG, tela inteira):
+
+  recordings/
+    exploring/*.png
+    in_battle/*.png
+
+O nome de cada pasta é o valor de `GameState` (ex.: "exploring", "in_battle").
+
+Uso:
+  python tools/train_state_classifier.py --frames recordings --out data/state_classifier.npz
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import cv2
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.perception.game_state_detector import GameState
+from src.perception.state_classifier import FrameStateClassifier, frame_features
+
+
+def load_labeled_frames(frames_dir: Path):
+    frames, labels = [], []
+    valid = {s.value for s in GameState if s != GameState.SHINY_FOUND}
+    for state_dir in sorted(p for p in frames_dir.iterdir() if p.is_dir()):
+        if state_dir.name not in valid:
+            print(f"Ignorando pasta sem estado conhecido: {state_dir.name}")
+            continue
+        for img_path in sorted(state_dir.glob("*.*")):
+            img = cv2.imread(str(img_path))
+            if img is None:
+                continue
+            frames.append(img)
+            labels.append(state_dir.name)
+    return frames, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina o classificador de estado de frames.")
+    parser.add_argument("--frames", default="recordings", help="Pasta com subpastas por estado")
+    parser.add_argument("--out", default="data/state_classifier.npz", help="Arquivo de saída do modelo")
+    parser.add_argument("--min-confidence", type=float, default=0.1)
+    args = parser.parse_args()
+
+    frames, labels = load_labeled_frames(Path(args.frames))
+    if not frames:
+        print(f"Nenhum frame rotulado encontrado em {args.frames}")
+        return 1
+
+    model = FrameStateClassifier.fit(frames, labels, args.min_confidence)
+
+    # Acurácia no próprio conjunto de treino, só como sanidade
+    hits = unsure = 0
+    for frame, label in zip(frames, labels):
+        state, _ = model.predict(frame)
+        if state is None:
+            unsure += 1
+        elif state.value == label:
+            hits += 1
+    total = len(frames)
+    print(f"{total} frames | acertos={hits} ({hits / total:.1%}) | sem confiança={unsure}")
+    print(f"Classes: {[s.value for s in model.labels]} | dimensão={frame_features(frames[0]).size}")
+
+    model.save(args.out)
+    print(f"Modelo salvo em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())